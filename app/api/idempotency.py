@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+from fastapi import HTTPException, Request, Response
+
+from app.middleware.rate_limit import client_identity
+from app.services.idempotency import IdempotencyInProgress, IdempotencyKeyReused, get_idempotency_store
+
+
+JSON = "application/json"
+
+
+class NotSubmitted(HTTPException):
+    """Error for a request that never reached the broker (pre-trade rejection, circuit open).
+
+    It is answered but not stored, so a retry with the same key runs again,
+    e.g. once the kill switch or risk lock has cleared.
+    """
+
+
+class _NotRecorded(Exception):
+    def __init__(self, status_code: int, body: bytes) -> None:
+        self.status_code = status_code
+        self.body = body
+
+
+def _caller(request: Request) -> str:
+    # Retries must hit the same key even if the client's address changes, so the
+    # credential scopes keys when one is sent; it only narrows a key, never grants access
+    token = request.headers.get("authorization") or request.headers.get("x-api-key")
+    if token:
+        return "tok:" + hashlib.blake2b(token.encode(), digest_size=12).hexdigest()
+    return client_identity(request.scope)
+
+
+async def idempotent_response(
+    request: Request,
+    key: str,
+    payload: Any,
+    handler: Callable[[], Awaitable[Any]],
+    submitted: Optional[Callable[[Any], bool]] = None,
+) -> Response:
+    """Run ``handler`` once per (caller, path, Idempotency-Key) and replay its response.
+
+    Broker errors (HTTPException) are stored like successes: after a timeout
+    the order may already exist at the broker, so a retry with the same key
+    must not send it again. Only outcomes where nothing reached the broker are
+    left unstored: a ``NotSubmitted`` error, or a result for which
+    ``submitted(result)`` is false.
+    """
+    scoped_key = f"{request.url.path}:{_caller(request)}:{key}"
+    fingerprint = hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+    async def run() -> tuple[int, bytes]:
+        try:
+            result = await handler()
+        except NotSubmitted as e:
+            # Raising makes the store release the key instead of recording it
+            raise _NotRecorded(e.status_code, orjson.dumps({"detail": e.detail}))
+        except HTTPException as e:
+            return e.status_code, orjson.dumps({"detail": e.detail})
+        if submitted is not None and not submitted(result):
+            raise _NotRecorded(200, orjson.dumps(result))
+        return 200, orjson.dumps(result)
+
+    try:
+        stored, replayed = await get_idempotency_store().run(scoped_key, fingerprint, run)
+    except _NotRecorded as e:
+        return Response(content=e.body, status_code=e.status_code, media_type=JSON)
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    headers = {"Idempotency-Replayed": "true"} if replayed else {}
+    return Response(content=stored.body, status_code=stored.status_code, media_type=JSON, headers=headers)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.core.admin import require_admin
+from app.core.config import get_settings
+from app.core.profiling import get_profile_store
+from app.core.watchdog import get_watchdog
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+async def list_profiles():
+    store = get_profile_store()
+    return {"session_running": store.session_running, "profiles": store.list()}
+
+
+@router.post("/profiles/session")
+async def start_profiling_session(
+    seconds: float = Query(30.0, gt=0),
+    interval_ms: float = Query(None, ge=1, le=1000),
+):
+    settings = get_settings()
+    try:
+        profile = get_profile_store().start_session(
+            min(seconds, settings.profile_max_seconds),
+            (interval_ms or settings.profile_interval_ms) / 1000,
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return profile.info()
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, format: str = Query("speedscope", pattern="^(collapsed|speedscope)$")):
+    profile = get_profile_store().get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if not profile.done:
+        return JSONResponse(profile.info(), status_code=202)
+    if format == "collapsed":
+        return PlainTextResponse(profile.render(format))
+    return profile.render(format)
+
+
+@router.get("/loop-stalls")
+async def loop_stalls(
+    limit: int = Query(20, ge=1, le=200),
+    format: str = Query("json", pattern="^(json|collapsed)$"),
+):
+    watchdog = get_watchdog()
+    if format == "collapsed":
+        return PlainTextResponse(watchdog.collapsed())
+    return watchdog.report(limit)
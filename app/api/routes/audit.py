@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.admin import require_admin
+from app.db.session import engine, get_session
+from app.models.audit import AuditLog
+from app.models.risk import KillSwitchEvent
+from app.services.audit_query_service import AuditQueryService, InvalidCursor, stream_export
+
+
+router = APIRouter(prefix="/audit", tags=["audit"], dependencies=[Depends(require_admin)])
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+class EventFilters:
+    def __init__(
+        self,
+        user_id: Optional[str] = Query(None),
+        event: Optional[str] = Query(None, description="AuditLog.event or KillSwitchEvent.action"),
+        start: Optional[datetime] = Query(None, description="Inclusive lower bound on created_at (UTC)"),
+        end: Optional[datetime] = Query(None, description="Exclusive upper bound on created_at (UTC)"),
+    ) -> None:
+        self.values = dict(user_id=user_id, event=event, start=start, end=end)
+
+
+async def _page(model, filters: EventFilters, cursor: Optional[str], limit: int, session: AsyncSession):
+    try:
+        return await AuditQueryService(session).page(model, limit=limit, cursor=cursor, **filters.values)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _export(model, filters: EventFilters, fmt: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(engine, model, fmt, **filters.values),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+@router.get("/logs")
+async def list_audit_logs(
+    filters: EventFilters = Depends(),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_session),
+):
+    return await _page(AuditLog, filters, cursor, limit, session)
+
+
+@router.get("/logs/export")
+async def export_audit_logs(
+    filters: EventFilters = Depends(),
+    format: Literal["csv", "ndjson"] = Query("ndjson"),
+):
+    return _export(AuditLog, filters, format, "audit_logs")
+
+
+@router.get("/kill-events")
+async def list_kill_switch_events(
+    filters: EventFilters = Depends(),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_session),
+):
+    return await _page(KillSwitchEvent, filters, cursor, limit, session)
+
+
+@router.get("/kill-events/export")
+async def export_kill_switch_events(
+    filters: EventFilters = Depends(),
+    format: Literal["csv", "ndjson"] = Query("ndjson"),
+):
+    return _export(KillSwitchEvent, filters, format, "kill_switch_events")
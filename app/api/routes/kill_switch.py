@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_session
 from app.services.risk_service import RiskService
 from app.services.kill_switch_executor import KillSwitchExecutor
+from app.services.push_hub import push_hub
 
 
 router = APIRouter(prefix="/kill", tags=["kill-switch"]) 
@@ -27,6 +28,7 @@ async def status(session: AsyncSession = Depends(get_session)):
 async def activate(payload: ActionPayload, session: AsyncSession = Depends(get_session)):
     service = RiskService(session)
     status = await service.activate_kill_switch(payload.reason)
+    push_hub.publish("kill_switch", status.model_dump(mode="json"))
     await KillSwitchExecutor(session).execute_full_halt()
     return status
 
@@ -35,4 +37,5 @@ async def activate(payload: ActionPayload, session: AsyncSession = Depends(get_s
 async def deactivate(payload: ActionPayload, session: AsyncSession = Depends(get_session)):
     service = RiskService(session)
     status = await service.deactivate_kill_switch(payload.reason)
+    push_hub.publish("kill_switch", status.model_dump(mode="json"))
     return status
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException
+
+from app.services.portfolio_service import portfolio_view
+
+router = APIRouter(prefix="/live-data", tags=["live-data"]) 
+
+
+@router.get("/risk-metrics")
+async def risk_metrics():
+    try:
+        view = await portfolio_view()
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Broker error: {e}")
+    return view.risk_metrics
+
+
+@router.get("/holdings")
+async def holdings():
+    try:
+        view = await portfolio_view()
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Broker error: {e}")
+    return view.holdings
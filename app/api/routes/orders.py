@@ -1,37 +1,159 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from datetime import date, datetime
+from typing import Optional
 
-from app.services.dhan_client import DhanClient
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.idempotency import NotSubmitted, idempotent_response
+from app.api.snapshot_response import snapshot_response
+from app.db.session import get_session
+from app.models.payloads import OrderRequest, dump_order_requests
+from app.services.audit_service import AuditService
+from app.services.broker_sync_service import BrokerBookQuery
+from app.services.dhan_client import DhanClient, reached_broker
+from app.services.order_batch_service import OrderBatchService, batch_submitted, broker_rejection
+from app.services.order_book import SORT_FIELDS, order_book_index
+from app.services.risk_service import RiskService
+from app.services.snapshot_cache import broker_snapshot, snapshot_cache
 
 router = APIRouter(prefix="/orders", tags=["orders"]) 
 
 
+class BatchOrderRequest(BaseModel):
+    orders: list[OrderRequest] = Field(min_length=1, max_length=50)
+    all_or_nothing: bool = False
+
+
 @router.get("")
-async def list_orders():
-    async with DhanClient() as client:
-        try:
-            data = await client.get_orders()
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Broker error: {e}")
-    return data
+async def list_orders(request: Request, since: Optional[str] = Query(None)):
+    try:
+        snapshot = await broker_snapshot("orders")
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Broker error: {e}")
+    return snapshot_response(request, snapshot_cache, snapshot, since)
+
+
+@router.get("/page")
+async def order_page(
+    status: Optional[str] = Query(None, description="Comma-separated order statuses"),
+    symbol: Optional[str] = Query(None, description="Comma-separated trading symbols"),
+    side: Optional[str] = Query(None, description="BUY or SELL"),
+    time_from: Optional[datetime] = Query(None),
+    time_to: Optional[datetime] = Query(None),
+    sort: str = Query("createTime", description=f"One of {', '.join(SORT_FIELDS)}"),
+    descending: bool = Query(True),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    try:
+        index = await order_book_index()
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Broker error: {e}")
+    try:
+        return index.query(
+            status=status,
+            symbol=symbol,
+            side=side,
+            time_from=time_from.strftime("%Y-%m-%d %H:%M:%S") if time_from else None,
+            time_to=time_to.strftime("%Y-%m-%d %H:%M:%S") if time_to else None,
+            sort=sort,
+            descending=descending,
+            offset=offset,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/history")
+async def order_history(
+    status: Optional[str] = Query(None),
+    symbol: Optional[str] = Query(None),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    limit: int = Query(500, ge=1, le=5000),
+    session: AsyncSession = Depends(get_session),
+):
+    # Served from the locally synced book, not the broker
+    return await BrokerBookQuery(session).order_history(status=status, symbol=symbol, start=start, end=end, limit=limit)
+
+
+@router.get("/eod_report")
+async def eod_report(day: Optional[date] = Query(None), session: AsyncSession = Depends(get_session)):
+    return await BrokerBookQuery(session).eod_report(day or datetime.utcnow().date())
 
 
 @router.post("")
-async def place_order(payload: dict):
-    async with DhanClient() as client:
-        try:
-            data = await client.place_order(payload)
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Broker error: {e}")
-    return data
+async def place_order(
+    order: OrderRequest,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_session),
+):
+    payload = dump_order_requests([order])[0]
+
+    async def submit():
+        audit = AuditService(session)
+        rejection = (await RiskService(session).pre_trade_check([payload]))[0]
+        if rejection is not None:
+            await audit.record("order_place", detail=rejection, path="/orders", success=False)
+            raise NotSubmitted(status_code=403, detail=rejection)
+        async with DhanClient() as client:
+            try:
+                data = await client.place_order(payload)
+            except Exception as e:
+                await audit.record("order_place", detail=str(e), path="/orders", success=False)
+                error = HTTPException if reached_broker(e) else NotSubmitted
+                raise error(status_code=502, detail=f"Broker error: {e}")
+        await audit.record(
+            "order_place",
+            detail=broker_rejection(data) or (str(data.get("orderId")) if isinstance(data, dict) else None),
+            path="/orders",
+            success=broker_rejection(data) is None,
+        )
+        return data
+
+    if idempotency_key is None:
+        return await submit()
+    return await idempotent_response(request, idempotency_key, payload, submit)
 
 
 @router.post("/cancel_all")
-async def cancel_all():
+async def cancel_all(session: AsyncSession = Depends(get_session)):
+    audit = AuditService(session)
     async with DhanClient() as client:
         try:
             data = await client.cancel_all_orders()
         except Exception as e:
+            await audit.record("order_cancel_all", detail=str(e), path="/orders/cancel_all", success=False)
             raise HTTPException(status_code=502, detail=f"Broker error: {e}")
+    await audit.record("order_cancel_all", path="/orders/cancel_all")
     return data
+
+
+@router.post("/batch")
+async def place_batch(
+    payload: BatchOrderRequest,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_session),
+):
+    async def submit():
+        orders = dump_order_requests(payload.orders)
+        rejections = await RiskService(session).pre_trade_check(orders)
+        async with DhanClient() as client:
+            result = await OrderBatchService(client).place_batch(orders, rejections, all_or_nothing=payload.all_or_nothing)
+        await AuditService(session).record(
+            "order_batch",
+            detail=f"{result['placed']}/{len(orders)} placed",
+            path="/orders/batch",
+            success=result["ok"],
+        )
+        return result
+
+    if idempotency_key is None:
+        return await submit()
+    return await idempotent_response(request, idempotency_key, payload.model_dump(), submit, submitted=batch_submitted)
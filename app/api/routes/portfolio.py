@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException
+
+from app.services.portfolio_service import portfolio_view
+
+router = APIRouter(prefix="/portfolio", tags=["portfolio"]) 
+
+
+@router.get("/summary")
+async def summary():
+    try:
+        view = await portfolio_view()
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Broker error: {e}")
+    return view.summary
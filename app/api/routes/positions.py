@@ -1,21 +1,24 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from app.api.snapshot_response import snapshot_response
 from app.services.dhan_client import DhanClient
+from app.services.snapshot_cache import broker_snapshot, snapshot_cache
 
 router = APIRouter(prefix="/positions", tags=["positions"]) 
 
 
 @router.get("")
-async def list_positions():
-    async with DhanClient() as client:
-        try:
-            data = await client.get_positions()
-        except Exception as e:
-            raise HTTPException(status_code=502, detail=f"Broker error: {e}")
+async def list_positions(request: Request, since: Optional[str] = Query(None)):
+    try:
+        snapshot = await broker_snapshot("positions")
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Broker error: {e}")
     # TODO: compute P&L with LTP; placeholder passthrough
-    return data
+    return snapshot_response(request, snapshot_cache, snapshot, since)
 
 
 @router.get("/margin")
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_session
+from app.db.timeseries import get_timeseries_store
 from app.services.risk_service import RiskService
 
 
@@ -49,3 +51,20 @@ async def unlock_if_expired(session: AsyncSession = Depends(get_session)):
     service = RiskService(session)
     settings = await service.unlock_risk_if_expired()
     return settings
+
+
+@router.get("/pnl_curve")
+async def pnl_curve(
+    kind: str = Query("account", description="'account' or 'instrument'"),
+    key: str = Query("default", description="Account id or instrument symbol"),
+    start: Optional[datetime] = Query(None, description="Defaults to the start of the current UTC day"),
+    end: Optional[datetime] = Query(None, description="Defaults to now"),
+):
+    now = datetime.now(timezone.utc)
+    start = start or datetime.combine(now.date(), datetime.min.time(), tzinfo=timezone.utc)
+    end = end or now + timedelta(seconds=1)
+    try:
+        ts, values = get_timeseries_store().range(kind, key, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"ts": (ts // 1_000_000).tolist(), "value": values.tolist()}
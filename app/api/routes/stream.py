@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+import orjson
+from fastapi import APIRouter, Query, WebSocket
+from fastapi.responses import StreamingResponse
+
+from app.core.config import get_settings
+from app.services.push_hub import TOPICS, Subscription, heartbeat_message, push_hub
+
+
+router = APIRouter(prefix="/stream", tags=["stream"])
+
+
+def _parse_topics(topics: Optional[str]) -> list[str]:
+    if not topics:
+        return list(TOPICS)
+    return [t.strip() for t in topics.split(",") if t.strip() in TOPICS]
+
+
+async def _control(websocket: WebSocket, subscription: Subscription) -> None:
+    # Clients may change topics mid-stream: {"subscribe": [...]} / {"unsubscribe": [...]}
+    while True:
+        try:
+            command = orjson.loads(await websocket.receive_text())
+        except orjson.JSONDecodeError:
+            continue
+        if not isinstance(command, dict):
+            continue
+        for topic in command.get("subscribe") or []:
+            if topic in TOPICS and topic not in subscription.topics:
+                subscription.topics.add(topic)
+                push_hub.replay(subscription, topic)
+        for topic in command.get("unsubscribe") or []:
+            subscription.topics.discard(topic)
+
+
+async def _send(websocket: WebSocket, subscription: Subscription, heartbeat: float) -> None:
+    while True:
+        messages = await subscription.get(timeout=heartbeat)
+        if not messages:
+            await websocket.send_text(heartbeat_message().decode())
+        for _, message in messages:
+            await websocket.send_text(message.decode())
+
+
+@router.websocket("/ws")
+async def stream_ws(websocket: WebSocket, topics: Optional[str] = Query(None)):
+    await websocket.accept()
+    subscription = push_hub.subscribe(_parse_topics(topics))
+    tasks = {
+        asyncio.create_task(_control(websocket, subscription)),
+        asyncio.create_task(_send(websocket, subscription, get_settings().push_heartbeat_interval)),
+    }
+    try:
+        # Whichever side ends first (client gone, send failed) tears down the other
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        push_hub.unsubscribe(subscription)
+
+
+async def _sse_events(subscription: Subscription, heartbeat: float) -> AsyncIterator[bytes]:
+    try:
+        while True:
+            messages = await subscription.get(timeout=heartbeat)
+            if not messages:
+                yield b": heartbeat\n\n"
+            for topic, message in messages:
+                yield b"event: " + topic.encode() + b"\ndata: " + message + b"\n\n"
+    finally:
+        push_hub.unsubscribe(subscription)
+
+
+@router.get("/sse")
+async def stream_sse(topics: Optional[str] = Query(None)):
+    subscription = push_hub.subscribe(_parse_topics(topics))
+    return StreamingResponse(
+        _sse_events(subscription, get_settings().push_heartbeat_interval),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import orjson
+from fastapi import Request, Response
+
+from app.core.compression import compress, negotiate, should_compress
+from app.core.metrics import COMPRESSION_CACHE_HITS
+from app.services.snapshot_cache import Snapshot, SnapshotCache
+
+
+JSON = "application/json"
+
+
+def _etag_matches(request: Request, version: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip().removeprefix("W/").strip('"')
+        # Encoded representations carry a "-<coding>" suffix on the same version
+        if tag == "*" or tag.partition("-")[0] == version:
+            return True
+    return False
+
+
+def _encoded_body(snapshot: Snapshot, coding: Optional[str]) -> tuple[bytes, Optional[str]]:
+    """Snapshot body in ``coding``, compressed at most once per snapshot version."""
+    if coding is None or not should_compress(len(snapshot.body)):
+        return snapshot.body, None
+    body = snapshot.encodings.get(coding)
+    if body is None:
+        body = snapshot.encodings[coding] = compress(snapshot.body, coding)
+    else:
+        COMPRESSION_CACHE_HITS.labels(encoding=coding).inc()
+    return body, coding
+
+
+def snapshot_response(
+    request: Request,
+    cache: SnapshotCache,
+    snapshot: Snapshot,
+    since: Optional[str] = None,
+) -> Response:
+    """Full body, delta or 304 for a snapshot, depending on the request.
+
+    - ``If-None-Match`` equal to the current ETag: 304 with no body.
+    - ``?since=<version>`` known to the cache: only added/changed/removed rows.
+    - Otherwise (or unknown version): the full payload, compressed per
+      ``Accept-Encoding`` from the snapshot's cached encodings.
+    """
+    headers = {
+        "ETag": snapshot.etag,
+        "X-Snapshot-Version": snapshot.version,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "X-Snapshot-Age": f"{snapshot.age:.3f}",
+    }
+    coding = negotiate(request.headers.get("accept-encoding"))
+    if coding is not None and should_compress(len(snapshot.body)):
+        headers["ETag"] = f'"{snapshot.version}-{coding}"'
+    if _etag_matches(request, snapshot.version):
+        return Response(status_code=304, headers=headers)
+    if since is not None:
+        delta = cache.delta(snapshot.topic, since)
+        if delta is None:
+            delta = {"version": snapshot.version, "since": since, "full": True, "rows": snapshot.rows}
+        return Response(content=orjson.dumps(delta), media_type=JSON, headers=headers)
+    body, coding = _encoded_body(snapshot, coding)
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type=JSON, headers=headers)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from app.core.config import get_settings
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    expected = get_settings().admin_token
+    return bool(expected and token and hmac.compare_digest(token, expected))
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import gzip
+import time
+from typing import Callable, Optional
+
+from app.core.metrics import COMPRESSION_RATIO, COMPRESSION_SECONDS
+from app.core.production_config import production_settings
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 keeps output deterministic, so cached bodies are byte-identical across workers
+    return gzip.compress(data, compresslevel=production_settings.compression_gzip_level, mtime=0)
+
+
+# Server preference order; codings whose library is missing are left out
+CODECS: dict[str, Callable[[bytes], bytes]] = {}
+if zstandard is not None:
+    _zstd = zstandard.ZstdCompressor(level=3)
+    CODECS["zstd"] = _zstd.compress
+if brotli is not None:
+    CODECS["br"] = lambda data: brotli.compress(data, quality=4)
+CODECS["gzip"] = _gzip
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported coding from an ``Accept-Encoding`` header.
+
+    Highest q-value wins; ties go to the server's preference order.
+    """
+    if not accept_encoding or not production_settings.enable_compression:
+        return None
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for coding in CODECS:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data: bytes, coding: str) -> bytes:
+    started = time.thread_time()
+    compressed = CODECS[coding](data)
+    COMPRESSION_SECONDS.labels(encoding=coding).observe(time.thread_time() - started)
+    COMPRESSION_RATIO.labels(encoding=coding).observe(len(compressed) / len(data))
+    return compressed
+
+
+def should_compress(size: int) -> bool:
+    return production_settings.enable_compression and size >= production_settings.compression_min_size
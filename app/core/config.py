@@ -8,13 +8,26 @@ class Settings(BaseSettings):
     environment: str = "development"
     database_url: str = "sqlite+aiosqlite:///./app.db"
     redis_url: str = "redis://localhost:6379/0"
+    redis_socket_timeout: float = 0.25
+    # After a Redis error, in-process fallbacks are used for this long before retrying
+    redis_retry_after: float = 30.0
     secret: str = "CHANGE_ME"
+    # Shared secret for /api/admin and on-demand profiling (X-Admin-Token); disabled when unset
+    admin_token: str | None = None
 
     # Dhan HQ
     dhan_base_url: str = "https://sandbox.dhan.co/v2/"
     dhan_api_key: str | None = None
     dhan_client_id: str | None = None
     dhan_client_secret: str | None = None
+    # Outbound order placement/cancel pacing (Dhan allows ~10 order requests/sec)
+    broker_order_rate: float = 10.0
+    broker_order_burst: int = 10
+
+    # Idempotency-Key handling for order placement
+    idempotency_ttl: float = 24 * 60 * 60
+    idempotency_max_entries: int = 10_000
+    idempotency_wait_timeout: float = 10.0
 
     # RMS defaults
     max_daily_total_loss: float = 1200.0
@@ -22,6 +35,49 @@ class Settings(BaseSettings):
     per_position_daily_profit_target: float = 500.0
     max_daily_total_profit_target: float = 2200.0
 
+    # Local broker book sync (only runs when a Dhan API key is configured)
+    broker_sync_interval: float = 5.0
+
+    # Positions/orders polls within this window share one broker fetch
+    snapshot_max_age: float = 1.0
+
+    # Server push (WebSocket/SSE)
+    push_poll_interval: float = 1.0
+    push_heartbeat_interval: float = 15.0
+
+    # Event loop lag admission control
+    loop_lag_interval: float = 0.1
+    loop_lag_shed_threshold: float = 0.2  # low priority: stale reads, market proxy shed
+    loop_lag_severe_threshold: float = 1.0  # normal priority shed as well
+    admission_low_priority_limit: int = 64  # concurrent low-priority requests per worker
+
+    # NiceGUI pages
+    ui_section_timeout: float = 3.0
+
+    # Blocking-call watchdog
+    watchdog_enabled: bool = True
+    watchdog_threshold: float = 0.1
+    watchdog_sample_interval: float = 0.01
+    watchdog_keep: int = 50
+
+    # On-demand profiling
+    profile_interval_ms: float = 5.0
+    profile_max_seconds: float = 300.0
+    profile_keep: int = 20
+
+    # Audit writer
+    audit_queue_size: int = 10_000
+    audit_batch_size: int = 500
+    audit_flush_interval: float = 0.5
+
+    # Intraday equity / P&L time series
+    timeseries_dir: str = "./data/timeseries"
+    timeseries_retention_days: int = 30
+
+    # Audit / kill-switch event retention (Postgres daily partitions)
+    audit_retention_days: int = 90
+    partition_days_ahead: int = 7
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
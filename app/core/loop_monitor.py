@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.core.metrics import EVENT_LOOP_LAG, EVENT_LOOP_LAG_SECONDS
+
+
+# Set by admission control for low-priority requests admitted under lag:
+# snapshot-backed reads then serve the cached snapshot instead of refetching.
+prefer_stale: ContextVar[bool] = ContextVar("prefer_stale", default=False)
+
+
+class LoopLagMonitor:
+    """Measures event loop lag by how late a periodic sleep wakes up.
+
+    ``lag`` decays instead of dropping to zero after one on-time tick, so load
+    shedding does not flap between samples during a sustained surge.
+    """
+
+    def __init__(self, interval: float = 0.1, decay: float = 0.7) -> None:
+        self.interval = interval
+        self.decay = decay
+        self.lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            sample = max(0.0, time.perf_counter() - expected)
+            self.lag = max(sample, self.lag * self.decay)
+            EVENT_LOOP_LAG_SECONDS.observe(sample)
+            EVENT_LOOP_LAG.set(self.lag)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="loop_lag_monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.lag = 0.0
+
+
+loop_monitor = LoopLagMonitor()
+
+
+async def start_loop_monitor() -> None:
+    loop_monitor.interval = get_settings().loop_lag_interval
+    await loop_monitor.start()
+    logger.info("loop_monitor_started")
+
+
+async def shutdown_loop_monitor() -> None:
+    await loop_monitor.stop()
+    logger.info("loop_monitor_stopped")
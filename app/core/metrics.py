@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from prometheus_client import Counter, Gauge, Histogram
+
+
+# Database
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled DB connection (includes connect on pool growth)",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "DB connections currently checked out of the pool",
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "DB statement execution latency",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+# Broker order/position book sync
+BROKER_SYNC_ROWS = Counter(
+    "broker_sync_rows_written_total",
+    "Rows written while syncing broker snapshots",
+    ["kind", "op"],
+)
+BROKER_SYNC_SECONDS = Histogram(
+    "broker_sync_duration_seconds",
+    "Duration of one broker snapshot sync (diff + write)",
+    ["kind"],
+)
+
+
+# Server push (WebSocket / SSE)
+PUSH_SUBSCRIBERS = Gauge(
+    "push_subscribers",
+    "Connected push subscribers",
+)
+PUSH_MESSAGES = Counter(
+    "push_messages_published_total",
+    "Topic updates published to push subscribers",
+    ["topic"],
+)
+PUSH_CONFLATED = Counter(
+    "push_messages_conflated_total",
+    "Pending updates replaced by a newer one before a slow subscriber read them",
+    ["topic"],
+)
+UI_REFRESH_TASKS = Gauge(
+    "ui_refresh_tasks",
+    "In-flight NiceGUI page refreshes per connected client",
+    ["client"],
+)
+
+
+# Response compression
+COMPRESSION_SECONDS = Histogram(
+    "http_compression_seconds",
+    "CPU time spent compressing one response body",
+    ["encoding"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+COMPRESSION_RATIO = Histogram(
+    "http_compression_ratio",
+    "Compressed size divided by original size",
+    ["encoding"],
+    buckets=(0.02, 0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0),
+)
+COMPRESSION_CACHE_HITS = Counter(
+    "http_compression_cache_hits_total",
+    "Snapshot responses served from an already compressed body",
+    ["encoding"],
+)
+
+
+# Inbound rate limiting
+RATE_LIMIT_THROTTLED = Counter(
+    "rate_limit_throttled_total",
+    "Requests rejected with 429",
+    ["route_class"],
+)
+RATE_LIMIT_FALLBACK = Counter(
+    "rate_limit_local_fallback_total",
+    "Rate limit decisions taken in-process because Redis was unavailable",
+)
+
+
+# Outbound broker calls
+BROKER_THROTTLE_WAIT_SECONDS = Histogram(
+    "broker_order_throttle_wait_seconds",
+    "Time an order request waited for the outbound broker rate limiter",
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+ORDER_BATCH_LEGS = Counter(
+    "order_batch_legs_total",
+    "Batch order legs by outcome",
+    ["status"],
+)
+IDEMPOTENCY_REPLAYS = Counter(
+    "idempotency_replays_total",
+    "Order requests answered from a stored Idempotency-Key response",
+    ["source"],
+)
+
+
+# Portfolio views
+PORTFOLIO_VIEW_BUILDS = Counter(
+    "portfolio_view_builds_total",
+    "Portfolio summary/risk metric computations (one per new broker snapshot version)",
+)
+ORDER_BOOK_INDEX_BUILDS = Counter(
+    "order_book_index_builds_total",
+    "Order book page index rebuilds (one per new orders snapshot version)",
+)
+
+
+# HTTP RED metrics (rate, errors, duration) per route template
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response body is sent",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method", "route"],
+)
+HTTP_COMPONENT_SECONDS = Histogram(
+    "http_request_component_seconds",
+    "Request latency split into broker, db and app (everything else) time",
+    ["route", "component"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+# Event loop health and admission control
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "How late the loop lag probe woke up",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_current_seconds",
+    "Decaying event loop lag used for admission control",
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_total",
+    "Requests rejected with 503 by admission control",
+    ["priority", "reason"],
+)
+ADMISSION_STALE = Counter(
+    "admission_served_stale_total",
+    "Low-priority reads admitted under lag and served from cached snapshots",
+)
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Times the event loop was blocked past the watchdog threshold",
+)
+EVENT_LOOP_STALL_SECONDS = Histogram(
+    "event_loop_stall_seconds",
+    "Duration of event loop stalls caught by the watchdog",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
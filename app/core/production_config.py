@@ -5,7 +5,8 @@ Optimized settings for production deployment
 
 import os
 from typing import Optional
-from pydantic import BaseSettings, validator
+from pydantic import validator
+from pydantic_settings import BaseSettings
 
 class ProductionSettings(BaseSettings):
     """Production-specific configuration settings"""
@@ -31,6 +32,11 @@ class ProductionSettings(BaseSettings):
     database_pool_size: int = 20
     database_max_overflow: int = 30
     database_pool_timeout: int = 30
+    database_pool_recycle: int = 1800  # seconds
+    database_statement_timeout_ms: int = 10_000
+    database_statement_cache_size: int = 500
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # 256MB
+    sqlite_busy_timeout_ms: int = 5_000
     
     # CORS
     cors_origins: list = ["https://your-domain.com"]
@@ -39,8 +45,13 @@ class ProductionSettings(BaseSettings):
     cors_allow_headers: list = ["Authorization", "Content-Type"]
     
     # Rate Limiting
+    rate_limit_enabled: bool = True
     rate_limit_requests: int = 100
     rate_limit_window: int = 60  # seconds
+    # Per route class overrides of rate_limit_requests (same window)
+    rate_limit_market_requests: int = 30  # broker proxy calls burn Dhan quota
+    rate_limit_orders_requests: int = 60
+    rate_limit_read_requests: int = 300  # polled snapshot reads
     
     # Logging
     log_file: str = "logs/app.log"
@@ -69,6 +80,8 @@ class ProductionSettings(BaseSettings):
     max_concurrent_requests: int = 1000
     request_timeout: int = 60
     enable_compression: bool = True
+    compression_min_size: int = 1024  # bytes; smaller bodies go out as-is
+    compression_gzip_level: int = 6
     enable_caching: bool = True
     
     # Backup
@@ -78,7 +91,8 @@ class ProductionSettings(BaseSettings):
     
     @validator('secret_key')
     def validate_secret_key(cls, v):
-        if v == "CHANGE_ME_IN_PRODUCTION":
+        # pydantic-settings validates defaults, so only enforce when actually deployed
+        if v == "CHANGE_ME_IN_PRODUCTION" and os.getenv("ENVIRONMENT") == "production":
             raise ValueError("SECRET_KEY must be changed in production")
         return v
     
@@ -91,6 +105,7 @@ class ProductionSettings(BaseSettings):
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
+        extra = "ignore"
 
 # Production settings instance
 production_settings = ProductionSettings()
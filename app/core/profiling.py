@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any, Optional
+
+from app.core.config import get_settings
+
+
+Stack = tuple[str, ...]
+
+_CWD = os.getcwd() + os.sep
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_CWD):
+        filename = filename[len(_CWD):]
+    elif "site-packages" in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+def frame_stack(frame: Optional[FrameType]) -> Stack:
+    """Root-first labels for ``frame`` and its callers."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return tuple(reversed(labels))
+
+
+class StackSampler:
+    """Samples Python stacks from a background thread every ``interval`` seconds.
+
+    Statistical, so overhead is bounded by the interval rather than by how many
+    calls the profiled code makes. With ``thread_ids`` unset every thread but the
+    sampler itself is recorded, and each stack is rooted at its thread name.
+    """
+
+    def __init__(self, interval: float, thread_ids: Optional[set[int]] = None) -> None:
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.samples: Counter[Stack] = Counter()
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own or (self.thread_ids is not None and ident not in self.thread_ids):
+                continue
+            stack = frame_stack(frame)
+            if self.thread_ids is None or len(self.thread_ids) > 1:
+                stack = (f"thread:{names.get(ident, ident)}",) + stack
+            self.samples[stack] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> "StackSampler":
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.time() - self.started_at
+        return self
+
+
+def to_collapsed(samples: Counter[Stack]) -> str:
+    """Brendan Gregg's folded format, readable by flamegraph.pl, speedscope and inferno."""
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in samples.most_common())
+
+
+def to_speedscope(samples: Counter[Stack], interval: float, name: str) -> dict[str, Any]:
+    frames: list[dict[str, Any]] = []
+    index: dict[str, int] = {}
+    stacks, weights = [], []
+    for stack, count in samples.items():
+        ids = []
+        for label in stack:
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({"name": label})
+            ids.append(index[label])
+        stacks.append(ids)
+        weights.append(count * interval * 1000)
+    total = sum(weights)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": total,
+            "samples": stacks,
+            "weights": weights,
+        }],
+        "name": name,
+        "exporter": "trading-middleware",
+    }
+
+
+FORMATS = ("collapsed", "speedscope")
+
+
+@dataclass
+class Profile:
+    id: str
+    name: str
+    interval: float
+    samples: Counter[Stack] = field(default_factory=Counter)
+    started_at: float = field(default_factory=time.time)
+    duration: float = 0.0
+    done: bool = False
+
+    def render(self, fmt: str) -> Any:
+        if fmt == "speedscope":
+            return to_speedscope(self.samples, self.interval, self.name)
+        return to_collapsed(self.samples)
+
+    def info(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration": round(self.duration, 3),
+            "samples": sum(self.samples.values()),
+            "done": self.done,
+        }
+
+
+class ProfileStore:
+    """Keeps the most recent profiles in memory for download from the admin API."""
+
+    def __init__(self, keep: int) -> None:
+        self.keep = keep
+        self._profiles: OrderedDict[str, Profile] = OrderedDict()
+        self._session: Optional[asyncio.Task] = None
+
+    def new(self, name: str, interval: float) -> Profile:
+        profile = Profile(id=uuid.uuid4().hex[:12], name=name, interval=interval)
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.keep:
+            self._profiles.popitem(last=False)
+        return profile
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> list[dict[str, Any]]:
+        return [p.info() for p in reversed(self._profiles.values())]
+
+    @property
+    def session_running(self) -> bool:
+        return self._session is not None and not self._session.done()
+
+    def start_session(self, seconds: float, interval: float) -> Profile:
+        """Sample every thread for ``seconds`` in the background (e.g. across market open)."""
+        if self.session_running:
+            raise RuntimeError("A profiling session is already running")
+        profile = self.new(f"process {seconds:g}s", interval)
+        sampler = StackSampler(interval).start()
+
+        async def finish() -> None:
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                sampler.stop()
+                profile.samples, profile.duration, profile.done = sampler.samples, sampler.duration, True
+
+        self._session = asyncio.create_task(finish(), name="profiling_session")
+        return profile
+
+
+_store: Optional[ProfileStore] = None
+
+
+def get_profile_store() -> ProfileStore:
+    global _store
+    if _store is None:
+        _store = ProfileStore(get_settings().profile_keep)
+    return _store
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import math
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.metrics import RATE_LIMIT_FALLBACK
+from app.core.redis import get_redis, mark_redis_down
+
+
+# Sliding window log: one ZSET member per admitted request, scored by its time in ms.
+# Uses the Redis clock so every worker agrees on the window.
+SLIDING_WINDOW_LUA = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now_ms - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit then
+    redis.call('ZADD', KEYS[1], now_ms, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, limit - count - 1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, 0, tonumber(oldest[2]) + window - now_ms}
+"""
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    remaining: int
+    retry_after: float  # seconds; 0 when allowed
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class LocalSlidingWindow:
+    """Per-process sliding window log; used when Redis is unavailable."""
+
+    def __init__(self) -> None:
+        self._hits: dict[str, deque[float]] = {}
+        self._last_sweep = time.monotonic()
+
+    def hit(self, key: str, limit: int, window: float) -> Decision:
+        now = time.monotonic()
+        hits = self._hits.setdefault(key, deque())
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if now - self._last_sweep > window:
+            self._sweep(now, window)
+        if len(hits) < limit:
+            hits.append(now)
+            return Decision(True, limit - len(hits), 0.0)
+        return Decision(False, 0, hits[0] + window - now)
+
+    def _sweep(self, now: float, window: float) -> None:
+        # Drop identities that have gone quiet so the map does not grow unbounded
+        self._last_sweep = now
+        for key in [k for k, hits in self._hits.items() if not hits or hits[-1] <= now - window]:
+            del self._hits[key]
+
+
+class RateLimiter:
+    """Sliding-window limiter shared across workers through Redis.
+
+    Falls back to ``LocalSlidingWindow`` (per-process limits) while Redis is
+    down, so an outage degrades limits instead of failing requests.
+    """
+
+    def __init__(self, redis: Optional[Redis] = None, prefix: str = "rl") -> None:
+        self._redis = redis
+        self.prefix = prefix
+        self.local = LocalSlidingWindow()
+        self._script = None
+
+    def _client(self) -> Optional[Redis]:
+        return self._redis if self._redis is not None else get_redis()
+
+    async def hit(self, key: str, limit: int, window: float) -> Decision:
+        client = self._client()
+        if client is not None:
+            try:
+                if self._script is None or self._script.registered_client is not client:
+                    self._script = client.register_script(SLIDING_WINDOW_LUA)
+                allowed, remaining, retry_ms = await self._script(
+                    keys=[f"{self.prefix}:{key}"],
+                    args=[int(window * 1000), limit, uuid.uuid4().hex],
+                )
+                return Decision(bool(allowed), int(remaining), int(retry_ms) / 1000)
+            except (RedisError, OSError) as e:
+                mark_redis_down(e)
+        RATE_LIMIT_FALLBACK.inc()
+        return self.local.hit(key, limit, window)
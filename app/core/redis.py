@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from app.core.config import get_settings
+from app.core.logging import logger
+
+
+_client: Optional[Redis] = None
+_down_until = 0.0
+
+
+def get_redis() -> Optional[Redis]:
+    """Shared async Redis client, or None while Redis is considered unavailable.
+
+    Callers fall back to in-process state when this returns None and report
+    failures through ``mark_redis_down`` so one outage does not cost every
+    request a connect timeout.
+    """
+    global _client
+    if time.monotonic() < _down_until:
+        return None
+    if _client is None:
+        settings = get_settings()
+        _client = Redis.from_url(
+            settings.redis_url,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+        )
+    return _client
+
+
+def mark_redis_down(error: Exception) -> None:
+    global _down_until
+    if time.monotonic() >= _down_until:
+        logger.warning("redis_unavailable", error=str(error))
+    _down_until = time.monotonic() + get_settings().redis_retry_after
+
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
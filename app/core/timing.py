@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+# Seconds spent per component ("broker", "db") by the current request.
+# The dict is shared with tasks spawned by the request (they copy the context,
+# not the dict), so concurrent broker legs all add to the same totals.
+_component_seconds: ContextVar[Optional[dict[str, float]]] = ContextVar("component_seconds", default=None)
+
+
+def start_request_timing() -> tuple[dict[str, float], object]:
+    timings: dict[str, float] = {}
+    return timings, _component_seconds.set(timings)
+
+
+def end_request_timing(token: object) -> None:
+    _component_seconds.reset(token)
+
+
+def add_component_time(component: str, seconds: float) -> None:
+    timings = _component_seconds.get()
+    if timings is not None:
+        timings[component] = timings.get(component, 0.0) + seconds
+
+
+def component_total(component: str) -> float:
+    timings = _component_seconds.get()
+    return timings.get(component, 0.0) if timings is not None else 0.0
+
+
+@contextmanager
+def component_timer(component: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_component_time(component, time.perf_counter() - started)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.core.metrics import EVENT_LOOP_STALL_SECONDS, EVENT_LOOP_STALLS
+from app.core.profiling import Stack, frame_stack, to_collapsed
+
+
+_APP_MARKER = " (app" + os.sep
+
+
+def _caller(stack: Stack) -> Optional[str]:
+    """Innermost frame from our own code, i.e. who made the blocking call."""
+    for label in reversed(stack):
+        if _APP_MARKER in label:
+            return label
+    return None
+
+
+@dataclass
+class Stall:
+    began: float  # monotonic, for the duration
+    started_at: float  # wall clock, for the report
+    duration: float = 0.0
+    samples: Counter[Stack] = field(default_factory=Counter)
+
+    def top_stack(self) -> Stack:
+        return self.samples.most_common(1)[0][0] if self.samples else ()
+
+    def info(self) -> dict[str, Any]:
+        stack = self.top_stack()
+        return {
+            "started_at": self.started_at,
+            "duration": round(self.duration, 4),
+            "samples": sum(self.samples.values()),
+            "blocking_frame": stack[-1] if stack else None,
+            "caller": _caller(stack),
+            "stack": list(stack),
+        }
+
+
+class LoopWatchdog:
+    """Records what the event loop thread is doing while the loop is stalled.
+
+    A heartbeat task on the loop stamps the time every ``heartbeat`` seconds.
+    A watchdog thread checks the stamp every ``sample_interval``; once it is
+    older than ``threshold`` the loop thread's stack is sampled until the
+    heartbeat resumes. Each stall keeps its samples, so the report names the
+    frame that held the loop (synchronous logging, JSON encoding, SQLite I/O).
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        sample_interval: float = 0.01,
+        keep: int = 50,
+    ) -> None:
+        self.threshold = threshold
+        self.sample_interval = sample_interval
+        self.heartbeat = min(threshold / 4, 0.05)
+        self.stalls: deque[Stall] = deque(maxlen=keep)
+        self.total_stalls = 0
+        self._beat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.heartbeat)
+
+    def _finish(self, stall: Stall) -> None:
+        stall.duration = time.monotonic() - stall.began
+        EVENT_LOOP_STALLS.inc()
+        EVENT_LOOP_STALL_SECONDS.observe(stall.duration)
+        with self._lock:
+            self.stalls.append(stall)
+            self.total_stalls += 1
+        info = stall.info()
+        logger.warning(
+            "event_loop_stall",
+            duration=info["duration"],
+            blocking_frame=info["blocking_frame"],
+            caller=info["caller"],
+        )
+
+    def _watch(self) -> None:
+        stall: Optional[Stall] = None
+        while not self._stop.wait(self.sample_interval):
+            beat = self._beat
+            if time.monotonic() - beat < self.threshold + self.heartbeat:
+                if stall is not None:
+                    self._finish(stall)
+                    stall = None
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            if stall is None:
+                stall = Stall(began=beat, started_at=time.time() - (time.monotonic() - beat))
+            stall.samples[frame_stack(frame)] += 1
+        if stall is not None:
+            self._finish(stall)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat(), name="loop_watchdog_heartbeat")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def report(self, limit: int = 20) -> dict[str, Any]:
+        """Recent stalls plus blocked time aggregated by the frame that blocked."""
+        with self._lock:
+            stalls = list(self.stalls)
+            total = self.total_stalls
+        culprits: dict[tuple[Optional[str], Optional[str]], dict[str, Any]] = {}
+        for stall in stalls:
+            info = stall.info()
+            key = (info["blocking_frame"], info["caller"])
+            entry = culprits.setdefault(key, {
+                "blocking_frame": key[0], "caller": key[1], "stalls": 0, "seconds": 0.0, "max_seconds": 0.0,
+            })
+            entry["stalls"] += 1
+            entry["seconds"] = round(entry["seconds"] + stall.duration, 4)
+            entry["max_seconds"] = max(entry["max_seconds"], round(stall.duration, 4))
+        return {
+            "running": self.running,
+            "threshold": self.threshold,
+            "total_stalls": total,
+            "culprits": sorted(culprits.values(), key=lambda c: c["seconds"], reverse=True),
+            "recent": [s.info() for s in reversed(stalls)][:limit],
+        }
+
+    def collapsed(self) -> str:
+        """All stall samples in folded format, for a flamegraph of what blocks the loop."""
+        with self._lock:
+            samples: Counter[Stack] = Counter()
+            for stall in self.stalls:
+                samples.update(stall.samples)
+        return to_collapsed(samples)
+
+
+_watchdog: Optional[LoopWatchdog] = None
+
+
+def get_watchdog() -> LoopWatchdog:
+    global _watchdog
+    if _watchdog is None:
+        settings = get_settings()
+        _watchdog = LoopWatchdog(
+            threshold=settings.watchdog_threshold,
+            sample_interval=settings.watchdog_sample_interval,
+            keep=settings.watchdog_keep,
+        )
+    return _watchdog
+
+
+async def start_watchdog() -> None:
+    if not get_settings().watchdog_enabled:
+        return
+    watchdog = get_watchdog()
+    await watchdog.start()
+    logger.info("loop_watchdog_started", threshold=watchdog.threshold)
+
+
+async def shutdown_watchdog() -> None:
+    if _watchdog is not None:
+        await _watchdog.stop()
+        logger.info("loop_watchdog_stopped")
@@ -1,30 +1,157 @@
 from __future__ import annotations
 
-from typing import AsyncGenerator
+import time
+from pathlib import Path
+from typing import Any, AsyncGenerator
 
-from sqlmodel import SQLModel
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import get_settings
+from app.core.metrics import DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUT_SECONDS, DB_QUERY_SECONDS
+from app.core.production_config import production_settings
+from app.core.timing import add_component_time
 
 # Import models to register tables in SQLModel metadata
 from app.models import risk  # noqa: F401
 from app.models import audit  # noqa: F401
+from app.models import broker  # noqa: F401
 
 
 settings = get_settings()
 
-engine = create_async_engine(settings.database_url, future=True, echo=False, pool_pre_ping=True)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports how long callers wait to get a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            DB_POOL_CHECKOUT_SECONDS.observe(elapsed)
+            add_component_time("db", elapsed)
+
+
+def _postgres_profile() -> dict[str, Any]:
+    return dict(
+        poolclass=InstrumentedQueuePool,
+        pool_size=production_settings.database_pool_size,
+        max_overflow=production_settings.database_max_overflow,
+        pool_timeout=production_settings.database_pool_timeout,
+        pool_recycle=production_settings.database_pool_recycle,
+        pool_pre_ping=True,
+        connect_args={
+            "prepared_statement_cache_size": production_settings.database_statement_cache_size,
+            "command_timeout": production_settings.database_statement_timeout_ms / 1000,
+            "server_settings": {
+                "application_name": "trading_middleware",
+                "statement_timeout": str(production_settings.database_statement_timeout_ms),
+                "idle_in_transaction_session_timeout": str(production_settings.database_statement_timeout_ms * 6),
+            },
+        },
+    )
+
+
+def _sqlite_profile(in_memory: bool) -> dict[str, Any]:
+    options: dict[str, Any] = dict(connect_args={"timeout": production_settings.sqlite_busy_timeout_ms / 1000})
+    if not in_memory:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=production_settings.database_pool_size,
+            max_overflow=production_settings.database_max_overflow,
+            pool_timeout=production_settings.database_pool_timeout,
+        )
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={int(production_settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(production_settings.sqlite_busy_timeout_ms)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else "UNKNOWN"
+    DB_QUERY_SECONDS.labels(operation=operation).observe(elapsed)
+    add_component_time("db", elapsed)
+
+
+def _on_error(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    DB_POOL_CHECKED_OUT.dec()
+
+
+def build_engine(database_url: str) -> AsyncEngine:
+    """Create the async engine with the tuning profile for its backend."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        options = _postgres_profile()
+    elif backend == "sqlite":
+        options = _sqlite_profile(in_memory=url.database in (None, "", ":memory:"))
+    else:
+        options = dict(pool_pre_ping=True)
+
+    new_engine = create_async_engine(url, future=True, echo=False, **options)
+    sync_engine = new_engine.sync_engine
+    if backend == "sqlite":
+        event.listen(sync_engine, "connect", _apply_sqlite_pragmas)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _on_error)
+    event.listen(sync_engine.pool, "checkout", _on_checkout)
+    event.listen(sync_engine.pool, "checkin", _on_checkin)
+    return new_engine
+
+
+engine = build_engine(settings.database_url)
 
 async_session_maker = sessionmaker(
     engine, expire_on_commit=False, class_=AsyncSession, autoflush=False, autocommit=False
 )
 
 
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def _run_migrations(connection) -> None:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = connection
+    tables = inspect(connection).get_table_names()
+    if "audit_logs" in tables and "alembic_version" not in tables:
+        # Database created by the old create_all bootstrap; adopt it as the initial revision
+        command.stamp(config, "0001")
+    command.upgrade(config, "head")
+
+
 async def init_db() -> None:
     async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_run_migrations)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import threading
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import get_settings
+
+
+_TS_DTYPE = np.dtype("<i8")  # epoch nanoseconds, UTC
+_VAL_DTYPE = np.dtype("<f8")
+_SAFE_KEY = re.compile(r"[^A-Za-z0-9_.-]")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+# Integer arithmetic throughout: float seconds cannot hold microseconds at
+# today's epoch offsets, so neighbouring timestamps could collide or reorder
+def _to_ns(ts: datetime) -> int:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (ts - _EPOCH) // _MICROSECOND * 1000
+
+
+def _day_of(ts_ns: int) -> date:
+    return (_EPOCH + ts_ns // 1000 * _MICROSECOND).date()
+
+
+class Series:
+    """One append-only column pair (timestamps, values) backed by two memory-mapped files.
+
+    Unused capacity is zero-filled, so the row count is recovered on open with a
+    binary search for the first zero timestamp; no separate header is kept.
+    """
+
+    def __init__(self, directory: Path, key: str, capacity: int = 4096) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.ts_path = directory / f"{key}.ts"
+        self.val_path = directory / f"{key}.val"
+        self._initial_capacity = capacity
+        self._open()
+
+    def _open(self) -> None:
+        if not self.ts_path.exists():
+            self._resize(self._initial_capacity)
+        capacity = os.path.getsize(self.ts_path) // _TS_DTYPE.itemsize
+        self._ts = np.memmap(self.ts_path, dtype=_TS_DTYPE, mode="r+", shape=(capacity,))
+        self._val = np.memmap(self.val_path, dtype=_VAL_DTYPE, mode="r+", shape=(capacity,))
+        self.count = self._recover_count()
+
+    def _resize(self, capacity: int) -> None:
+        for path, dtype in ((self.ts_path, _TS_DTYPE), (self.val_path, _VAL_DTYPE)):
+            with open(path, "ab") as fh:
+                fh.truncate(capacity * dtype.itemsize)
+
+    def _recover_count(self) -> int:
+        lo, hi = 0, len(self._ts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts[mid] == 0:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    @property
+    def capacity(self) -> int:
+        return len(self._ts)
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(self.capacity * 2, needed, self._initial_capacity)
+        self.flush()
+        # Readers holding views keep the old mapping alive until they drop them
+        del self._ts, self._val
+        self._resize(capacity)
+        self._open()
+
+    def append(self, ts_ns: int, value: float) -> None:
+        if ts_ns <= 0:
+            raise ValueError("Timestamp must be positive epoch nanoseconds")
+        if self.count and ts_ns < self._ts[self.count - 1]:
+            raise ValueError("Series is append-only; timestamps must be non-decreasing")
+        if self.count >= self.capacity:
+            self._grow(self.count + 1)
+        self._ts[self.count] = ts_ns
+        self._val[self.count] = value
+        self.count += 1
+
+    def slice(self, start_ns: int, end_ns: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return read-only views over ``[start_ns, end_ns)`` without copying."""
+        ts = self._ts[: self.count]
+        lo = int(np.searchsorted(ts, start_ns, side="left"))
+        hi = int(np.searchsorted(ts, end_ns, side="left"))
+        ts_view = self._ts[lo:hi]
+        val_view = self._val[lo:hi]
+        ts_view.flags.writeable = False
+        val_view.flags.writeable = False
+        return ts_view, val_view
+
+    def flush(self) -> None:
+        self._ts.flush()
+        self._val.flush()
+
+    def compact(self) -> None:
+        """Trim spare capacity so closed days only occupy what they hold."""
+        self.flush()
+        del self._ts, self._val
+        self._resize(max(self.count, 1))
+        self._open()
+
+
+class TimeSeriesStore:
+    """Intraday equity / P&L curves, one directory per UTC day.
+
+    Layout: ``<root>/<YYYY-MM-DD>/<kind>/<key>.{ts,val}`` where ``kind`` is
+    ``account`` or ``instrument``. Series that are appended to or read for the
+    current day stay open until compaction closes them. Reads of earlier days
+    map the files only for that read.
+
+    Maintenance runs in a worker thread while appends and reads run on the
+    event loop, so ``_open`` is only touched under ``_lock``.
+    """
+
+    KINDS = ("account", "instrument")
+
+    def __init__(self, root: str | Path, capacity: int = 4096) -> None:
+        self.root = Path(root)
+        self.capacity = capacity
+        self._open: dict[tuple[date, str, str], Series] = {}
+        self._lock = threading.RLock()
+
+    def _dir(self, day: date, kind: str) -> Path:
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown series kind: {kind}")
+        return self.root / day.isoformat() / kind
+
+    def series(
+        self, kind: str, key: str, day: date, *, create: bool = True, cache: bool = True
+    ) -> Optional[Series]:
+        key = _SAFE_KEY.sub("_", key)
+        with self._lock:
+            handle = self._open.get((day, kind, key))
+            if handle is None:
+                directory = self._dir(day, kind)
+                if not create and not (directory / f"{key}.ts").exists():
+                    return None
+                handle = Series(directory, key, self.capacity)
+                if cache:
+                    self._open[(day, kind, key)] = handle
+            return handle
+
+    def append(self, kind: str, key: str, value: float, ts: Optional[datetime] = None) -> None:
+        ts_ns = _to_ns(ts or datetime.now(timezone.utc))
+        day = _day_of(ts_ns)
+        self.series(kind, key, day).append(ts_ns, value)
+
+    def range(self, kind: str, key: str, start: datetime, end: datetime) -> tuple[np.ndarray, np.ndarray]:
+        """Points in ``[start, end)``.
+
+        Single-day ranges (the intraday case) are zero-copy views; ranges that
+        span several days are concatenated.
+        """
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        today = datetime.now(timezone.utc).date()
+        parts = []
+        day = _day_of(start_ns)
+        last_day = _day_of(max(end_ns - 1, start_ns))
+        while day <= last_day:
+            with self._lock:
+                # Past days are closed; their slices keep the mapping alive as long as needed
+                handle = self.series(kind, key, day, create=False, cache=day == today)
+                if handle is not None:
+                    parts.append(handle.slice(start_ns, end_ns))
+            day += timedelta(days=1)
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return np.empty(0, _TS_DTYPE), np.empty(0, _VAL_DTYPE)
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    def flush(self) -> None:
+        with self._lock:
+            handles = list(self._open.values())
+        for handle in handles:
+            handle.flush()
+
+    def compact(self, before: date) -> int:
+        """Trim and close every series for days earlier than ``before``."""
+        compacted = 0
+        for day_dir in sorted(self.root.glob("????-??-??")):
+            day = date.fromisoformat(day_dir.name)
+            if day >= before:
+                continue
+            for kind in self.KINDS:
+                for ts_file in (day_dir / kind).glob("*.ts"):
+                    key = ts_file.stem
+                    # Held while remapping so a concurrent read cannot reopen the file mid-truncate
+                    with self._lock:
+                        handle = self._open.pop((day, kind, key), None) or Series(day_dir / kind, key, self.capacity)
+                        if handle.count < handle.capacity:
+                            handle.compact()
+                            compacted += 1
+        return compacted
+
+    def enforce_retention(self, keep_days: int, today: Optional[date] = None) -> int:
+        """Delete day directories older than ``keep_days``; returns how many were removed."""
+        cutoff = (today or datetime.now(timezone.utc).date()) - timedelta(days=keep_days)
+        removed = 0
+        for day_dir in self.root.glob("????-??-??"):
+            day = date.fromisoformat(day_dir.name)
+            if day < cutoff:
+                with self._lock:
+                    for key in [k for k in self._open if k[0] == day]:
+                        del self._open[key]
+                    shutil.rmtree(day_dir, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def run_maintenance(self, keep_days: int) -> tuple[int, int]:
+        today = datetime.now(timezone.utc).date()
+        return self.compact(before=today), self.enforce_retention(keep_days, today=today)
+
+
+@lru_cache(maxsize=1)
+def get_timeseries_store() -> TimeSeriesStore:
+    return TimeSeriesStore(get_settings().timeseries_dir)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def dialect_insert(dialect_name: str):
+    """The ``insert`` construct that supports ``ON CONFLICT`` for this dialect."""
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"Upsert not supported for dialect {dialect_name!r}")
+
+
+def upsert_statement(
+    dialect_name: str,
+    model: Any,
+    rows: Sequence[dict[str, Any]],
+    index_elements: Iterable[Any],
+    update_columns: Iterable[str],
+):
+    """Multi-row ``INSERT ... ON CONFLICT (...) DO UPDATE`` for Postgres and SQLite."""
+    stmt = dialect_insert(dialect_name)(model).values(list(rows))
+    return stmt.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_={name: stmt.excluded[name] for name in update_columns},
+    )
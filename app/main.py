@@ -11,14 +11,30 @@ from nicegui import ui
 
 from app.core.config import get_settings
 from app.core.logging import configure_logging, logger
+from app.core.production_config import production_settings
+from app.core.loop_monitor import start_loop_monitor, shutdown_loop_monitor
+from app.core.redis import close_redis
+from app.core.watchdog import start_watchdog, shutdown_watchdog
 from app.db.session import init_db
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
 from app.services.scheduler import start_scheduler, shutdown_scheduler
+from app.services.audit_service import start_audit_writer, shutdown_audit_writer
+from app.services.push_hub import start_push_hub, shutdown_push_hub
 from app.api.routes.health import router as health_router
 from app.api.routes.risk import router as risk_router
 from app.api.routes.kill_switch import router as kill_router
 from app.api.routes.positions import router as positions_router
 from app.api.routes.orders import router as orders_router
 from app.api.routes.market import router as market_router
+from app.api.routes.audit import router as audit_router
+from app.api.routes.stream import router as stream_router
+from app.api.routes.portfolio import router as portfolio_router
+from app.api.routes.live_data import router as live_data_router
+from app.api.routes.admin import router as admin_router
 from app.ui.dashboard import create_ui
 
 
@@ -29,11 +45,20 @@ configure_logging()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("startup:begin", environment=settings.environment)
+    await start_loop_monitor()
+    await start_watchdog()
     await init_db()
+    await start_audit_writer()
     await start_scheduler()
+    await start_push_hub()
     yield
     logger.info("shutdown:begin")
+    await shutdown_push_hub()
     await shutdown_scheduler()
+    await shutdown_audit_writer()
+    await close_redis()
+    await shutdown_watchdog()
+    await shutdown_loop_monitor()
 
 
 app = FastAPI(title="Trading Middleware", version="0.1.0", lifespan=lifespan)
@@ -45,6 +70,16 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if production_settings.enable_compression:
+    app.add_middleware(CompressionMiddleware)
+if production_settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware)
+# Sheds before any rate-limit or broker work is done for the request
+app.add_middleware(AdmissionMiddleware)
+if settings.admin_token:
+    app.add_middleware(ProfilingMiddleware)
+# Outermost, so latency includes rate limiting and compression
+app.add_middleware(MetricsMiddleware)
 
 # API
 app.include_router(health_router, prefix="/api")
@@ -53,6 +88,11 @@ app.include_router(kill_router, prefix="/api")
 app.include_router(positions_router, prefix="/api")
 app.include_router(orders_router, prefix="/api")
 app.include_router(market_router, prefix="/api")
+app.include_router(audit_router, prefix="/api")
+app.include_router(stream_router, prefix="/api")
+app.include_router(portfolio_router, prefix="/api")
+app.include_router(live_data_router, prefix="/api")
+app.include_router(admin_router, prefix="/api")
 
 # Metrics
 @app.get("/metrics")
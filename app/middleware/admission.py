@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.loop_monitor import LoopLagMonitor, loop_monitor, prefer_stale
+from app.core.metrics import ADMISSION_SHED
+
+
+# Always admitted, whatever the loop lag: the kill switch and risk controls must
+# stay reachable and order placement must never be dropped by the server itself.
+CRITICAL_PREFIXES = ("/api/kill", "/api/risk", "/api/healthz", "/api/stream")
+# Reads backed by the broker snapshot cache; under lag they are served stale
+STALE_PREFIXES = ("/api/positions", "/api/orders", "/api/portfolio", "/api/live-data")
+
+
+def priority(method: str, path: str) -> Optional[str]:
+    """"critical", "normal" or "low"; None for paths outside the API (UI, metrics)."""
+    if not path.startswith("/api/"):
+        return None
+    if path.startswith(CRITICAL_PREFIXES):
+        return "critical"
+    if path.startswith("/api/orders") and method != "GET":
+        return "critical"
+    if path.startswith("/api/market") or method in ("GET", "HEAD"):
+        return "low"
+    return "normal"
+
+
+class AdmissionMiddleware:
+    """Sheds low-value work while the event loop is lagging.
+
+    Above ``loop_lag_shed_threshold`` low-priority snapshot reads are admitted
+    but answered from the cached snapshot without a broker refetch, and other
+    low-priority requests (market proxy, audit) get 503. Above
+    ``loop_lag_severe_threshold`` normal-priority requests are shed as well.
+    Low-priority requests are also capped at ``admission_low_priority_limit`` in
+    flight regardless of lag. Critical routes are never shed.
+    """
+
+    def __init__(self, app: ASGIApp, monitor: Optional[LoopLagMonitor] = None) -> None:
+        self.app = app
+        self.monitor = monitor or loop_monitor
+        self.low_in_flight = 0
+
+    async def _shed(self, scope: Scope, receive: Receive, send: Send, level: str, reason: str) -> None:
+        ADMISSION_SHED.labels(priority=level, reason=reason).inc()
+        retry_after = max(1, round(self.monitor.lag))
+        response = JSONResponse(
+            {"detail": "Server overloaded, retry shortly"},
+            status_code=503,
+            headers={"Retry-After": str(retry_after)},
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        level = priority(scope["method"], scope["path"])
+        if level is None or level == "critical":
+            await self.app(scope, receive, send)
+            return
+        settings = get_settings()
+        lag = self.monitor.lag
+        if level == "normal":
+            if lag >= settings.loop_lag_severe_threshold:
+                await self._shed(scope, receive, send, level, "lag")
+                return
+            await self.app(scope, receive, send)
+            return
+
+        stale = False
+        if lag >= settings.loop_lag_shed_threshold:
+            if not scope["path"].startswith(STALE_PREFIXES):
+                await self._shed(scope, receive, send, level, "lag")
+                return
+            stale = True
+        if self.low_in_flight >= settings.admission_low_priority_limit:
+            await self._shed(scope, receive, send, level, "concurrency")
+            return
+        self.low_in_flight += 1
+        token = prefer_stale.set(stale)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            prefer_stale.reset(token)
+            self.low_in_flight -= 1
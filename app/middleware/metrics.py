@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+
+from starlette.routing import Match, Mount
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    HTTP_COMPONENT_SECONDS,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_FLIGHT,
+)
+from app.core.timing import end_request_timing, start_request_timing
+
+
+COMPONENTS = ("broker", "db")
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route that will serve ``scope`` (bounded label cardinality)."""
+    partial = None
+    for route in getattr(scope.get("app"), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return f"{route.path}/*" if isinstance(route, Mount) else route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path  # method not allowed
+    return partial or "unmatched"
+
+
+class MetricsMiddleware:
+    """Per-route rate, errors and duration, with broker/db/app time attribution.
+
+    Broker and DB time are accumulated by the instrumented Dhan client and DB
+    engine through a request-scoped context variable; app time is the rest.
+    Concurrent broker calls within one request each add their own wall time.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = route_template(scope)
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method=method, route=route)
+        in_flight.inc()
+        timings, token = start_request_timing()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            end_request_timing(token)
+            in_flight.dec()
+            HTTP_REQUESTS.labels(method=method, route=route, status=str(status)).inc()
+            HTTP_REQUEST_SECONDS.labels(method=method, route=route).observe(elapsed)
+            accounted = 0.0
+            for component in COMPONENTS:
+                seconds = timings.get(component, 0.0)
+                accounted += seconds
+                HTTP_COMPONENT_SECONDS.labels(route=route, component=component).observe(seconds)
+            HTTP_COMPONENT_SECONDS.labels(route=route, component="app").observe(max(0.0, elapsed - accounted))
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.admin import is_admin_token
+from app.core.config import get_settings
+from app.core.profiling import FORMATS, StackSampler, get_profile_store
+
+
+MODES = ("store",) + FORMATS
+
+
+def requested_mode(scope: Scope, headers: Headers) -> Optional[str]:
+    value = headers.get("x-profile")
+    if value is None:
+        values = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("__profile")
+        value = values[0] if values else None
+    if value is None:
+        return None
+    return value if value in MODES else "store"
+
+
+class ProfilingMiddleware:
+    """Runs a single request under the stack sampler when asked to by an admin.
+
+    ``X-Profile: store`` (or ``?__profile=store``) serves the normal response and
+    keeps the profile for ``/api/admin/profiles/<X-Profile-Id>``;
+    ``collapsed`` / ``speedscope`` replace the response with the profile itself.
+    Only the event loop thread is sampled, so concurrent requests on the same
+    loop show up too.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        mode = requested_mode(scope, headers)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if not is_admin_token(headers.get("x-admin-token")):
+            await JSONResponse({"detail": "Admin token required"}, status_code=403)(scope, receive, send)
+            return
+
+        interval = get_settings().profile_interval_ms / 1000
+        profile = get_profile_store().new(f"{scope['method']} {scope['path']}", interval)
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile.id
+            await send(message)
+
+        async def discard(message: Message) -> None:
+            pass
+
+        sampler = StackSampler(interval, {threading.get_ident()}).start()
+        try:
+            await self.app(scope, receive, send_with_id if mode == "store" else discard)
+        finally:
+            sampler.stop()
+            profile.samples, profile.duration, profile.done = sampler.samples, sampler.duration, True
+        if mode == "speedscope":
+            await JSONResponse(profile.render(mode), headers={"X-Profile-Id": profile.id})(scope, receive, send)
+        elif mode == "collapsed":
+            await PlainTextResponse(profile.render(mode), headers={"X-Profile-Id": profile.id})(scope, receive, send)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import RATE_LIMIT_THROTTLED
+from app.core.production_config import production_settings
+from app.core.rate_limit import RateLimiter
+
+
+# Never throttled: the kill switch and risk controls must always be reachable,
+# health checks come from the orchestrator, streams are long-lived connections.
+EXEMPT_PREFIXES = ("/api/kill", "/api/risk", "/api/healthz", "/api/stream")
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    if not path.startswith("/api/") or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if path.startswith("/api/market"):
+        return "market"
+    if path.startswith("/api/orders") and method != "GET":
+        return "orders"
+    if method in ("GET", "HEAD"):
+        return "read"
+    return "default"
+
+
+def class_limit(name: str) -> int:
+    return {
+        "market": production_settings.rate_limit_market_requests,
+        "orders": production_settings.rate_limit_orders_requests,
+        "read": production_settings.rate_limit_read_requests,
+    }.get(name, production_settings.rate_limit_requests)
+
+
+def client_identity(scope: Scope) -> str:
+    # Client address only: Authorization/X-API-Key are not verified at this
+    # layer, so keying on them would let a caller mint a fresh bucket per request.
+    # Behind a proxy, run uvicorn with --proxy-headers/--forwarded-allow-ips so
+    # this is the real client address.
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """Sliding-window limits per client address and route class."""
+
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None) -> None:
+        self.app = app
+        self.limiter = limiter or RateLimiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = route_class(scope["method"], scope["path"])
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+        limit = class_limit(name)
+        decision = await self.limiter.hit(
+            f"{name}:{client_identity(scope)}", limit, production_settings.rate_limit_window
+        )
+        if not decision.allowed:
+            RATE_LIMIT_THROTTLED.labels(route_class=name).inc()
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={
+                    "Retry-After": decision.retry_after_header,
+                    "X-RateLimit-Limit": str(limit),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import JSON, Column
+from sqlmodel import SQLModel, Field
+
+
+class OrderSnapshot(SQLModel, table=True):
+    """Latest known state of a broker order, keyed by the broker's orderId."""
+
+    __tablename__ = "order_snapshots"
+    order_id: str = Field(primary_key=True)
+    user_id: Optional[str] = Field(default=None, index=True)
+    trading_symbol: Optional[str] = Field(default=None, index=True)
+    security_id: Optional[str] = None
+    transaction_type: Optional[str] = None
+    order_status: Optional[str] = Field(default=None, index=True)
+    quantity: Optional[float] = None
+    filled_qty: Optional[float] = None
+    price: Optional[float] = None
+    content_hash: str
+    payload: dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    first_seen_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False, index=True)
+
+
+class PositionSnapshot(SQLModel, table=True):
+    """Latest known state of a broker position, keyed by ``securityId:productType``."""
+
+    __tablename__ = "position_snapshots"
+    position_key: str = Field(primary_key=True)
+    user_id: Optional[str] = Field(default=None, index=True)
+    trading_symbol: Optional[str] = Field(default=None, index=True)
+    security_id: Optional[str] = None
+    product_type: Optional[str] = None
+    net_qty: Optional[float] = None
+    realized_profit: Optional[float] = None
+    unrealized_profit: Optional[float] = None
+    content_hash: str
+    payload: dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    first_seen_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False, index=True)
+    closed_at: Optional[datetime] = None
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from typing import Any, Literal, Optional, Union
+
+from pydantic import ConfigDict, Field, TypeAdapter, ValidationError
+from pydantic.dataclasses import dataclass
+
+from app.core.logging import logger
+
+
+# Broker payloads as slotted dataclasses validated by pydantic-core.
+# Field names are Dhan's wire names, so no alias mapping runs on either side;
+# fields Dhan adds that we do not model are dropped, so these are for code that
+# consumes specific fields (portfolio view, order book index, broker sync), not
+# for the API passthrough of the broker books.
+_CONFIG = ConfigDict(extra="ignore", coerce_numbers_to_str=True)
+# Order entry rejects fields it does not know, so a misspelt one is a 422
+# instead of being dropped on the way to the broker
+_REQUEST_CONFIG = ConfigDict(extra="forbid", coerce_numbers_to_str=True)
+
+
+@dataclass(slots=True, config=_CONFIG)
+class Order:
+    orderId: str
+    orderStatus: Optional[str] = None
+    dhanClientId: Optional[str] = None
+    correlationId: Optional[str] = None
+    transactionType: Optional[str] = None
+    exchangeSegment: Optional[str] = None
+    productType: Optional[str] = None
+    orderType: Optional[str] = None
+    validity: Optional[str] = None
+    tradingSymbol: Optional[str] = None
+    securityId: Optional[str] = None
+    quantity: Optional[int] = None
+    disclosedQuantity: Optional[int] = None
+    remainingQuantity: Optional[int] = None
+    filledQty: Optional[int] = None
+    price: Optional[float] = None
+    triggerPrice: Optional[float] = None
+    averageTradedPrice: Optional[float] = None
+    afterMarketOrder: Optional[bool] = None
+    boProfitValue: Optional[float] = None
+    boStopLossValue: Optional[float] = None
+    legName: Optional[str] = None
+    createTime: Optional[str] = None
+    updateTime: Optional[str] = None
+    exchangeTime: Optional[str] = None
+    drvExpiryDate: Optional[str] = None
+    drvOptionType: Optional[str] = None
+    drvStrikePrice: Optional[float] = None
+    omsErrorCode: Optional[str] = None
+    omsErrorDescription: Optional[str] = None
+    algoId: Optional[str] = None
+
+
+@dataclass(slots=True, config=_CONFIG)
+class Position:
+    securityId: str
+    productType: Optional[str] = None
+    dhanClientId: Optional[str] = None
+    tradingSymbol: Optional[str] = None
+    positionType: Optional[str] = None
+    exchangeSegment: Optional[str] = None
+    buyAvg: Optional[float] = None
+    sellAvg: Optional[float] = None
+    costPrice: Optional[float] = None
+    buyQty: Optional[int] = None
+    sellQty: Optional[int] = None
+    netQty: Optional[int] = None
+    realizedProfit: Optional[float] = None
+    unrealizedProfit: Optional[float] = None
+    rbiReferenceRate: Optional[float] = None
+    multiplier: Optional[int] = None
+    carryForwardBuyQty: Optional[int] = None
+    carryForwardSellQty: Optional[int] = None
+    carryForwardBuyValue: Optional[float] = None
+    carryForwardSellValue: Optional[float] = None
+    dayBuyQty: Optional[int] = None
+    daySellQty: Optional[int] = None
+    dayBuyValue: Optional[float] = None
+    daySellValue: Optional[float] = None
+    drvExpiryDate: Optional[str] = None
+    drvOptionType: Optional[str] = None
+    drvStrikePrice: Optional[float] = None
+    crossCurrency: Optional[bool] = None
+
+
+@dataclass(slots=True, config=_CONFIG)
+class Holding:
+    securityId: str
+    exchange: Optional[str] = None
+    tradingSymbol: Optional[str] = None
+    isin: Optional[str] = None
+    totalQty: Optional[int] = None
+    dpQty: Optional[int] = None
+    t1Qty: Optional[int] = None
+    availableQty: Optional[int] = None
+    collateralQty: Optional[int] = None
+    avgCostPrice: Optional[float] = None
+    lastTradedPrice: Optional[float] = None
+
+
+@dataclass(slots=True, config=_CONFIG)
+class Funds:
+    dhanClientId: Optional[str] = None
+    availabelBalance: Optional[float] = None  # sic, Dhan's spelling
+    sodLimit: Optional[float] = None
+    collateralAmount: Optional[float] = None
+    receiveableAmount: Optional[float] = None
+    utilizedAmount: Optional[float] = None
+    blockedPayoutAmount: Optional[float] = None
+    withdrawableBalance: Optional[float] = None
+
+
+@dataclass(slots=True, config=_REQUEST_CONFIG)
+class OrderRequest:
+    transactionType: Literal["BUY", "SELL"]
+    exchangeSegment: str
+    productType: str
+    orderType: str
+    securityId: str
+    quantity: int = Field(gt=0)
+    price: Optional[float] = Field(default=None, ge=0)
+    triggerPrice: Optional[float] = Field(default=None, ge=0)
+    validity: Optional[str] = None
+    disclosedQuantity: Optional[int] = Field(default=None, ge=0)
+    afterMarketOrder: Optional[bool] = None
+    amoTime: Optional[str] = None
+    boProfitValue: Optional[float] = None
+    boStopLossValue: Optional[float] = None
+    dhanClientId: Optional[str] = None
+    correlationId: Optional[str] = None
+
+
+ADAPTERS: dict[str, TypeAdapter] = {
+    "orders": TypeAdapter(list[Order]),
+    "positions": TypeAdapter(list[Position]),
+    "holdings": TypeAdapter(list[Holding]),
+    "funds": TypeAdapter(Funds),
+}
+_ROW_ADAPTERS: dict[str, TypeAdapter] = {
+    "orders": TypeAdapter(Order),
+    "positions": TypeAdapter(Position),
+    "holdings": TypeAdapter(Holding),
+    "funds": ADAPTERS["funds"],
+}
+_LIST_ADAPTERS: dict[str, TypeAdapter] = {**ADAPTERS, "funds": TypeAdapter(list[Funds])}
+ORDER_REQUESTS = TypeAdapter(list[OrderRequest])
+
+
+def parse(kind: str, data: Union[bytes, str, Any]) -> Any:
+    """Validate raw broker JSON (bytes/str, parsed in Rust) or already-decoded data into typed rows."""
+    adapter = ADAPTERS[kind]
+    if isinstance(data, (bytes, str)):
+        return adapter.validate_json(data)
+    return adapter.validate_python(data)
+
+
+def dump(kind: str, value: Any) -> Any:
+    """Typed rows back to plain JSON-ready dicts, leaving out fields the broker did not send."""
+    return ADAPTERS[kind].dump_python(value, mode="json", exclude_none=True)
+
+
+def parse_rows(kind: str, rows: list[dict[str, Any]]) -> list[Any]:
+    """Typed rows for already-decoded broker rows, index-aligned with ``rows``.
+
+    The whole book is validated in one call; if any row is malformed, rows are
+    validated one by one and the bad ones come back as ``None`` so callers can
+    still pair typed rows with the raw ones.
+    """
+    try:
+        return _LIST_ADAPTERS[kind].validate_python(rows)
+    except ValidationError:
+        pass
+    adapter = _ROW_ADAPTERS[kind]
+    typed: list[Any] = []
+    for row in rows:
+        try:
+            typed.append(adapter.validate_python(row))
+        except ValidationError as e:
+            logger.warning("broker_row_invalid", kind=kind, errors=e.error_count(), row=row)
+            typed.append(None)
+    return typed
+
+
+def normalize(kind: str, data: Union[bytes, str, Any]) -> Any:
+    return dump(kind, parse(kind, data))
+
+
+def dump_order_requests(orders: list[OrderRequest]) -> list[dict[str, Any]]:
+    return ORDER_REQUESTS.dump_python(orders, mode="json", exclude_none=True)
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field
 from app.models.base import TimeStampedModel
 
 
 class RiskSettings(TimeStampedModel, table=True):
     __tablename__ = "risk_settings"
+    # One row per user; NULL (single-user mode) counts as a key of its own
+    __table_args__ = (Index("uq_risk_settings_user_key", text("coalesce(user_id, '')"), unique=True),)
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[str] = Field(default=None, index=True)
 
@@ -22,6 +25,7 @@ class RiskSettings(TimeStampedModel, table=True):
 
 class KillSwitchStatus(TimeStampedModel, table=True):
     __tablename__ = "kill_switch_status"
+    __table_args__ = (Index("uq_kill_switch_status_user_key", text("coalesce(user_id, '')"), unique=True),)
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[str] = Field(default=None, index=True)
     is_active: bool = False
@@ -30,6 +34,7 @@ class KillSwitchStatus(TimeStampedModel, table=True):
 
 class KillSwitchEvent(TimeStampedModel, table=True):
     __tablename__ = "kill_switch_events"
+    __table_args__ = (Index("ix_kill_switch_events_user_id_created_at", "user_id", "created_at"),)
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[str] = Field(default=None, index=True)
     action: str
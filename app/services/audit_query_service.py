@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import base64
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional, Type, Union
+
+import orjson
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models.audit import AuditLog
+from app.models.risk import KillSwitchEvent
+
+
+EventModel = Union[Type[AuditLog], Type[KillSwitchEvent]]
+
+# Column holding the "event type" for each queryable table
+EVENT_COLUMNS = {
+    AuditLog: AuditLog.event,
+    KillSwitchEvent: KillSwitchEvent.action,
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = orjson.dumps([created_at.isoformat(), row_id])
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = orjson.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+
+def _columns(model: EventModel) -> list[str]:
+    return [c.name for c in model.__table__.columns]
+
+
+def _filtered(
+    model: EventModel,
+    *,
+    columns_only: bool = False,
+    user_id: Optional[str] = None,
+    event: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    # Newest first; (created_at, id) matches the composite (user_id, created_at) index order
+    stmt = select(model.__table__ if columns_only else model).order_by(model.created_at.desc(), model.id.desc())
+    if user_id is not None:
+        stmt = stmt.where(model.user_id == user_id)
+    if event is not None:
+        stmt = stmt.where(EVENT_COLUMNS[model] == event)
+    if start is not None:
+        stmt = stmt.where(model.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(model.created_at < end)
+    return stmt
+
+
+class AuditQueryService:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def page(
+        self,
+        model: EventModel,
+        *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> dict[str, Any]:
+        """One page of events plus the cursor for the next (older) page."""
+        stmt = _filtered(model, **filters)
+        if cursor:
+            created_at, row_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+        rows = list((await self.session.execute(stmt.limit(limit + 1))).scalars())
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        return {"items": rows, "next_cursor": next_cursor}
+
+
+async def stream_export(
+    engine: AsyncEngine,
+    model: EventModel,
+    fmt: str,
+    *,
+    batch_size: int = 1000,
+    **filters: Any,
+) -> AsyncIterator[bytes]:
+    """Yield CSV or NDJSON chunks straight off a server-side cursor.
+
+    Uses its own read-only connection so the export outlives the request's
+    session; memory stays bounded by ``batch_size`` rows.
+    """
+    columns = _columns(model)
+    stmt = _filtered(model, columns_only=True, **filters).execution_options(yield_per=batch_size)
+    async with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            conn = await conn.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+        result = await conn.stream(stmt)
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            async for partition in result.mappings().partitions():
+                for row in partition:
+                    writer.writerow([row[c] for c in columns])
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+            tail = buffer.getvalue()
+            if tail:
+                yield tail.encode("utf-8")
+        else:
+            async for partition in result.mappings().partitions():
+                yield b"".join(orjson.dumps({c: row[c] for c in columns}) + b"\n" for row in partition)
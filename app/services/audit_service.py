@@ -1,18 +1,154 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.db.session import async_session_maker
 from app.models.audit import AuditLog
 
 
+# Stop marker put on the queue by AuditWriter.stop
+_STOP: dict[str, Any] = {}
+
+
+class AuditWriter:
+    """Bounded queue of audit rows drained by a background task into bulk INSERTs.
+
+    ``submit`` blocks once the queue is full, so a flood of audit events slows
+    producers down instead of growing memory without bound.
+    """
+
+    def __init__(
+        self,
+        session_maker,
+        *,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+    ) -> None:
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="audit_writer")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        if not self._task.done():
+            # Queued behind everything submitted so far; _run flushes the batch it holds and exits
+            await self._queue.put(_STOP)
+            await self._task
+        self._task = None
+        self._stopping = False
+        # Rows submitted after the stop marker are written before shutdown completes
+        while not self._queue.empty():
+            await self._flush(self._drain(self.batch_size))
+
+    async def submit(self, row: dict[str, Any]) -> None:
+        await self._queue.put(row)
+
+    def _drain(self, limit: int) -> list[dict[str, Any]]:
+        batch: list[dict[str, Any]] = []
+        while len(batch) < limit and not self._stopping:
+            try:
+                row = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self._take(row, batch)
+        return batch
+
+    def _take(self, row: dict[str, Any], batch: list[dict[str, Any]]) -> None:
+        if row is _STOP:
+            self._stopping = True
+        else:
+            batch.append(row)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            batch: list[dict[str, Any]] = []
+            self._take(await self._queue.get(), batch)
+            deadline = loop.time() + self.flush_interval
+            while batch and len(batch) < self.batch_size and not self._stopping:
+                batch.extend(self._drain(self.batch_size - len(batch)))
+                remaining = deadline - loop.time()
+                if len(batch) >= self.batch_size or remaining <= 0 or self._stopping:
+                    break
+                try:
+                    self._take(await asyncio.wait_for(self._queue.get(), timeout=remaining), batch)
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            async with self.session_maker() as session:
+                await session.execute(insert(AuditLog), batch)
+                await session.commit()
+        except Exception as e:
+            logger.error("audit_flush_error", error=str(e), dropped=len(batch))
+
+
+audit_writer: Optional[AuditWriter] = None
+
+
+async def start_audit_writer() -> None:
+    global audit_writer
+    if audit_writer is None:
+        settings = get_settings()
+        audit_writer = AuditWriter(
+            async_session_maker,
+            max_queue=settings.audit_queue_size,
+            batch_size=settings.audit_batch_size,
+            flush_interval=settings.audit_flush_interval,
+        )
+        await audit_writer.start()
+        logger.info("audit_writer_started")
+
+
+async def shutdown_audit_writer() -> None:
+    global audit_writer
+    if audit_writer is not None:
+        await audit_writer.stop()
+        audit_writer = None
+        logger.info("audit_writer_stopped")
+
+
 class AuditService:
     def __init__(self, session: AsyncSession, user_id: Optional[str] = None) -> None:
         self.session = session
         self.user_id = user_id
 
     async def record(self, event: str, *, detail: Optional[str] = None, path: Optional[str] = None, success: bool = True) -> None:
-        self.session.add(
-            AuditLog(user_id=self.user_id, event=event, detail=detail, path=path, success=success)
+        row = dict(
+            created_at=datetime.utcnow(),
+            user_id=self.user_id,
+            event=event,
+            detail=detail,
+            path=path,
+            success=success,
         )
+        if audit_writer is not None and audit_writer.running:
+            await audit_writer.submit(row)
+            return
+        # No writer running (scripts, tests): fall back to a direct write
+        self.session.add(AuditLog(**row))
         await self.session.commit()
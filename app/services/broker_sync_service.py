@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, Optional
+
+import orjson
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import logger
+from app.core.metrics import BROKER_SYNC_ROWS, BROKER_SYNC_SECONDS
+from app.db.upsert import upsert_statement
+from app.models.broker import OrderSnapshot, PositionSnapshot
+from app.models.payloads import Order, Position, parse_rows
+from app.services.dhan_client import DhanClient
+
+
+UPSERT_BATCH = 500
+
+
+def content_hash(row: dict[str, Any]) -> str:
+    return hashlib.blake2b(orjson.dumps(row, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+def _float(value: Optional[float]) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _str(value: Any) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def order_key(row: dict[str, Any]) -> Optional[str]:
+    return _str(row.get("orderId"))
+
+
+def position_key(row: dict[str, Any]) -> Optional[str]:
+    security_id = row.get("securityId")
+    if security_id is None:
+        return None
+    return f"{security_id}:{row.get('productType', '')}"
+
+
+def holding_key(row: dict[str, Any]) -> Optional[str]:
+    return _str(row.get("securityId"))
+
+
+def _order_values(
+    key: str, row: dict[str, Any], order: Order, digest: str, now: datetime, user_id: Optional[str]
+) -> dict[str, Any]:
+    return dict(
+        order_id=key,
+        user_id=user_id,
+        trading_symbol=order.tradingSymbol,
+        security_id=order.securityId,
+        transaction_type=order.transactionType,
+        order_status=order.orderStatus,
+        quantity=_float(order.quantity),
+        filled_qty=_float(order.filledQty),
+        price=_float(order.price),
+        content_hash=digest,
+        payload=row,
+        first_seen_at=now,
+        updated_at=now,
+    )
+
+
+def _position_values(
+    key: str, row: dict[str, Any], position: Position, digest: str, now: datetime, user_id: Optional[str]
+) -> dict[str, Any]:
+    return dict(
+        position_key=key,
+        user_id=user_id,
+        trading_symbol=position.tradingSymbol,
+        security_id=position.securityId,
+        product_type=position.productType,
+        net_qty=_float(position.netQty),
+        realized_profit=_float(position.realizedProfit),
+        unrealized_profit=_float(position.unrealizedProfit),
+        content_hash=digest,
+        payload=row,
+        first_seen_at=now,
+        updated_at=now,
+        closed_at=None,
+    )
+
+
+class BrokerSyncService:
+    """Keeps order/position snapshot tables in step with the broker book.
+
+    Each sync hashes every broker row and compares it with the hash stored for
+    the same key; only new or changed rows are upserted, with their columns
+    taken from the typed payload models. The last-seen hashes
+    are cached per process and warmed from the table on first use.
+    """
+
+    # kind -> {key: content_hash}
+    _seen: dict[str, dict[str, str]] = {}
+
+    def __init__(self, session: AsyncSession, user_id: Optional[str] = None) -> None:
+        self.session = session
+        self.user_id = user_id
+
+    async def _known_hashes(self, kind: str) -> dict[str, str]:
+        seen = BrokerSyncService._seen.get(kind)
+        if seen is None:
+            if kind == "orders":
+                stmt = select(OrderSnapshot.order_id, OrderSnapshot.content_hash).where(
+                    OrderSnapshot.updated_at >= datetime.utcnow() - timedelta(days=1)
+                )
+            else:
+                stmt = select(PositionSnapshot.position_key, PositionSnapshot.content_hash).where(
+                    PositionSnapshot.closed_at.is_(None)
+                )
+            seen = {key: digest for key, digest in (await self.session.execute(stmt)).all()}
+            BrokerSyncService._seen[kind] = seen
+        return seen
+
+    async def _upsert(self, model, rows: list[dict[str, Any]], key_column: str) -> None:
+        dialect = self.session.bind.dialect.name
+        update_columns = [name for name in rows[0] if name not in (key_column, "first_seen_at")]
+        for start in range(0, len(rows), UPSERT_BATCH):
+            stmt = upsert_statement(dialect, model, rows[start:start + UPSERT_BATCH], [key_column], update_columns)
+            await self.session.execute(stmt)
+
+    async def sync_orders(self, orders: list[dict[str, Any]]) -> int:
+        started = time.perf_counter()
+        seen = await self._known_hashes("orders")
+        now = datetime.utcnow()
+        changed: dict[str, dict[str, Any]] = {}
+        current: set[str] = set()
+        for row, order in zip(orders, parse_rows("orders", orders)):
+            key = order_key(row)
+            if key is None:
+                continue
+            current.add(key)
+            digest = content_hash(row)
+            # Malformed rows were logged by parse_rows; keep the stored version
+            if order is not None and seen.get(key) != digest:
+                changed[key] = _order_values(key, row, order, digest, now, self.user_id)
+        if changed:
+            await self._upsert(OrderSnapshot, list(changed.values()), "order_id")
+            await self.session.commit()
+            seen.update({key: values["content_hash"] for key, values in changed.items()})
+            BROKER_SYNC_ROWS.labels(kind="orders", op="upsert").inc(len(changed))
+        # Orders that left the broker book (previous sessions) no longer need tracking
+        for key in [key for key in seen if key not in current]:
+            del seen[key]
+        BROKER_SYNC_SECONDS.labels(kind="orders").observe(time.perf_counter() - started)
+        return len(changed)
+
+    async def sync_positions(self, positions: list[dict[str, Any]]) -> int:
+        started = time.perf_counter()
+        seen = await self._known_hashes("positions")
+        now = datetime.utcnow()
+        changed: dict[str, dict[str, Any]] = {}
+        current: set[str] = set()
+        for row, position in zip(positions, parse_rows("positions", positions)):
+            key = position_key(row)
+            if key is None:
+                continue
+            current.add(key)
+            digest = content_hash(row)
+            if position is not None and seen.get(key) != digest:
+                changed[key] = _position_values(key, row, position, digest, now, self.user_id)
+        closed = [key for key in seen if key not in current]
+        if changed:
+            await self._upsert(PositionSnapshot, list(changed.values()), "position_key")
+        if closed:
+            await self.session.execute(
+                update(PositionSnapshot)
+                .where(PositionSnapshot.position_key.in_(closed))
+                .values(closed_at=now, updated_at=now)
+            )
+        if changed or closed:
+            await self.session.commit()
+            seen.update({key: values["content_hash"] for key, values in changed.items()})
+            for key in closed:
+                seen.pop(key, None)
+            BROKER_SYNC_ROWS.labels(kind="positions", op="upsert").inc(len(changed))
+            BROKER_SYNC_ROWS.labels(kind="positions", op="close").inc(len(closed))
+        BROKER_SYNC_SECONDS.labels(kind="positions").observe(time.perf_counter() - started)
+        return len(changed) + len(closed)
+
+    async def sync_from_broker(self, client: DhanClient) -> dict[str, int]:
+        orders = await client.get_orders()
+        positions = await client.get_positions()
+        written = {
+            "orders": await self.sync_orders(orders or []),
+            "positions": await self.sync_positions(positions or []),
+        }
+        if any(written.values()):
+            logger.info("broker_sync", **written)
+        return written
+
+    @classmethod
+    def reset_cache(cls) -> None:
+        cls._seen = {}
+
+
+class BrokerBookQuery:
+    """Read side of the local order/position book; never calls the broker."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def order_history(
+        self,
+        *,
+        status: Optional[str] = None,
+        symbol: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 500,
+    ) -> list[OrderSnapshot]:
+        stmt = select(OrderSnapshot).order_by(OrderSnapshot.updated_at.desc()).limit(limit)
+        if status is not None:
+            stmt = stmt.where(OrderSnapshot.order_status == status)
+        if symbol is not None:
+            stmt = stmt.where(OrderSnapshot.trading_symbol == symbol)
+        if start is not None:
+            stmt = stmt.where(OrderSnapshot.updated_at >= start)
+        if end is not None:
+            stmt = stmt.where(OrderSnapshot.updated_at < end)
+        return list((await self.session.execute(stmt)).scalars())
+
+    async def eod_report(self, day: date) -> dict[str, Any]:
+        """Per-symbol order counts and traded quantity/value for one UTC day."""
+        start = datetime.combine(day, dt_time.min)
+        end = start + timedelta(days=1)
+        traded_qty = func.coalesce(OrderSnapshot.filled_qty, 0.0)
+        is_buy = OrderSnapshot.transaction_type == "BUY"
+        stmt = (
+            select(
+                OrderSnapshot.trading_symbol,
+                func.count().label("orders"),
+                func.sum(case((OrderSnapshot.order_status == "TRADED", 1), else_=0)).label("traded"),
+                func.sum(case((OrderSnapshot.order_status == "REJECTED", 1), else_=0)).label("rejected"),
+                func.sum(case((OrderSnapshot.order_status == "CANCELLED", 1), else_=0)).label("cancelled"),
+                func.sum(case((is_buy, traded_qty), else_=0.0)).label("buy_qty"),
+                func.sum(case((is_buy, 0.0), else_=traded_qty)).label("sell_qty"),
+                func.sum(case((is_buy, traded_qty * func.coalesce(OrderSnapshot.price, 0.0)), else_=0.0)).label("buy_value"),
+                func.sum(case((is_buy, 0.0), else_=traded_qty * func.coalesce(OrderSnapshot.price, 0.0))).label("sell_value"),
+            )
+            .where(OrderSnapshot.first_seen_at >= start, OrderSnapshot.first_seen_at < end)
+            .group_by(OrderSnapshot.trading_symbol)
+            .order_by(OrderSnapshot.trading_symbol)
+        )
+        symbols = [dict(row._mapping) for row in (await self.session.execute(stmt)).all()]
+        open_positions = (
+            await self.session.execute(
+                select(PositionSnapshot).where(PositionSnapshot.closed_at.is_(None))
+            )
+        ).scalars()
+        return {
+            "day": day.isoformat(),
+            "symbols": symbols,
+            "open_positions": [
+                {
+                    "trading_symbol": p.trading_symbol,
+                    "net_qty": p.net_qty,
+                    "realized_profit": p.realized_profit,
+                    "unrealized_profit": p.unrealized_profit,
+                }
+                for p in open_positions
+            ],
+        }
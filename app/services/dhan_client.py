@@ -1,12 +1,29 @@
 from __future__ import annotations
 
 from typing import Any, Dict, Optional
+import asyncio
 import time
 
 import httpx
+import orjson
 
 from app.core.config import get_settings
 from app.core.logging import logger
+from app.core.metrics import BROKER_THROTTLE_WAIT_SECONDS
+from app.core.timing import add_component_time, component_timer
+
+
+class BrokerUnavailable(httpx.HTTPError):
+    """The circuit breaker is open; the request was not sent."""
+
+
+def reached_broker(exc: BaseException) -> bool:
+    """Whether a failed broker call may have been received (and acted on) by the broker.
+
+    False only when the request provably never left: the circuit was open, or
+    no connection could be made.
+    """
+    return not isinstance(exc, (BrokerUnavailable, httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
 
 
 class CircuitBreakerState:
@@ -34,8 +51,39 @@ class CircuitBreakerState:
             self.opened_at = time.time()
 
 
+class TokenBucket:
+    """Outbound request pacing: ``rate`` tokens per second, up to ``burst`` at once.
+
+    Waiters are served in arrival order, so a batch cannot starve single orders.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+        waited = time.monotonic() - started
+        BROKER_THROTTLE_WAIT_SECONDS.observe(waited)
+        # Throttle waits count as broker time from the request's point of view
+        add_component_time("broker", waited)
+
+
 class DhanClient:
     _cb = CircuitBreakerState()
+    _order_bucket: Optional[TokenBucket] = None
 
     def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None):
         settings = get_settings()
@@ -60,9 +108,10 @@ class DhanClient:
 
     async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
         if not DhanClient._cb.allow():
-            raise httpx.HTTPError("Circuit open for Dhan API")
+            raise BrokerUnavailable("Circuit open for Dhan API")
         try:
-            response = await self._client.request(method, path.lstrip("/"), **kwargs)
+            with component_timer("broker"):
+                response = await self._client.request(method, path.lstrip("/"), **kwargs)
             response.raise_for_status()
             DhanClient._cb.record_success()
             return response
@@ -79,27 +128,58 @@ class DhanClient:
         resp = await self._request("GET", path, params=params or {})
         return resp.json()
 
-    # Example endpoints
+    # Book reads are passed through as Dhan sent them (every field, parsed with
+    # orjson); code that reads specific fields uses the typed rows from
+    # app.models.payloads (Snapshot.typed / parse_rows).
     async def get_positions(self) -> list[dict[str, Any]]:
         resp = await self._request("GET", "positions")
-        return resp.json()
+        return orjson.loads(resp.content)
 
     async def get_orders(self) -> list[dict[str, Any]]:
         resp = await self._request("GET", "orders")
-        return resp.json()
+        return orjson.loads(resp.content)
+
+    @classmethod
+    def order_bucket(cls) -> TokenBucket:
+        # Created lazily so it binds to the running event loop
+        if cls._order_bucket is None:
+            settings = get_settings()
+            cls._order_bucket = TokenBucket(settings.broker_order_rate, settings.broker_order_burst)
+        return cls._order_bucket
 
     async def place_order(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        await self.order_bucket().acquire()
         resp = await self._request("POST", "orders", json=payload)
         return resp.json()
 
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        await self.order_bucket().acquire()
+        resp = await self._request("DELETE", f"orders/{order_id}")
+        return resp.json()
+
+    async def get_order_by_correlation_id(self, correlation_id: str) -> Optional[Dict[str, Any]]:
+        """The order placed with ``correlation_id``, or None if the broker has none."""
+        try:
+            resp = await self._request("GET", f"orders/external/{correlation_id}")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                # A live "no such order" answer; not a sign of broker trouble
+                DhanClient._cb.record_success()
+                return None
+            raise
+        data = orjson.loads(resp.content)
+        if isinstance(data, list):
+            return data[0] if data else None
+        return data or None
+
     async def cancel_all_orders(self) -> Dict[str, Any]:
         resp = await self._request("POST", "orders/cancel_all")
         return resp.json()
 
     async def get_funds(self) -> Dict[str, Any]:
         resp = await self._request("GET", "funds")
-        return resp.json()
+        return orjson.loads(resp.content)
 
     async def get_holdings(self) -> list[Dict[str, Any]]:
         resp = await self._request("GET", "holdings")
-        return resp.json()
+        return orjson.loads(resp.content)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.metrics import IDEMPOTENCY_REPLAYS
+from app.core.redis import get_redis, mark_redis_down
+
+
+PENDING = b"pending"
+
+
+class IdempotencyKeyReused(ValueError):
+    """The key was already used for a request with a different payload."""
+
+
+class IdempotencyInProgress(RuntimeError):
+    """Another worker is still executing the request for this key."""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: bytes
+    fingerprint: str
+
+    def dumps(self) -> bytes:
+        return orjson.dumps({"status": self.status_code, "body": self.body.decode(), "fp": self.fingerprint})
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "StoredResponse":
+        data = orjson.loads(raw)
+        return cls(data["status"], data["body"].encode(), data["fp"])
+
+
+Handler = Callable[[], Awaitable[tuple[int, bytes]]]
+
+
+class IdempotencyStore:
+    """Remembers the response for each Idempotency-Key for ``ttl`` seconds.
+
+    Completed responses live in Redis (shared by workers) and in a local LRU
+    that also serves while Redis is down. A duplicate that arrives while the
+    first request is still running awaits that request instead of re-sending:
+    in-process through a shared future, across workers by polling the Redis
+    placeholder. The placeholder expires after ``pending_ttl`` and is extended
+    while the request runs, so a worker that dies mid-request blocks the key
+    only briefly; the full ``ttl`` applies to the stored response.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, wait_timeout: float, redis: Optional[Redis] = None) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self._redis = redis
+        self._local: OrderedDict[str, tuple[float, StoredResponse]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    @property
+    def pending_ttl(self) -> float:
+        return self.wait_timeout * 3
+
+    def _client(self) -> Optional[Redis]:
+        return self._redis if self._redis is not None else get_redis()
+
+    def _get_local(self, key: str) -> Optional[StoredResponse]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return entry[1]
+
+    def _put_local(self, key: str, stored: StoredResponse) -> None:
+        self._local[key] = (time.monotonic() + self.ttl, stored)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    @staticmethod
+    def _check(stored: StoredResponse, fingerprint: str) -> StoredResponse:
+        if stored.fingerprint != fingerprint:
+            raise IdempotencyKeyReused("Idempotency-Key was already used with a different request body")
+        return stored
+
+    async def _claim(self, client: Redis, key: str) -> Optional[StoredResponse]:
+        """Take the Redis placeholder for ``key``, or wait for the worker that holds it."""
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            if await client.set(f"idem:{key}", PENDING, nx=True, px=int(self.pending_ttl * 1000)):
+                return None
+            raw = await client.get(f"idem:{key}")
+            if raw is not None and raw != PENDING:
+                IDEMPOTENCY_REPLAYS.labels(source="redis").inc()
+                return StoredResponse.loads(raw)
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgress("A request with this Idempotency-Key is still in progress")
+            await asyncio.sleep(0.05)
+
+    async def run(self, key: str, fingerprint: str, handler: Handler) -> tuple[StoredResponse, bool]:
+        """Return ``(response, replayed)``; ``handler`` runs at most once per key."""
+        stored = self._get_local(key)
+        if stored is not None:
+            IDEMPOTENCY_REPLAYS.labels(source="memory").inc()
+            return self._check(stored, fingerprint), True
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            IDEMPOTENCY_REPLAYS.labels(source="inflight").inc()
+            return self._check(await asyncio.shield(inflight), fingerprint), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        client = self._client()
+        try:
+            if client is not None:
+                try:
+                    stored = await self._claim(client, key)
+                except (RedisError, OSError) as e:
+                    mark_redis_down(e)
+                    client = None
+                if stored is not None:
+                    self._put_local(key, stored)
+                    future.set_result(stored)
+                    return self._check(stored, fingerprint), True
+            keepalive = asyncio.create_task(self._keep_pending(client, key)) if client is not None else None
+            try:
+                status_code, body = await handler()
+            except BaseException:
+                # Nothing was recorded; a retry may run the request again
+                if client is not None:
+                    await self._release(client, key)
+                raise
+            finally:
+                if keepalive is not None:
+                    keepalive.cancel()
+            stored = StoredResponse(status_code, body, fingerprint)
+            self._put_local(key, stored)
+            if client is not None:
+                try:
+                    await client.set(f"idem:{key}", stored.dumps(), px=int(self.ttl * 1000))
+                except (RedisError, OSError) as e:
+                    mark_redis_down(e)
+            future.set_result(stored)
+            return stored, False
+        except BaseException as e:
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    # Waiters re-raise it; keep the loop from logging an unretrieved exception
+                    future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _keep_pending(self, client: Redis, key: str) -> None:
+        """Extend the placeholder while the request runs."""
+        while True:
+            await asyncio.sleep(self.pending_ttl / 3)
+            try:
+                await client.pexpire(f"idem:{key}", int(self.pending_ttl * 1000))
+            except (RedisError, OSError) as e:
+                mark_redis_down(e)
+                return
+
+    async def _release(self, client: Redis, key: str) -> None:
+        try:
+            await client.delete(f"idem:{key}")
+        except (RedisError, OSError) as e:
+            mark_redis_down(e)
+
+
+_store: Optional[IdempotencyStore] = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    global _store
+    if _store is None:
+        settings = get_settings()
+        _store = IdempotencyStore(
+            ttl=settings.idempotency_ttl,
+            max_entries=settings.idempotency_max_entries,
+            wait_timeout=settings.idempotency_wait_timeout,
+        )
+    return _store
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from typing import Any, Optional
+
+import httpx
+
+from app.core.logging import logger
+from app.core.metrics import ORDER_BATCH_LEGS
+from app.services.dhan_client import DhanClient, reached_broker
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _order_id(response: Any) -> Optional[str]:
+    if isinstance(response, dict) and response.get("orderId") is not None:
+        return str(response["orderId"])
+    return None
+
+
+def broker_rejection(response: Any) -> Optional[str]:
+    """Reason when the broker answered 200 but rejected the order (orderStatus REJECTED)."""
+    if isinstance(response, dict) and str(response.get("orderStatus", "")).upper() == "REJECTED":
+        return response.get("omsErrorDescription") or "Rejected by broker"
+    return None
+
+
+def _settled(index: int, response: Any) -> dict[str, Any]:
+    """Leg for a broker response: placed, or failed if the broker rejected it."""
+    rejection = broker_rejection(response)
+    if rejection is not None:
+        return {"index": index, "status": "failed", "error": rejection, "order_id": _order_id(response), "response": response}
+    return {"index": index, "status": "placed", "order_id": _order_id(response), "response": response}
+
+
+def _outcome_known(exc: BaseException) -> bool:
+    """Whether a failed placement is known not to have created an order."""
+    if not reached_broker(exc):
+        return True
+    # The broker answered with a client error: it looked at the order and refused it
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code < 500
+
+
+def batch_submitted(result: dict[str, Any]) -> bool:
+    """Whether any leg of a ``place_batch`` result may have reached the broker."""
+    return any(
+        leg["status"] not in ("rejected", "skipped") and leg.get("sent", True)
+        for leg in result["legs"]
+    )
+
+
+class OrderBatchService:
+    """Places a basket of orders concurrently through one broker client.
+
+    Legs share the client's outbound order rate limiter, so a large basket is
+    paced rather than rejected by the broker. With ``all_or_nothing`` a single
+    rejected leg stops the whole basket before dispatch, and a failed leg
+    cancels every leg that was already placed.
+
+    Every leg carries a correlation id. A leg whose call failed after it may
+    have reached the broker (a timeout, a 5xx) is ``unknown`` until it is
+    looked up by that id: found and live, it counts as placed (and is rolled
+    back like any other); not found, it failed; if the lookup fails too, it
+    stays ``unknown`` in the result.
+    """
+
+    def __init__(self, client: DhanClient) -> None:
+        self.client = client
+
+    async def _place(self, index: int, order: dict[str, Any]) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.place_order(order)
+        except Exception as e:
+            return {
+                "index": index,
+                "status": "failed" if _outcome_known(e) else "unknown",
+                "error": str(e),
+                "sent": reached_broker(e),
+                "correlation_id": order["correlationId"],
+                "elapsed_ms": _elapsed_ms(started),
+            }
+        leg = _settled(index, response)
+        leg.update(correlation_id=order["correlationId"], elapsed_ms=_elapsed_ms(started))
+        return leg
+
+    async def _resolve(self, leg: dict[str, Any]) -> None:
+        """Settle an ``unknown`` leg by looking its order up by correlation id."""
+        try:
+            response = await self.client.get_order_by_correlation_id(leg["correlation_id"])
+        except Exception as e:
+            leg["lookup_error"] = str(e)
+            logger.error("order_batch_leg_unknown", correlation_id=leg["correlation_id"], error=str(e))
+            return
+        if response is None:
+            # The broker never created it
+            leg["status"] = "failed"
+            return
+        if str(response.get("orderStatus", "")).upper() in ("CANCELLED", "EXPIRED"):
+            leg.update(status="failed", order_id=_order_id(response), response=response)
+            return
+        settled = _settled(leg["index"], response)
+        settled.update(correlation_id=leg["correlation_id"], elapsed_ms=leg["elapsed_ms"], resolved_by_lookup=True)
+        leg.clear()
+        leg.update(settled)
+
+    async def _rollback(self, leg: dict[str, Any]) -> None:
+        started = time.perf_counter()
+        try:
+            if leg.get("order_id") is None:
+                raise ValueError("Broker response had no orderId")
+            await self.client.cancel_order(leg["order_id"])
+            leg["status"] = "rolled_back"
+        except Exception as e:
+            leg["status"] = "rollback_failed"
+            leg["error"] = str(e)
+            logger.error("order_batch_rollback_failed", order_id=leg.get("order_id"), error=str(e))
+        leg["rollback_ms"] = _elapsed_ms(started)
+
+    async def place_batch(
+        self,
+        orders: list[dict[str, Any]],
+        rejections: list[Optional[str]],
+        *,
+        all_or_nothing: bool = False,
+    ) -> dict[str, Any]:
+        started = time.perf_counter()
+        # Lets a leg whose outcome is unknown be found at the broker afterwards
+        batch_id = uuid.uuid4().hex[:12]
+        orders = [
+            order if order.get("correlationId") else {**order, "correlationId": f"{batch_id}-{i}"}
+            for i, order in enumerate(orders)
+        ]
+        legs: list[dict[str, Any]] = [
+            {"index": i, "status": "rejected", "error": reason}
+            for i, reason in enumerate(rejections)
+        ]
+        rejected = any(rejections)
+        if all_or_nothing and rejected:
+            for leg in legs:
+                if leg["error"] is None:
+                    leg.update(status="skipped", error="Another leg was rejected")
+        else:
+            dispatch = [i for i, reason in enumerate(rejections) if reason is None]
+            for leg in await asyncio.gather(*(self._place(i, orders[i]) for i in dispatch)):
+                legs[leg["index"]] = leg
+            await asyncio.gather(*(self._resolve(leg) for leg in legs if leg["status"] == "unknown"))
+            if all_or_nothing and any(leg["status"] in ("failed", "unknown") for leg in legs):
+                await asyncio.gather(*(self._rollback(leg) for leg in legs if leg["status"] == "placed"))
+        for leg in legs:
+            ORDER_BATCH_LEGS.labels(status=leg["status"]).inc()
+        placed = sum(1 for leg in legs if leg["status"] == "placed")
+        return {
+            "ok": placed == len(legs),
+            "all_or_nothing": all_or_nothing,
+            "placed": placed,
+            "legs": legs,
+            "elapsed_ms": _elapsed_ms(started),
+        }
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from app.core.metrics import ORDER_BOOK_INDEX_BUILDS
+from app.services.snapshot_cache import Snapshot, broker_snapshot
+
+
+# Categorical columns: each is stored as int codes plus a value -> code vocabulary
+FILTER_FIELDS = ("orderStatus", "tradingSymbol", "transactionType")
+TIME_FIELD = "createTime"
+NUMERIC_SORT_FIELDS = ("quantity", "price", "filledQty", "averageTradedPrice")
+SORT_FIELDS = ("createTime", "updateTime", "orderStatus", "tradingSymbol", "transactionType", "orderId") + NUMERIC_SORT_FIELDS
+
+
+def _norm(value: Any) -> str:
+    return "" if value is None else str(value).strip().upper()
+
+
+def _float(value: Optional[float]) -> float:
+    return float(value) if value is not None else float("nan")
+
+
+def _values(raw: Optional[str]) -> list[str]:
+    """``"PENDING,TRANSIT"`` -> ``["PENDING", "TRANSIT"]``."""
+    return [_norm(v) for v in raw.split(",") if v.strip()] if raw else []
+
+
+@dataclass
+class _Column:
+    codes: np.ndarray
+    # Normalized value -> codes of the raw values it covers ("buy", "BUY ")
+    vocab: dict[str, list[int]]
+
+    @classmethod
+    def build(cls, rows: list[Any], name: str) -> "_Column":
+        # Encode raw values first and normalize only the distinct ones
+        raw: dict[Any, int] = {}
+        codes = np.fromiter((raw.setdefault(getattr(row, name, None), len(raw)) for row in rows), dtype=np.int32, count=len(rows))
+        vocab: dict[str, list[int]] = {}
+        for value, code in raw.items():
+            vocab.setdefault(_norm(value), []).append(code)
+        return cls(codes, vocab)
+
+
+class OrderBookIndex:
+    """Columnar index over one orders snapshot for paging, sorting and filtering.
+
+    Columns are read from the snapshot's typed rows (malformed rows index as
+    empty values); pages return the raw broker rows. Filter columns are dictionary-encoded once per snapshot, so a filter is a
+    vectorized compare over int codes. Sort permutations are computed on first
+    use per field and reused by every later page request for the same version.
+    """
+
+    def __init__(self, snapshot: Snapshot) -> None:
+        typed = snapshot.typed
+        self.version = snapshot.version
+        self.rows = snapshot.rows
+        self._typed = typed
+        self._columns: dict[str, _Column] = {}
+        for name in FILTER_FIELDS:
+            self._columns[name] = _Column.build(typed, name)
+        self._times = np.array([getattr(row, TIME_FIELD, None) or "" for row in typed], dtype=str)
+        self._orders: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _sort_order(self, field: str) -> np.ndarray:
+        order = self._orders.get(field)
+        if order is None:
+            if field == TIME_FIELD:
+                keys = self._times
+            elif field in NUMERIC_SORT_FIELDS:
+                keys = np.array([_float(getattr(row, field, None)) for row in self._typed], dtype=np.float64)
+            else:
+                keys = np.array([_norm(getattr(row, field, None)) for row in self._typed], dtype=str)
+            order = self._orders[field] = np.argsort(keys, kind="stable")
+        return order
+
+    def _match(self, field: str, raw: Optional[str]) -> Optional[np.ndarray]:
+        wanted = _values(raw)
+        if not wanted:
+            return None
+        column = self._columns[field]
+        codes = [code for v in wanted for code in column.vocab.get(v, ())]
+        return np.isin(column.codes, codes)
+
+    def status_counts(self) -> dict[str, int]:
+        column = self._columns["orderStatus"]
+        counts = np.bincount(column.codes, minlength=sum(len(c) for c in column.vocab.values()))
+        totals = {value: int(sum(counts[c] for c in group)) for value, group in column.vocab.items()}
+        return {value: n for value, n in totals.items() if n}
+
+    def query(
+        self,
+        *,
+        status: Optional[str] = None,
+        symbol: Optional[str] = None,
+        side: Optional[str] = None,
+        time_from: Optional[str] = None,
+        time_to: Optional[str] = None,
+        sort: str = TIME_FIELD,
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> dict[str, Any]:
+        """One page of matching rows plus the match count and per-status counts of the whole book."""
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by {sort!r}; expected one of {', '.join(SORT_FIELDS)}")
+        masks: Iterable[Optional[np.ndarray]] = (
+            self._match("orderStatus", status),
+            self._match("tradingSymbol", symbol),
+            self._match("transactionType", side),
+            self._times >= time_from if time_from else None,
+            self._times <= time_to if time_to else None,
+        )
+        mask: Optional[np.ndarray] = None
+        for m in masks:
+            if m is not None:
+                mask = m if mask is None else mask & m
+        order = self._sort_order(sort)
+        if descending:
+            order = order[::-1]
+        if mask is not None:
+            order = order[mask[order]]
+        page = order[offset:offset + limit]
+        return {
+            "version": self.version,
+            "total": int(len(order)),
+            "offset": offset,
+            "limit": limit,
+            "status_counts": self.status_counts(),
+            "rows": [self.rows[i] for i in page],
+        }
+
+
+class OrderBookCache:
+    """Keeps the index for the latest orders snapshot; rebuilt only when the version changes."""
+
+    def __init__(self) -> None:
+        self._latest: Optional[OrderBookIndex] = None
+
+    def index(self, snapshot: Snapshot) -> OrderBookIndex:
+        latest = self._latest
+        if latest is not None and latest.version == snapshot.version:
+            return latest
+        ORDER_BOOK_INDEX_BUILDS.inc()
+        index = self._latest = OrderBookIndex(snapshot)
+        return index
+
+
+order_book_cache = OrderBookCache()
+
+
+async def order_book_index() -> OrderBookIndex:
+    return order_book_cache.index(await broker_snapshot("orders"))
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.db.session import engine
+
+
+# Tables that are range-partitioned by day on created_at (Postgres only)
+PARTITIONED_TABLES = ("audit_logs", "kill_switch_events")
+# Rows moved or deleted per statement when working through a DEFAULT partition
+DEFAULT_BATCH = 5000
+
+
+def partition_name(table: str, day: date) -> str:
+    return f"{table}_p{day:%Y%m%d}"
+
+
+def create_partition_sql(table: str, day: date) -> str:
+    start = day.isoformat()
+    end = (day + timedelta(days=1)).isoformat()
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, day)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+
+
+def _day_partitions(conn: Connection, table: str) -> dict[date, str]:
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table"
+        ),
+        {"table": table},
+    ).scalars()
+    prefix = f"{table}_p"
+    partitions: dict[date, str] = {}
+    for name in rows:
+        if name.startswith(prefix):
+            try:
+                partitions[datetime.strptime(name[len(prefix):], "%Y%m%d").date()] = name
+            except ValueError:
+                continue
+    return partitions
+
+
+def _default_batch(table: str, where: str, batch_size: int) -> str:
+    # Postgres has no DELETE ... LIMIT; pick one batch of DEFAULT rows by ctid
+    return (
+        f"DELETE FROM {table}_default WHERE ctid IN "
+        f"(SELECT ctid FROM {table}_default WHERE {where} LIMIT {int(batch_size)}) RETURNING *"
+    )
+
+
+def create_partition(conn: Connection, table: str, day: date, batch_size: int = DEFAULT_BATCH) -> None:
+    """Add the day partition for ``day``, moving any rows the DEFAULT partition holds for it.
+
+    Postgres refuses to create a partition while DEFAULT has rows in its range
+    (legacy history, or writes that arrived before the partition existed), so
+    those rows are moved, ``batch_size`` at a time, into a standalone table
+    that is then attached.
+    """
+    bounds = {"start": day, "end": day + timedelta(days=1)}
+    in_range = "created_at >= :start AND created_at < :end"
+    stray = conn.execute(text(f"SELECT 1 FROM {table}_default WHERE {in_range} LIMIT 1"), bounds).first()
+    if stray is None:
+        conn.execute(text(create_partition_sql(table, day)))
+        return
+    name = partition_name(table, day)
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    move = text(f"WITH moved AS ({_default_batch(table, in_range, batch_size)}) INSERT INTO {name} SELECT * FROM moved")
+    while conn.execute(move, bounds).rowcount >= batch_size:
+        pass
+    conn.execute(
+        text(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+        )
+    )
+
+
+def ensure_partitions(conn: Connection, days_ahead: int, today: Optional[date] = None) -> int:
+    """Create daily partitions for today and the next ``days_ahead`` days."""
+    today = today or datetime.utcnow().date()
+    created = 0
+    for table in PARTITIONED_TABLES:
+        existing = _day_partitions(conn, table)
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            if day not in existing:
+                create_partition(conn, table, day)
+                created += 1
+    return created
+
+
+def drop_expired_partitions(conn: Connection, retention_days: int, today: Optional[date] = None) -> int:
+    """Drop whole day partitions past retention instead of DELETE-ing their rows."""
+    cutoff = (today or datetime.utcnow().date()) - timedelta(days=retention_days)
+    dropped = 0
+    for table in PARTITIONED_TABLES:
+        for day, name in _day_partitions(conn, table).items():
+            if day < cutoff:
+                conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped += 1
+    return dropped
+
+
+def prune_default_batch(
+    conn: Connection, table: str, retention_days: int, today: Optional[date] = None, batch_size: int = DEFAULT_BATCH
+) -> int:
+    """Delete up to ``batch_size`` expired rows from ``table``'s DEFAULT partition.
+
+    DEFAULT holds pre-partitioning history and writes that arrived ahead of
+    their partition; it cannot be dropped by day, so it is pruned in batches,
+    each meant to run in its own short transaction.
+    """
+    cutoff = (today or datetime.utcnow().date()) - timedelta(days=retention_days)
+    stmt = text(f"WITH pruned AS ({_default_batch(table, 'created_at < :cutoff', batch_size)}) SELECT count(*) FROM pruned")
+    return conn.execute(stmt, {"cutoff": cutoff}).scalar_one()
+
+
+async def maintain_partitions() -> None:
+    if engine.dialect.name != "postgresql":
+        return
+    settings = get_settings()
+    try:
+        async with engine.begin() as conn:
+            created = await conn.run_sync(ensure_partitions, settings.partition_days_ahead)
+            dropped = await conn.run_sync(drop_expired_partitions, settings.audit_retention_days)
+        pruned = 0
+        for table in PARTITIONED_TABLES:
+            while True:
+                async with engine.begin() as conn:
+                    deleted = await conn.run_sync(prune_default_batch, table, settings.audit_retention_days)
+                pruned += deleted
+                if deleted < DEFAULT_BATCH:
+                    break
+        logger.info("partition_maintenance", created=created, dropped=dropped, pruned=pruned)
+    except Exception as e:
+        logger.error("partition_maintenance_error", error=str(e))
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.core.metrics import PORTFOLIO_VIEW_BUILDS
+from app.models.payloads import Funds, Holding, parse_rows
+from app.services.snapshot_cache import Snapshot, broker_snapshot
+
+
+def _num(value: Optional[float]) -> float:
+    return float(value) if value is not None else 0.0
+
+
+@dataclass(frozen=True)
+class PortfolioView:
+    """Everything the portfolio/risk endpoints serve, derived from one set of snapshots."""
+
+    version: str
+    summary: dict[str, Any]
+    risk_metrics: dict[str, Any]
+    holdings: list[dict[str, Any]]
+
+
+def _margin(funds: Optional[Funds]) -> dict[str, Any]:
+    if funds is None:
+        return {"total": None, "used": None, "available": None, "usage_pct": None}
+    available = _num(funds.availabelBalance)
+    used = _num(funds.utilizedAmount)
+    total = _num(funds.sodLimit) or available + used
+    return {
+        "total": total,
+        "used": used,
+        "available": available,
+        "usage_pct": round(used / total * 100, 2) if total else 0.0,
+    }
+
+
+def _holding_rows(holdings: list[dict[str, Any]], typed: list[Optional[Holding]]) -> list[dict[str, Any]]:
+    rows = []
+    for holding, row in zip(holdings, typed):
+        if row is None:
+            continue
+        quantity = _num(row.totalQty)
+        average = _num(row.avgCostPrice)
+        current = _num(row.lastTradedPrice) or average
+        cost = quantity * average
+        pnl = quantity * current - cost
+        rows.append({
+            **holding,
+            "quantity": quantity,
+            "averagePrice": average,
+            "currentPrice": current,
+            "marketValue": round(quantity * current, 2),
+            "unrealizedPnl": round(pnl, 2),
+            "returnPct": round(pnl / cost * 100, 2) if cost else 0.0,
+        })
+    return rows
+
+
+def build_view(
+    positions: list[dict[str, Any]],
+    holdings: list[dict[str, Any]],
+    funds: Optional[dict[str, Any]],
+    version: str = "",
+) -> PortfolioView:
+    """Derive the view from raw broker rows; numeric fields come from the typed models."""
+    booked = unbooked = 0.0
+    per_position: list[dict[str, Any]] = []
+    for position in parse_rows("positions", positions):
+        if position is None:
+            continue
+        realized = _num(position.realizedProfit)
+        unrealized = _num(position.unrealizedProfit)
+        booked += realized
+        unbooked += unrealized
+        per_position.append({
+            "symbol": position.tradingSymbol or position.securityId,
+            "security_id": position.securityId,
+            "net_qty": _num(position.netQty),
+            "pnl": round(realized + unrealized, 2),
+        })
+    running = booked + unbooked
+    per_position.sort(key=lambda p: p["pnl"])
+    open_positions = sum(1 for p in per_position if p["net_qty"])
+    holding_rows = _holding_rows(holdings, parse_rows("holdings", holdings))
+    holdings_value = sum(h["marketValue"] for h in holding_rows)
+    holdings_pnl = sum(h["unrealizedPnl"] for h in holding_rows)
+    margin = _margin(parse_rows("funds", [funds])[0] if funds else None)
+
+    summary = {
+        "running_pnl": round(running, 2),
+        "booked_pnl": round(booked, 2),
+        "unbooked_pnl": round(unbooked, 2),
+        "open_positions": open_positions,
+        "holdings_value": round(holdings_value, 2),
+        "holdings_pnl": round(holdings_pnl, 2),
+        "margin": margin,
+        "version": version,
+    }
+    worst = per_position[0] if per_position else None
+    best = per_position[-1] if per_position else None
+    risk_metrics = {
+        "current_daily_loss": round(max(0.0, -running), 2),
+        "current_position_loss": round(max(0.0, -worst["pnl"]), 2) if worst else 0.0,
+        "current_profit": round(max(0.0, best["pnl"]), 2) if best else 0.0,
+        "worst_position": worst,
+        "best_position": best,
+        "running_pnl": summary["running_pnl"],
+        "margin_usage_pct": margin["usage_pct"],
+        "positions": per_position,
+        "version": version,
+    }
+    return PortfolioView(version=version, summary=summary, risk_metrics=risk_metrics, holdings=holding_rows)
+
+
+class PortfolioCache:
+    """Memoizes the latest PortfolioView by the versions of the snapshots it was built from."""
+
+    def __init__(self) -> None:
+        self._latest: Optional[PortfolioView] = None
+
+    def view(self, positions: Snapshot, holdings: Optional[Snapshot], funds: Optional[Snapshot]) -> PortfolioView:
+        version = ".".join(s.version if s is not None else "-" for s in (positions, holdings, funds))
+        latest = self._latest
+        if latest is not None and latest.version == version:
+            return latest
+        PORTFOLIO_VIEW_BUILDS.inc()
+        view = build_view(
+            positions.rows,
+            holdings.rows if holdings is not None else [],
+            funds.rows[0] if funds is not None and funds.rows else None,
+            version,
+        )
+        self._latest = view
+        return view
+
+
+portfolio_cache = PortfolioCache()
+
+
+async def portfolio_view() -> PortfolioView:
+    """Current view; positions are required, holdings and funds degrade to empty when unavailable."""
+    positions, holdings, funds = await asyncio.gather(
+        broker_snapshot("positions"),
+        broker_snapshot("holdings"),
+        broker_snapshot("funds"),
+        return_exceptions=True,
+    )
+    if isinstance(positions, BaseException):
+        raise positions
+    return portfolio_cache.view(
+        positions,
+        None if isinstance(holdings, BaseException) else holdings,
+        None if isinstance(funds, BaseException) else funds,
+    )
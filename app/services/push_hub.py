@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+import orjson
+
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.core.metrics import PUSH_CONFLATED, PUSH_MESSAGES, PUSH_SUBSCRIBERS
+from app.db.session import async_session_maker
+from app.services.portfolio_service import portfolio_view
+from app.services.risk_service import RiskService
+from app.services.snapshot_cache import broker_snapshot
+
+
+TOPICS = ("positions", "orders", "portfolio", "kill_switch", "risk")
+
+Producer = Callable[[], Awaitable[Optional[tuple[str, Any]]]]
+Listener = Callable[[Any], None]
+
+
+def encode_message(topic: str, version: str, data: Any) -> bytes:
+    return orjson.dumps({"type": "update", "topic": topic, "version": version, "data": data})
+
+
+def heartbeat_message() -> bytes:
+    return orjson.dumps({"type": "heartbeat", "ts": time.time()})
+
+
+class Subscription:
+    """Per-client mailbox holding at most one pending message per topic.
+
+    A slow consumer never builds a backlog: a newer update for a topic replaces
+    the one it has not read yet (conflation), so it always catches up to the
+    latest state in one read.
+    """
+
+    def __init__(self, topics: Iterable[str]) -> None:
+        self.topics: set[str] = set(topics)
+        self._pending: dict[str, bytes] = {}
+        self._ready = asyncio.Event()
+
+    def put(self, topic: str, message: bytes) -> None:
+        if topic in self._pending:
+            PUSH_CONFLATED.labels(topic=topic).inc()
+        self._pending[topic] = message
+        self._ready.set()
+
+    async def get(self, timeout: float) -> list[tuple[str, bytes]]:
+        """Pending messages, or an empty list if nothing arrived within ``timeout``."""
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        messages = list(self._pending.items())
+        self._pending.clear()
+        self._ready.clear()
+        return messages
+
+
+class PushHub:
+    """Fan-out of topic updates to subscribed WebSocket/SSE clients.
+
+    One producer task per topic fetches state once and publishes only when its
+    version changes; producers skip work while the topic has no subscribers.
+    Each update is encoded once and shared by every subscriber. In-process
+    listeners (the NiceGUI pages) get the decoded data itself, so backend work
+    per update is the same for one open tab or a hundred.
+    """
+
+    def __init__(self, poll_interval: float = 1.0) -> None:
+        self.poll_interval = poll_interval
+        self._subscribers: set[Subscription] = set()
+        self._listeners: dict[str, set[Listener]] = {}
+        self._latest: dict[str, tuple[str, Any]] = {}
+        self._encoded: dict[str, bytes] = {}
+        self._producers: dict[str, Producer] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    def _count_subscribers(self) -> None:
+        PUSH_SUBSCRIBERS.set(len(self._subscribers) + sum(len(l) for l in self._listeners.values()))
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(t for t in topics if t in TOPICS)
+        self._subscribers.add(subscription)
+        self._count_subscribers()
+        # New subscribers start from the latest known state
+        for topic in subscription.topics:
+            self.replay(subscription, topic)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        self._count_subscribers()
+
+    def listen(self, topic: str, listener: Listener) -> Callable[[], None]:
+        """Call ``listener(data)`` with the latest state now and on every change; returns an unlisten function."""
+        listeners = self._listeners.setdefault(topic, set())
+        listeners.add(listener)
+        self._count_subscribers()
+        latest = self._latest.get(topic)
+        if latest is not None:
+            self._notify(topic, listener, latest[1])
+
+        def unlisten() -> None:
+            listeners.discard(listener)
+            self._count_subscribers()
+
+        return unlisten
+
+    def _notify(self, topic: str, listener: Listener, data: Any) -> None:
+        try:
+            listener(data)
+        except Exception as e:
+            logger.warning("push_listener_error", topic=topic, error=str(e))
+
+    def _message(self, topic: str) -> bytes:
+        message = self._encoded.get(topic)
+        if message is None:
+            version, data = self._latest[topic]
+            message = self._encoded[topic] = encode_message(topic, version, data)
+        return message
+
+    def replay(self, subscription: Subscription, topic: str) -> None:
+        if topic in self._latest:
+            subscription.put(topic, self._message(topic))
+
+    def has_subscribers(self, topic: str) -> bool:
+        return bool(self._listeners.get(topic)) or any(topic in s.topics for s in self._subscribers)
+
+    def publish(self, topic: str, data: Any, version: Optional[str] = None) -> bool:
+        """Send ``data`` to subscribers of ``topic`` unless it matches the last published version."""
+        if version is None:
+            version = hashlib.blake2b(orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=12).hexdigest()
+        latest = self._latest.get(topic)
+        if latest is not None and latest[0] == version:
+            return False
+        self._latest[topic] = (version, data)
+        self._encoded.pop(topic, None)
+        for listener in list(self._listeners.get(topic, ())):
+            self._notify(topic, listener, data)
+        # Encoded only when a WebSocket/SSE client needs the bytes
+        for subscription in self._subscribers:
+            if topic in subscription.topics:
+                subscription.put(topic, self._message(topic))
+        PUSH_MESSAGES.labels(topic=topic).inc()
+        return True
+
+    def add_producer(self, topic: str, producer: Producer) -> None:
+        self._producers[topic] = producer
+
+    async def _run_producer(self, topic: str, producer: Producer) -> None:
+        while True:
+            if self.has_subscribers(topic):
+                try:
+                    result = await producer()
+                    if result is not None:
+                        version, data = result
+                        self.publish(topic, data, version)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning("push_producer_error", topic=topic, error=str(e))
+            await asyncio.sleep(self.poll_interval)
+
+    async def start(self) -> None:
+        for topic, producer in self._producers.items():
+            self._tasks.append(asyncio.create_task(self._run_producer(topic, producer), name=f"push:{topic}"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+async def _broker_producer(topic: str) -> tuple[str, Any]:
+    snapshot = await broker_snapshot(topic)
+    return snapshot.version, snapshot.rows
+
+
+async def _portfolio_producer() -> tuple[str, Any]:
+    view = await portfolio_view()
+    return view.version, view
+
+
+async def _kill_switch_producer() -> tuple[None, Any]:
+    async with async_session_maker() as session:
+        status = await RiskService(session).get_kill_switch_status()
+    return None, status.model_dump(mode="json")
+
+
+push_hub = PushHub()
+
+
+async def start_push_hub() -> None:
+    settings = get_settings()
+    push_hub.poll_interval = settings.push_poll_interval
+    push_hub.add_producer("kill_switch", _kill_switch_producer)
+    if settings.dhan_api_key:
+        push_hub.add_producer("positions", lambda: _broker_producer("positions"))
+        push_hub.add_producer("orders", lambda: _broker_producer("orders"))
+        push_hub.add_producer("portfolio", _portfolio_producer)
+    else:
+        # Broker topics cannot be fetched without a key; pages fall back to their Refresh buttons
+        logger.warning("push_hub_broker_topics_disabled", topics=["positions", "orders", "portfolio"])
+    # "risk" is published by the risk poll in the scheduler, no producer needed
+    await push_hub.start()
+    logger.info("push_hub_started", producers=list(push_hub._producers))
+
+
+async def shutdown_push_hub() -> None:
+    await push_hub.stop()
+    logger.info("push_hub_stopped")
@@ -3,12 +3,24 @@ from __future__ import annotations
 from datetime import datetime, timedelta, time
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import func, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.core.logging import logger
+from app.db.upsert import dialect_insert
 from app.models.risk import RiskSettings, KillSwitchStatus, KillSwitchEvent
+from app.services.portfolio_service import PortfolioView, portfolio_view
+
+
+def _reduces(order: dict, net_qty: float) -> bool:
+    """True when ``order`` only shrinks an open position without flipping it."""
+    quantity = order.get("quantity") or 0
+    if order.get("transactionType") == "SELL":
+        return net_qty > 0 and quantity <= net_qty
+    if order.get("transactionType") == "BUY":
+        return net_qty < 0 and quantity <= -net_qty
+    return False
 
 
 class RiskService:
@@ -17,22 +29,38 @@ class RiskService:
         self.user_id = user_id
         self.settings = get_settings()
 
+    async def _get_or_create(self, model, **defaults):
+        """Fetch the caller's row, creating it atomically on first use.
+
+        Warm path is a single SELECT. On a miss, one ``INSERT ... ON CONFLICT
+        DO UPDATE ... RETURNING`` either creates the row or returns the one a
+        concurrent request just created, against the unique user-key index.
+        """
+        stmt = select(model).where(model.user_id == self.user_id)
+        row = (await self.session.execute(stmt)).scalar_one_or_none()
+        if row is not None:
+            return row
+        now = datetime.utcnow()
+        insert = dialect_insert(self.session.bind.dialect.name)(model).values(
+            user_id=self.user_id, created_at=now, updated_at=now, **defaults
+        )
+        upsert = insert.on_conflict_do_update(
+            index_elements=[func.coalesce(model.user_id, literal_column("''"))],
+            set_={"user_id": insert.excluded.user_id},
+        ).returning(model)
+        row = (await self.session.scalars(upsert)).one()
+        await self.session.commit()
+        return row
+
     async def get_or_create_risk_settings(self) -> RiskSettings:
-        stmt = select(RiskSettings).where(RiskSettings.user_id == self.user_id)
-        result = await self.session.execute(stmt)
-        settings = result.scalar_one_or_none()
-        if settings is None:
-            settings = RiskSettings(
-                user_id=self.user_id,
-                max_daily_total_loss=self.settings.max_daily_total_loss,
-                max_daily_loss_per_position=self.settings.max_daily_loss_per_position,
-                per_position_daily_profit_target=self.settings.per_position_daily_profit_target,
-                max_daily_total_profit_target=self.settings.max_daily_total_profit_target,
-            )
-            self.session.add(settings)
-            await self.session.commit()
-            await self.session.refresh(settings)
-        return settings
+        return await self._get_or_create(
+            RiskSettings,
+            max_daily_total_loss=self.settings.max_daily_total_loss,
+            max_daily_loss_per_position=self.settings.max_daily_loss_per_position,
+            per_position_daily_profit_target=self.settings.per_position_daily_profit_target,
+            max_daily_total_profit_target=self.settings.max_daily_total_profit_target,
+            risk_locked=False,
+        )
 
     async def lock_risk_until_next_day_5pm(self) -> RiskSettings:
         settings = await self.get_or_create_risk_settings()
@@ -75,16 +103,53 @@ class RiskService:
     def trigger_level(value: float) -> float:
         return value * 0.95
 
+    async def pre_trade_check(self, orders: list[dict], view: Optional[PortfolioView] = None) -> list[Optional[str]]:
+        """Rejection reason per order (None when it may be sent to the broker).
+
+        Blocks everything while the kill switch is active or risk is locked.
+        Past 95% of a daily loss/profit limit (the level the risk poll halts
+        at), orders are blocked unless they only reduce an open position, so
+        exits stay possible. ``view`` defaults to the current portfolio view;
+        if that is unavailable only the kill switch and lock are checked.
+        """
+        status = await self.get_kill_switch_status()
+        if status.is_active:
+            return [f"Kill switch active: {status.reason}"] * len(orders)
+        settings = await self.unlock_risk_if_expired()
+        if settings.risk_locked:
+            return [f"Risk locked until {settings.risk_lock_until}"] * len(orders)
+        if view is None:
+            try:
+                view = await portfolio_view()
+            except Exception as e:
+                logger.warning("pre_trade_check_no_portfolio", error=str(e))
+                return [None] * len(orders)
+
+        running = view.summary["running_pnl"]
+        account_reason = None
+        if running <= -self.trigger_level(settings.max_daily_total_loss):
+            account_reason = "Daily loss limit reached"
+        elif running >= self.trigger_level(settings.max_daily_total_profit_target):
+            account_reason = "Daily profit target reached"
+        positions = {p["security_id"]: p for p in view.risk_metrics["positions"] if p.get("security_id")}
+
+        reasons: list[Optional[str]] = []
+        for order in orders:
+            position = positions.get(str(order.get("securityId")))
+            if position is not None and _reduces(order, position["net_qty"]):
+                reasons.append(None)
+            elif account_reason is not None:
+                reasons.append(account_reason)
+            elif position is not None and position["pnl"] <= -self.trigger_level(settings.max_daily_loss_per_position):
+                reasons.append(f"Position loss limit reached for {position['symbol']}")
+            elif position is not None and position["pnl"] >= self.trigger_level(settings.per_position_daily_profit_target):
+                reasons.append(f"Position profit target reached for {position['symbol']}")
+            else:
+                reasons.append(None)
+        return reasons
+
     async def get_kill_switch_status(self) -> KillSwitchStatus:
-        stmt = select(KillSwitchStatus).where(KillSwitchStatus.user_id == self.user_id)
-        result = await self.session.execute(stmt)
-        status = result.scalar_one_or_none()
-        if status is None:
-            status = KillSwitchStatus(user_id=self.user_id, is_active=False)
-            self.session.add(status)
-            await self.session.commit()
-            await self.session.refresh(status)
-        return status
+        return await self._get_or_create(KillSwitchStatus, is_active=False)
 
     async def activate_kill_switch(self, reason: str) -> KillSwitchStatus:
         status = await self.get_kill_switch_status()
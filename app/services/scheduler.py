@@ -7,11 +7,16 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.core.logging import logger
 from app.db.session import async_session_maker
+from app.db.timeseries import get_timeseries_store
 from app.models.risk import RiskSettings
 from app.services.risk_service import RiskService
 from app.services.kill_switch_executor import KillSwitchExecutor
+from app.services.broker_sync_service import BrokerSyncService
+from app.services.partition_maintenance import maintain_partitions
+from app.services.push_hub import push_hub
 from app.services.dhan_client import DhanClient, CircuitBreakerState
 
 
@@ -27,6 +32,12 @@ async def poll_and_enforce_risk() -> None:
             # TODO: replace with actual P&L computation via broker + DB positions
             total_pl = await compute_total_pnl(session)
             per_position_pl = await compute_per_position_pnl(session)
+            record_pnl_curve(total_pl, per_position_pl)
+            push_hub.publish("risk", {
+                "total_pnl": total_pl,
+                "per_position_pnl": per_position_pl,
+                "settings": settings.model_dump(mode="json"),
+            })
 
             # Enforce thresholds at 95%
             if total_pl <= -RiskService.trigger_level(settings.max_daily_total_loss):
@@ -57,11 +68,45 @@ async def compute_per_position_pnl(session: AsyncSession) -> dict[str, float]:
     return {}
 
 
+async def sync_broker_book() -> None:
+    try:
+        async with async_session_maker() as session:
+            async with DhanClient() as client:
+                await BrokerSyncService(session).sync_from_broker(client)
+    except Exception as e:
+        logger.error("broker_sync_error", error=str(e))
+
+
+def record_pnl_curve(total_pl: float, per_position_pl: dict[str, float]) -> None:
+    try:
+        store = get_timeseries_store()
+        store.append("account", "default", total_pl)
+        for symbol, pnl in per_position_pl.items():
+            store.append("instrument", symbol, pnl)
+    except Exception as e:
+        logger.error("pnl_curve_record_error", error=str(e))
+
+
+async def maintain_timeseries() -> None:
+    try:
+        store = get_timeseries_store()
+        keep_days = get_settings().timeseries_retention_days
+        compacted, removed = await asyncio.to_thread(store.run_maintenance, keep_days)
+        logger.info("timeseries_maintenance", compacted=compacted, removed_days=removed)
+    except Exception as e:
+        logger.error("timeseries_maintenance_error", error=str(e))
+
+
 async def start_scheduler() -> None:
     global scheduler
     if scheduler is None:
         scheduler = AsyncIOScheduler()
         scheduler.add_job(poll_and_enforce_risk, "interval", seconds=2, id="risk_poll")
+        settings = get_settings()
+        if settings.dhan_api_key:
+            scheduler.add_job(sync_broker_book, "interval", seconds=settings.broker_sync_interval, id="broker_sync")
+        scheduler.add_job(maintain_timeseries, "cron", hour=0, minute=5, timezone="UTC", id="timeseries_maintenance")
+        scheduler.add_job(maintain_partitions, "cron", hour=0, minute=10, timezone="UTC", id="partition_maintenance")
         scheduler.start()
         logger.info("scheduler_started")
 
@@ -70,5 +115,6 @@ async def shutdown_scheduler() -> None:
     global scheduler
     if scheduler is not None:
         scheduler.shutdown()
+        get_timeseries_store().flush()
         scheduler = None
         logger.info("scheduler_stopped")
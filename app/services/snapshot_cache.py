@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+
+from app.core.config import get_settings
+from app.core.loop_monitor import prefer_stale
+from app.core.metrics import ADMISSION_STALE
+from app.core.timing import add_component_time, component_total
+from app.models.payloads import parse_rows
+from app.services.broker_sync_service import holding_key, order_key, position_key
+from app.services.dhan_client import DhanClient
+
+
+Fetcher = Callable[[], Awaitable[list[dict[str, Any]]]]
+
+
+def _row_key(topic: str, row: dict[str, Any], digest: str) -> str:
+    key_fn = ROW_KEYS.get(topic)
+    key = key_fn(row) if key_fn else None
+    # Rows without a natural key are identified by content
+    return key if key is not None else f"#{digest}"
+
+
+@dataclass
+class Snapshot:
+    """One immutable version of a broker payload, ready to send.
+
+    ``version`` is derived from the content, so every worker that saw the same
+    book hands out the same version and ETag.
+    """
+
+    topic: str
+    version: str
+    rows: list[dict[str, Any]]
+    body: bytes
+    keys: list[str]
+    row_hashes: dict[str, str]
+    fetched_at: float
+    # Pre-encoded bodies keyed by content-coding, filled lazily by the HTTP layer
+    encodings: dict[str, bytes] = field(default_factory=dict)
+    _typed: Optional[list[Any]] = field(default=None, repr=False)
+
+    @property
+    def typed(self) -> list[Any]:
+        """Rows as ``app.models.payloads`` models (``None`` for malformed ones), parsed once per version."""
+        if self._typed is None:
+            self._typed = parse_rows(self.topic, self.rows)
+        return self._typed
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+def build_snapshot(topic: str, rows: list[dict[str, Any]]) -> Snapshot:
+    keys: list[str] = []
+    row_hashes: dict[str, str] = {}
+    for row in rows:
+        encoded = orjson.dumps(row, option=orjson.OPT_SORT_KEYS)
+        digest = hashlib.blake2b(encoded, digest_size=12).hexdigest()
+        key = _row_key(topic, row, digest)
+        keys.append(key)
+        row_hashes[key] = digest
+    body = orjson.dumps(rows)
+    version = hashlib.blake2b(body, digest_size=12).hexdigest()
+    return Snapshot(
+        topic=topic,
+        version=version,
+        rows=rows,
+        body=body,
+        keys=keys,
+        row_hashes=row_hashes,
+        fetched_at=time.monotonic(),
+    )
+
+
+class SnapshotCache:
+    """Latest broker payload per topic with short-lived sharing and delta history.
+
+    Concurrent callers within ``max_age`` share one broker fetch (single
+    flight). The last ``history`` versions per topic are kept so clients can
+    ask for only what changed since the version they hold.
+    """
+
+    def __init__(self, history: int = 32) -> None:
+        self.history = history
+        self._current: dict[str, Snapshot] = {}
+        self._versions: dict[str, OrderedDict[str, Snapshot]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def current(self, topic: str) -> Optional[Snapshot]:
+        return self._current.get(topic)
+
+    async def get(self, topic: str, fetcher: Fetcher, *, max_age: float) -> Snapshot:
+        snapshot = self._current.get(topic)
+        if snapshot is not None and snapshot.age < max_age:
+            return snapshot
+        lock = self._locks.setdefault(topic, asyncio.Lock())
+        async with lock:
+            snapshot = self._current.get(topic)
+            if snapshot is not None and snapshot.age < max_age:
+                return snapshot
+            return self.publish(topic, await fetcher())
+
+    def publish(self, topic: str, rows: list[dict[str, Any]]) -> Snapshot:
+        snapshot = build_snapshot(topic, rows or [])
+        previous = self._current.get(topic)
+        if previous is not None and previous.version == snapshot.version:
+            # Unchanged book: keep the existing object (and its cached encodings)
+            previous.fetched_at = snapshot.fetched_at
+            return previous
+        self._current[topic] = snapshot
+        versions = self._versions.setdefault(topic, OrderedDict())
+        versions[snapshot.version] = snapshot
+        while len(versions) > self.history:
+            versions.popitem(last=False)
+        return snapshot
+
+    def delta(self, topic: str, since: str) -> Optional[dict[str, Any]]:
+        """Rows added/changed and keys removed since ``since``; None if that version is unknown."""
+        current = self._current.get(topic)
+        base = self._versions.get(topic, {}).get(since)
+        if current is None or base is None:
+            return None
+        rows_by_key = dict(zip(current.keys, current.rows))
+        old, new = base.row_hashes, current.row_hashes
+        return {
+            "version": current.version,
+            "since": since,
+            "full": False,
+            "added": [rows_by_key[k] for k in new if k not in old],
+            "changed": [rows_by_key[k] for k in new if k in old and old[k] != new[k]],
+            "removed": [k for k in old if k not in new],
+        }
+
+
+ROW_KEYS: dict[str, Callable[[dict[str, Any]], Optional[str]]] = {
+    "orders": order_key,
+    "positions": position_key,
+    "holdings": holding_key,
+}
+
+snapshot_cache = SnapshotCache()
+
+
+async def _fetch_positions() -> list[dict[str, Any]]:
+    async with DhanClient() as client:
+        return await client.get_positions()
+
+
+async def _fetch_orders() -> list[dict[str, Any]]:
+    async with DhanClient() as client:
+        return await client.get_orders()
+
+
+async def _fetch_holdings() -> list[dict[str, Any]]:
+    async with DhanClient() as client:
+        return await client.get_holdings()
+
+
+async def _fetch_funds() -> list[dict[str, Any]]:
+    # Funds is a single object; kept as a one-row snapshot like the books
+    async with DhanClient() as client:
+        return [await client.get_funds()]
+
+
+BROKER_FETCHERS: dict[str, Fetcher] = {
+    "positions": _fetch_positions,
+    "orders": _fetch_orders,
+    "holdings": _fetch_holdings,
+    "funds": _fetch_funds,
+}
+
+
+async def broker_snapshot(topic: str) -> Snapshot:
+    """Current broker snapshot for ``topic``, refetched once it is older than ``snapshot_max_age``.
+
+    Requests admitted under event loop lag take whatever snapshot is cached,
+    however old, and only fetch when there is none yet.
+    """
+    if prefer_stale.get():
+        cached = snapshot_cache.current(topic)
+        if cached is not None:
+            ADMISSION_STALE.inc()
+            return cached
+    started = time.perf_counter()
+    before = component_total("broker")
+    try:
+        return await snapshot_cache.get(topic, BROKER_FETCHERS[topic], max_age=get_settings().snapshot_max_age)
+    finally:
+        # Waiting on another request's in-flight fetch is broker time too; the
+        # fetching request already recorded its own calls, so only add the rest
+        waited = time.perf_counter() - started - (component_total("broker") - before)
+        add_component_time("broker", max(0.0, waited))
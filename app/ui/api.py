@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Optional
+
+from app.api.routes import kill_switch as kill_routes
+from app.api.routes import orders as order_routes
+from app.api.routes import risk as risk_routes
+from app.core.config import get_settings
+from app.core.loop_monitor import loop_monitor, prefer_stale
+from app.db.session import async_session_maker
+from app.services.order_book import order_book_index
+from app.services.portfolio_service import portfolio_view
+from app.services.risk_service import RiskService
+from app.services.snapshot_cache import broker_snapshot
+
+
+# In-process data access for the NiceGUI pages. The pages run on the same
+# event loop as the API, so instead of an HTTP round trip to localhost they
+# read the shared snapshot caches and services directly. Writes go through the
+# route handlers themselves so auditing, push updates and the kill switch halt
+# stay in one place.
+
+
+def _plain(value: Any) -> Any:
+    """JSON-shaped data, as the pages got it from the HTTP API."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return value
+
+
+async def positions() -> list[dict[str, Any]]:
+    return (await broker_snapshot("positions")).rows
+
+
+async def orders() -> list[dict[str, Any]]:
+    return (await broker_snapshot("orders")).rows
+
+
+async def order_page(**params: Any) -> dict[str, Any]:
+    """One page of the order book; same parameters as ``GET /api/orders/page``."""
+    return (await order_book_index()).query(**params)
+
+
+async def margin() -> dict[str, Any]:
+    rows = (await broker_snapshot("funds")).rows
+    return rows[0] if rows else {}
+
+
+async def portfolio_summary() -> dict[str, Any]:
+    return (await portfolio_view()).summary
+
+
+async def risk_metrics() -> dict[str, Any]:
+    return (await portfolio_view()).risk_metrics
+
+
+async def holdings() -> list[dict[str, Any]]:
+    return (await portfolio_view()).holdings
+
+
+async def risk_settings() -> dict[str, Any]:
+    async with async_session_maker() as session:
+        return _plain(await RiskService(session).get_or_create_risk_settings())
+
+
+async def kill_status() -> dict[str, Any]:
+    async with async_session_maker() as session:
+        return _plain(await RiskService(session).get_kill_switch_status())
+
+
+async def update_risk_settings(payload: dict[str, Any]) -> dict[str, Any]:
+    async with async_session_maker() as session:
+        return _plain(await risk_routes.update_settings(risk_routes.RiskUpdate(**payload), session))
+
+
+async def lock_risk(payload: dict[str, Any]) -> dict[str, Any]:
+    async with async_session_maker() as session:
+        return _plain(await risk_routes.lock_settings(session))
+
+
+async def unlock_risk(payload: dict[str, Any]) -> dict[str, Any]:
+    async with async_session_maker() as session:
+        return _plain(await risk_routes.unlock_if_expired(session))
+
+
+async def activate_kill_switch(payload: dict[str, Any]) -> dict[str, Any]:
+    async with async_session_maker() as session:
+        return _plain(await kill_routes.activate(kill_routes.ActionPayload(**payload), session))
+
+
+async def deactivate_kill_switch(payload: dict[str, Any]) -> dict[str, Any]:
+    async with async_session_maker() as session:
+        return _plain(await kill_routes.deactivate(kill_routes.ActionPayload(**payload), session))
+
+
+async def cancel_all_orders(payload: dict[str, Any]) -> Any:
+    async with async_session_maker() as session:
+        return await order_routes.cancel_all(session)
+
+
+READS: dict[str, Callable[..., Awaitable[Any]]] = {
+    "/positions": positions,
+    "/positions/margin": margin,
+    "/orders": orders,
+    "/orders/page": order_page,
+    "/portfolio/summary": portfolio_summary,
+    "/live-data/risk-metrics": risk_metrics,
+    "/live-data/holdings": holdings,
+    "/risk/settings": risk_settings,
+    "/kill/status": kill_status,
+}
+
+WRITES: dict[str, Callable[[dict[str, Any]], Awaitable[Any]]] = {
+    "/risk/settings": update_risk_settings,
+    "/risk/lock": lock_risk,
+    "/risk/unlock": unlock_risk,
+    "/kill/activate": activate_kill_switch,
+    "/kill/deactivate": deactivate_kill_switch,
+    "/orders/cancel_all": cancel_all_orders,
+}
+
+
+async def fetch_json(path: str, params: Optional[dict[str, Any]] = None) -> Any:
+    """Same data as ``GET /api<path>?<params>``, without leaving the process.
+
+    UI reads are low priority: while the loop is lagging they take the cached
+    broker snapshot, as admission control does for the equivalent HTTP reads.
+    """
+    read = READS.get(path)
+    if read is None:
+        raise KeyError(f"No in-process reader for {path}")
+    token = prefer_stale.set(loop_monitor.lag >= get_settings().loop_lag_shed_threshold)
+    try:
+        return await read(**(params or {}))
+    finally:
+        prefer_stale.reset(token)
+
+
+async def post_json(path: str, payload: dict[str, Any]) -> Any:
+    """Same effect as ``POST /api<path>`` with ``payload``, without leaving the process."""
+    write = WRITES.get(path)
+    if write is None:
+        raise KeyError(f"No in-process writer for {path}")
+    return await write(payload)
@@ -1,22 +1,14 @@
 from __future__ import annotations
 
 from nicegui import ui
-import httpx
 import asyncio
 
-API_BASE = "http://localhost:8000/api"
+from app.services.broker_sync_service import holding_key
+from app.ui import live
+from app.ui.api import fetch_json
+from app.ui.keyed_table import KeyedTable
+from app.ui.refresh import refresh_scheduler
 
-async def fetch_json(path: str):
-    async with httpx.AsyncClient(base_url=API_BASE, timeout=5.0) as client:
-        r = await client.get(path)
-        r.raise_for_status()
-        return r.json()
-
-async def post_json(path: str, payload: dict):
-    async with httpx.AsyncClient(base_url=API_BASE, timeout=5.0) as client:
-        r = await client.post(path, json=payload)
-        r.raise_for_status()
-        return r.json()
 
 def _header_nav(active: str, user: str = "Trader") -> None:
     with ui.header().classes('items-center justify-between bg-blue-600 text-white p-4'):
@@ -77,7 +69,7 @@ async def holdings_page() -> None:
         with ui.card().classes('w-full mb-6'):
             ui.label('📋 Holdings Details').classes('text-xl font-bold text-gray-700 mb-4')
             
-            holdings_ui.holdings_container = ui.table(columns=[
+            holdings_ui.holdings_container = KeyedTable(key=holding_key, columns=[
                 {'name': 'tradingSymbol', 'label': 'Symbol', 'field': 'tradingSymbol'},
                 {'name': 'exchangeSegment', 'label': 'Exchange', 'field': 'exchangeSegment'},
                 {'name': 'quantity', 'label': 'Quantity', 'field': 'quantity'},
@@ -86,14 +78,14 @@ async def holdings_page() -> None:
                 {'name': 'totalValue', 'label': 'Total Value', 'field': 'totalValue'},
                 {'name': 'unrealizedProfit', 'label': 'P&L', 'field': 'unrealizedProfit'},
                 {'name': 'returnPercentage', 'label': 'Return %', 'field': 'returnPercentage'}
-            ], rows=[]).classes('w-full')
+            ]).classes('w-full')
         
         # Portfolio Actions
         with ui.card().classes('w-full mb-6'):
             ui.label('⚡ Portfolio Actions').classes('text-xl font-bold text-gray-700 mb-4')
             
             with ui.row().classes('w-full justify-center gap-4'):
-                ui.button('🔄 Refresh Holdings', on_click=lambda: load_holdings(holdings_ui)).classes('bg-blue-500 text-white px-6 py-3')
+                ui.button('🔄 Refresh Holdings', on_click=lambda: refresh_scheduler().run('portfolio', lambda: load_holdings(holdings_ui))).classes('bg-blue-500 text-white px-6 py-3')
                 ui.button('📊 Export Portfolio', on_click=lambda: export_portfolio(holdings_ui)).classes('bg-green-500 text-white px-6 py-3')
                 ui.button('📈 Performance Chart', on_click=lambda: show_performance_chart(holdings_ui)).classes('bg-purple-500 text-white px-6 py-3')
         
@@ -107,8 +99,8 @@ async def holdings_page() -> None:
     # Load initial holdings data
     await load_holdings(holdings_ui)
     
-    # Set up auto-refresh timer
-    ui.timer(10.0, lambda: asyncio.create_task(load_holdings(holdings_ui)))
+    # Refresh when the server-side producer publishes a change
+    live.subscribe('portfolio', lambda _: load_holdings(holdings_ui))
 
 async def load_holdings(holdings_ui):
     """Load holdings from backend"""
@@ -153,8 +145,7 @@ async def load_holdings(holdings_ui):
             total_portfolio_pnl += unrealized_pnl
         
         # Update holdings table
-        holdings_ui.holdings_container.rows = processed_holdings
-        holdings_ui.holdings_container.update()
+        holdings_ui.holdings_container.set_rows(processed_holdings)
         
         # Update portfolio summary
         update_portfolio_summary(processed_holdings, total_portfolio_value, total_portfolio_pnl)
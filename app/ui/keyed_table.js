@@ -0,0 +1,33 @@
+// q-table whose rows are patched in place from server-side diffs.
+// The server sends {upserts, removed, order?} instead of re-sending every row.
+export default {
+  template: `<q-table v-bind="$attrs" :columns="columns" :rows="current" :row-key="rowKey"></q-table>`,
+  props: {
+    columns: Array,
+    rows: Array,
+    rowKey: String,
+  },
+  data() {
+    return { current: this.rows || [] };
+  },
+  watch: {
+    // Full props re-send (initial render, reconnect): take the server's rows as they are
+    rows(value) {
+      this.current = value || [];
+    },
+  },
+  methods: {
+    apply(diff) {
+      const byKey = new Map(this.current.map((row) => [row[this.rowKey], row]));
+      for (const key of diff.removed) byKey.delete(key);
+      const added = [];
+      for (const row of diff.upserts) {
+        const key = row[this.rowKey];
+        if (!byKey.has(key)) added.push(key);
+        byKey.set(key, row);
+      }
+      const order = diff.order || this.current.map((row) => row[this.rowKey]).filter((key) => byKey.has(key)).concat(added);
+      this.current = order.map((key) => byKey.get(key));
+    },
+  },
+};
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Optional
+
+from nicegui.element import Element
+
+
+KEY = "__key"
+
+KeyFn = Callable[[dict[str, Any]], Optional[str]]
+
+
+def keyed_rows(rows: Iterable[dict[str, Any]], key: KeyFn) -> list[dict[str, Any]]:
+    """Rows tagged with their table key; rows without a natural key are keyed by position.
+
+    A key seen again gets an occurrence suffix (``key#2``, ...) so duplicate
+    rows stay separate rows instead of collapsing into one in the browser.
+    """
+    keyed = []
+    seen: dict[str, int] = {}
+    for index, row in enumerate(rows):
+        row_key = key(row)
+        if row_key is None:
+            row_key = f"#{index}"
+        count = seen[row_key] = seen.get(row_key, 0) + 1
+        keyed.append({**row, KEY: row_key if count == 1 else f"{row_key}#{count}"})
+    return keyed
+
+
+def row_diff(old: list[dict[str, Any]], new: list[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    """Inserts/updates, deletes and (only if it changed) the new key order; None when nothing changed.
+
+    Both lists must already be keyed (see ``keyed_rows``). Applying the diff to
+    ``old`` in the browser: drop ``removed``, replace or append ``upserts``,
+    then reorder by ``order`` when present.
+    """
+    old_by_key = {row[KEY]: row for row in old}
+    new_keys = [row[KEY] for row in new]
+    new_key_set = set(new_keys)
+    upserts = [row for row in new if old_by_key.get(row[KEY]) != row]
+    removed = [key for key in old_by_key if key not in new_key_set]
+    # Order the browser ends up with if we send no order: survivors, then inserts
+    implied = [row[KEY] for row in old if row[KEY] in new_key_set]
+    implied += [row[KEY] for row in upserts if row[KEY] not in old_by_key]
+    if not upserts and not removed and implied == new_keys:
+        return None
+    diff: dict[str, Any] = {"upserts": upserts, "removed": removed}
+    if implied != new_keys:
+        diff["order"] = new_keys
+    return diff
+
+
+class KeyedTable(Element, component="keyed_table.js"):
+    """Table that sends row-level diffs to the browser instead of every row on each refresh.
+
+    Rows are keyed by ``key`` (e.g. ``order_key``); ``set_rows`` diffs against
+    what the browser already shows and sends only inserts, updates and
+    deletes. The full rows stay in the element's props and are re-sent after
+    every socket handshake: diffs sent while the socket was down went nowhere,
+    and a reconnect does not re-render the page by itself.
+    """
+
+    def __init__(self, columns: list[dict[str, Any]], key: KeyFn, rows: Iterable[dict[str, Any]] = ()) -> None:
+        super().__init__()
+        self.key = key
+        self._props["columns"] = columns
+        self._props["rowKey"] = KEY
+        self._props["rows"] = keyed_rows(rows, key)
+        self._props["pagination"] = {"rowsPerPage": 0}
+        self.client.on_connect(self.update)
+
+    @property
+    def rows(self) -> list[dict[str, Any]]:
+        return self._props["rows"]
+
+    def set_rows(self, rows: Iterable[dict[str, Any]]) -> None:
+        new = keyed_rows(rows, self.key)
+        diff = row_diff(self._props["rows"], new)
+        self._props["rows"] = new
+        if diff is None:
+            return
+        if self.client.has_socket_connection:
+            self.run_method("apply", diff)
+        else:
+            # Page still being built: the rows go out with the initial render
+            self.update()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Optional
+
+from app.services.push_hub import push_hub
+from app.ui.refresh import refresh_scheduler
+
+
+# Pages subscribe to push hub topics instead of running their own ui.timer
+# polls: one server-side producer per topic refreshes the data and every open
+# tab renders the same result, so backend load does not grow with tab count.
+
+
+def subscribe(topic: str, handler: Callable[[Any], Any], key: Optional[str] = None) -> None:
+    """Call ``handler(data)`` for the current page with the latest ``topic`` state and on every change.
+
+    ``handler`` may be sync or async. Renders go through the page's
+    RefreshScheduler under ``key`` (default: the topic): updates arriving
+    mid-render are conflated to the latest, hidden tabs catch up when shown,
+    and the subscription ends when the client disconnects.
+    """
+    scheduler = refresh_scheduler()
+    key = key or topic
+
+    def listener(data: Any) -> None:
+        if scheduler.closed:
+            unlisten()
+            return
+        scheduler.run(key, lambda: handler(data))
+
+    unlisten = push_hub.listen(topic, listener)
+    scheduler.client.on_disconnect(unlisten)
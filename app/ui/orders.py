@@ -1,34 +1,35 @@
 from __future__ import annotations
 
 from nicegui import ui
-import httpx
 import asyncio
 
-API_BASE = "http://localhost:8000/api"
+from app.services.broker_sync_service import order_key
+from app.ui import live
+from app.ui.api import fetch_json, post_json
+from app.ui.keyed_table import KeyedTable
+from app.ui.refresh import refresh_scheduler
 
-async def fetch_json(path: str):
-    async with httpx.AsyncClient(base_url=API_BASE, timeout=5.0) as client:
-        r = await client.get(path)
-        r.raise_for_status()
-        return r.json()
 
-async def post_json(path: str, payload: dict):
-    async with httpx.AsyncClient(base_url=API_BASE, timeout=5.0) as client:
-        r = await client.post(path, json=payload)
-        r.raise_for_status()
-        return r.json()
+ORDER_STATUSES = ['PENDING', 'TRANSIT', 'PART_TRADED', 'TRADED', 'REJECTED', 'CANCELLED', 'EXPIRED']
+SORT_OPTIONS = {
+    'createTime': 'Time',
+    'updateTime': 'Last update',
+    'tradingSymbol': 'Symbol',
+    'orderStatus': 'Status',
+    'quantity': 'Quantity',
+    'price': 'Price',
+}
+
 
 def _header_nav(active: str, user: str = "Trader") -> None:
     with ui.header().classes('items-center justify-between bg-blue-600 text-white p-4'):
         ui.label('🚀 SimpleApp Trading Middleware').classes('text-xl font-bold')
         with ui.row().classes('items-center gap-4'):
+            # Only the pages registered by app.ui.dashboard.create_ui
             ui.link('📊 Dashboard', '/').classes('text-white hover:text-blue-200' if active == 'dashboard' else 'text-blue-200')
-            ui.link('⚙️ Settings', '/settings').classes('text-white hover:text-blue-200' if active == 'settings' else 'text-blue-200')
-            ui.link('⚠️ Risk', '/risk').classes('text-white hover:text-blue-200' if active == 'risk' else 'text-blue-200')
-            ui.link('📈 Trading', '/trading').classes('text-white hover:text-blue-200' if active == 'trading' else 'text-blue-200')
             ui.link('💼 Positions', '/positions').classes('text-white hover:text-blue-200' if active == 'positions' else 'text-blue-200')
             ui.link('📋 Orders', '/orders').classes('text-white hover:text-blue-200' if active == 'orders' else 'text-blue-200')
-            ui.link('🏦 Holdings', '/holdings').classes('text-white hover:text-blue-200' if active == 'holdings' else 'text-blue-200')
+            ui.link('⚠️ Risk', '/risk').classes('text-white hover:text-blue-200' if active == 'risk' else 'text-blue-200')
             ui.label(f'👤 {user}').classes('text-sm text-blue-200')
 
 @ui.page('/orders')
@@ -41,6 +42,15 @@ async def orders_page() -> None:
     class OrdersUI:
         def __init__(self):
             self.orders_container = None
+            self.page_label = None
+            self.total_orders_label = None
+            self.pending_orders_label = None
+            self.completed_orders_label = None
+            self.rejected_orders_label = None
+            # Server-side paging: only the visible page is sent to the browser
+            self.filters = {'sort': 'createTime', 'descending': True}
+            self.offset = 0
+            self.limit = 50
     
     orders_ui = OrdersUI()
     
@@ -56,28 +66,42 @@ async def orders_page() -> None:
                 # Total Orders
                 with ui.column().classes('text-center'):
                     total_orders_icon = ui.icon('receipt').classes('text-4xl text-blue-500')
-                    total_orders_label = ui.label('Total Orders: 0').classes('text-lg font-bold')
+                    orders_ui.total_orders_label = ui.label('Total Orders: 0').classes('text-lg font-bold')
                 
                 # Pending Orders
                 with ui.column().classes('text-center'):
                     pending_orders_icon = ui.icon('schedule').classes('text-4xl text-orange-500')
-                    pending_orders_label = ui.label('Pending: 0').classes('text-lg font-bold')
+                    orders_ui.pending_orders_label = ui.label('Pending: 0').classes('text-lg font-bold')
                 
                 # Completed Orders
                 with ui.column().classes('text-center'):
                     completed_orders_icon = ui.icon('check_circle').classes('text-4xl text-green-500')
-                    completed_orders_label = ui.label('Completed: 0').classes('text-lg font-bold')
+                    orders_ui.completed_orders_label = ui.label('Completed: 0').classes('text-lg font-bold')
                 
                 # Rejected Orders
                 with ui.column().classes('text-center'):
                     rejected_orders_icon = ui.icon('cancel').classes('text-4xl text-red-500')
-                    rejected_orders_label = ui.label('Rejected: 0').classes('text-lg font-bold')
+                    orders_ui.rejected_orders_label = ui.label('Rejected: 0').classes('text-lg font-bold')
         
         # Orders Table
         with ui.card().classes('w-full mb-6'):
             ui.label('📋 Order Details').classes('text-xl font-bold text-gray-700 mb-4')
             
-            orders_ui.orders_container = ui.table(columns=[
+            with ui.row().classes('w-full items-center gap-4 mb-4'):
+                ui.select(ORDER_STATUSES, label='Status', multiple=True, clearable=True,
+                          on_change=lambda e: set_filter(orders_ui, 'status', ','.join(e.value or []))).classes('w-64')
+                ui.input('Symbol', on_change=lambda e: set_filter(orders_ui, 'symbol', e.value)).classes('w-40')
+                # Native date-time pickers; the book's createTime is exchange local time
+                ui.input('From', on_change=lambda e: set_filter(orders_ui, 'time_from', book_time(e.value))).props('type=datetime-local stack-label').classes('w-56')
+                ui.input('To', on_change=lambda e: set_filter(orders_ui, 'time_to', book_time(e.value, end=True))).props('type=datetime-local stack-label').classes('w-56')
+                ui.select({'': 'Any side', 'BUY': 'Buy', 'SELL': 'Sell'}, value='', label='Side',
+                          on_change=lambda e: set_filter(orders_ui, 'side', e.value)).classes('w-32')
+                ui.select(SORT_OPTIONS, value='createTime', label='Sort by',
+                          on_change=lambda e: set_filter(orders_ui, 'sort', e.value)).classes('w-40')
+                ui.switch('Newest first', value=True,
+                          on_change=lambda e: set_filter(orders_ui, 'descending', e.value))
+            
+            orders_ui.orders_container = KeyedTable(key=order_key, columns=[
                 {'name': 'orderId', 'label': 'Order ID', 'field': 'orderId'},
                 {'name': 'tradingSymbol', 'label': 'Symbol', 'field': 'tradingSymbol'},
                 {'name': 'transactionType', 'label': 'Side', 'field': 'transactionType'},
@@ -86,37 +110,72 @@ async def orders_page() -> None:
                 {'name': 'price', 'label': 'Price', 'field': 'price'},
                 {'name': 'time', 'label': 'Time', 'field': 'time'},
                 {'name': 'actions', 'label': 'Actions', 'field': 'actions'}
-            ], rows=[]).classes('w-full')
+            ]).classes('w-full')
+            
+            with ui.row().classes('w-full justify-center items-center gap-4 mt-4'):
+                ui.button('◀ Prev', on_click=lambda: change_page(orders_ui, -1)).classes('bg-gray-500 text-white px-4 py-2')
+                orders_ui.page_label = ui.label('No orders').classes('text-sm text-gray-600')
+                ui.button('Next ▶', on_click=lambda: change_page(orders_ui, 1)).classes('bg-gray-500 text-white px-4 py-2')
         
         # Order Actions
         with ui.card().classes('w-full mb-6'):
             ui.label('⚡ Order Actions').classes('text-xl font-bold text-gray-700 mb-4')
             
             with ui.row().classes('w-full justify-center gap-4'):
-                ui.button('🔄 Refresh Orders', on_click=lambda: load_orders(orders_ui)).classes('bg-blue-500 text-white px-6 py-3')
+                ui.button('🔄 Refresh Orders', on_click=lambda: refresh_scheduler().run('orders', lambda: load_orders(orders_ui))).classes('bg-blue-500 text-white px-6 py-3')
                 ui.button('❌ Cancel All Orders', on_click=lambda: cancel_all_orders(orders_ui)).classes('bg-red-500 text-white px-6 py-3')
                 ui.button('📊 Export Orders', on_click=lambda: export_orders(orders_ui)).classes('bg-green-500 text-white px-6 py-3')
         
         # Navigation Links
         with ui.row().classes('w-full justify-center gap-4 mt-6'):
             ui.button('📊 Dashboard', on_click=lambda: ui.navigate.to('/')).classes('bg-blue-500 text-white px-4 py-2')
-            ui.button('📈 Trading', on_click=lambda: ui.navigate.to('/trading')).classes('bg-green-500 text-white px-4 py-2')
             ui.button('💼 Positions', on_click=lambda: ui.navigate.to('/positions')).classes('bg-purple-500 text-white px-4 py-2')
             ui.button('⚠️ Risk', on_click=lambda: ui.navigate.to('/risk')).classes('bg-red-500 text-white px-4 py-2')
     
     # Load initial orders data
     await load_orders(orders_ui)
     
-    # Set up auto-refresh timer
-    ui.timer(5.0, lambda: asyncio.create_task(load_orders(orders_ui)))
+    # Refresh when the server-side producer publishes a change
+    live.subscribe('orders', lambda _: load_orders(orders_ui))
+
+def book_time(value, end=False):
+    """``2024-09-16T09:15`` from a datetime-local input -> ``2024-09-16 09:15:00`` as in createTime.
+
+    ``end`` makes the bound inclusive of the whole minute.
+    """
+    if not value:
+        return None
+    value = value.replace('T', ' ')
+    if len(value) == 16:
+        value += ':59' if end else ':00'
+    return value
+
+async def set_filter(orders_ui, name, value):
+    """Apply a filter or sort change and go back to the first page"""
+    if value in (None, ''):
+        orders_ui.filters.pop(name, None)
+    else:
+        orders_ui.filters[name] = value
+    orders_ui.offset = 0
+    await load_orders(orders_ui)
+
+async def change_page(orders_ui, step):
+    """Move one page forward or back"""
+    orders_ui.offset = max(0, orders_ui.offset + step * orders_ui.limit)
+    await load_orders(orders_ui)
 
 async def load_orders(orders_ui):
-    """Load orders from backend"""
+    """Load the visible page of orders from backend"""
     try:
-        # Get orders from backend
-        orders = await fetch_json('/orders')
+        # Filtering, sorting and paging happen server-side over the indexed book
+        page = await fetch_json('/orders/page', {**orders_ui.filters, 'offset': orders_ui.offset, 'limit': orders_ui.limit})
+        if page['offset'] and page['offset'] >= page['total']:
+            # The book shrank under the current page
+            orders_ui.offset = max(0, (page['total'] - 1) // orders_ui.limit * orders_ui.limit)
+            page = await fetch_json('/orders/page', {**orders_ui.filters, 'offset': orders_ui.offset, 'limit': orders_ui.limit})
+        orders = page['rows']
         
-        # Process orders to add action buttons
+        # Process orders to add action buttons (visible page only)
         processed_orders = []
         for order in orders:
             # Create action buttons for each order
@@ -127,11 +186,14 @@ async def load_orders(orders_ui):
             processed_orders.append(processed_order)
         
         # Update orders table
-        orders_ui.orders_container.rows = processed_orders
-        orders_ui.orders_container.update()
+        orders_ui.orders_container.set_rows(processed_orders)
+        if page['total']:
+            orders_ui.page_label.text = f"{page['offset'] + 1}–{page['offset'] + len(orders)} of {page['total']}"
+        else:
+            orders_ui.page_label.text = 'No orders'
         
         # Update statistics
-        update_order_statistics(orders)
+        update_order_statistics(orders_ui, page['status_counts'])
         
     except Exception as e:
         ui.notify(f'❌ Error loading orders: {str(e)}', type='negative')
@@ -144,11 +206,11 @@ def create_order_actions(order):
     actions = []
     
     # Cancel button for pending orders
-    if status in ['PENDING', 'PARTIALLY_FILLED']:
+    if status in ['PENDING', 'TRANSIT', 'PART_TRADED']:
         actions.append(f'<button onclick="cancelOrder(\'{order_id}\')" class="bg-red-500 text-white px-2 py-1 rounded text-sm">Cancel</button>')
     
     # Modify button for pending orders
-    if status in ['PENDING', 'PARTIALLY_FILLED']:
+    if status in ['PENDING', 'TRANSIT', 'PART_TRADED']:
         actions.append(f'<button onclick="modifyOrder(\'{order_id}\')" class="bg-blue-500 text-white px-2 py-1 rounded text-sm">Modify</button>')
     
     # View details button for all orders
@@ -156,16 +218,18 @@ def create_order_actions(order):
     
     return ' '.join(actions)
 
-def update_order_statistics(orders):
-    """Update order statistics display"""
+def update_order_statistics(orders_ui, status_counts):
+    """Update order statistics display from per-status counts of the whole book"""
     try:
-        total_orders = len(orders)
-        pending_orders = len([o for o in orders if o.get('orderStatus') in ['PENDING', 'PARTIALLY_FILLED']])
-        completed_orders = len([o for o in orders if o.get('orderStatus') == 'COMPLETED'])
-        rejected_orders = len([o for o in orders if o.get('orderStatus') == 'REJECTED'])
+        total_orders = sum(status_counts.values())
+        pending_orders = sum(status_counts.get(s, 0) for s in ['PENDING', 'TRANSIT', 'PART_TRADED'])
+        completed_orders = status_counts.get('TRADED', 0)
+        rejected_orders = status_counts.get('REJECTED', 0)
         
-        # Update statistics labels (these would be global variables in a real implementation)
-        # For now, we'll use a simple approach
+        orders_ui.total_orders_label.text = f'Total Orders: {total_orders}'
+        orders_ui.pending_orders_label.text = f'Pending: {pending_orders}'
+        orders_ui.completed_orders_label.text = f'Completed: {completed_orders}'
+        orders_ui.rejected_orders_label.text = f'Rejected: {rejected_orders}'
         
     except Exception as e:
         ui.notify(f'❌ Error updating order statistics: {str(e)}', type='negative')
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Optional
+
+from nicegui import Client, context, ui
+
+from app.core.logging import logger
+from app.core.metrics import UI_REFRESH_TASKS
+
+
+Refresh = Callable[[], Any]
+
+# Reports document visibility to the page's RefreshScheduler
+_VISIBILITY_JS = """
+<script>
+document.addEventListener('visibilitychange', () => emitEvent('page_visibility', document.visibilityState === 'visible'));
+</script>
+"""
+
+
+class RefreshScheduler:
+    """Runs a page's refreshes for one client.
+
+    At most one refresh per key (widget) is in flight; a request arriving
+    meanwhile replaces any earlier queued one and runs when the current one
+    finishes. While the tab is hidden or the socket is down, requests are only
+    queued and run once it is back. Everything is cancelled when the client
+    is gone for good (reconnect timeout expired) or is pruned.
+    """
+
+    def __init__(self, client: Client) -> None:
+        self.client = client
+        self.visible = True
+        self.closed = False
+        self._handshaken = False
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._pending: dict[str, Refresh] = {}
+        self._timers: list[asyncio.Task] = []
+
+    @property
+    def connected(self) -> bool:
+        # has_socket_connection stays True once a socket has connected in NiceGUI 1.4;
+        # a pending disconnect task marks the reconnect grace period after a drop
+        return self._handshaken and getattr(self.client, "_disconnect_task", None) is None
+
+    @property
+    def active(self) -> bool:
+        return self.visible and self.connected
+
+    def on_connect(self) -> None:
+        self._handshaken = True
+        self.flush()
+
+    def _pruned(self) -> bool:
+        if self.client.id in Client.instances:
+            return False
+        # Pruned without a disconnect (socket never connected)
+        self.close()
+        return True
+
+    def _count(self) -> None:
+        UI_REFRESH_TASKS.labels(client=self.client.id).set(len(self._tasks))
+
+    def run(self, key: str, refresh: Refresh) -> None:
+        """Run ``refresh()`` (sync or async) for ``key`` now, or after the one in flight."""
+        if self.closed or self._pruned():
+            return
+        if key in self._tasks or not self.active:
+            self._pending[key] = refresh
+            return
+        self._tasks[key] = asyncio.create_task(self._run(key, refresh), name=f"ui-refresh:{key}")
+        self._count()
+
+    async def _run(self, key: str, refresh: Refresh) -> None:
+        try:
+            with self.client:
+                result = refresh()
+                if asyncio.iscoroutine(result):
+                    await result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("ui_refresh_error", key=key, error=str(e))
+        finally:
+            self._tasks.pop(key, None)
+            if not self.closed:
+                self._count()
+        if self.active and key in self._pending:
+            self.run(key, self._pending.pop(key))
+
+    def every(self, interval: float, key: str, refresh: Refresh) -> None:
+        """Replacement for ``ui.timer``: skips ticks while hidden or while the previous run is in flight."""
+        async def loop() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                if self._pruned():
+                    return
+                if self.active and key not in self._tasks:
+                    self.run(key, refresh)
+
+        if not self.closed:
+            self._timers.append(asyncio.create_task(loop(), name=f"ui-timer:{key}"))
+
+    def flush(self) -> None:
+        """Run what was queued while the page was hidden or disconnected."""
+        if not self.active:
+            return
+        pending = [(k, r) for k, r in self._pending.items() if k not in self._tasks]
+        for key, refresh in pending:
+            del self._pending[key]
+            self.run(key, refresh)
+
+    def set_visible(self, visible: bool) -> None:
+        self.visible = visible
+        self.flush()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for task in [*self._tasks.values(), *self._timers]:
+            task.cancel()
+        self._tasks.clear()
+        self._timers.clear()
+        self._pending.clear()
+        _schedulers.pop(self.client.id, None)
+        try:
+            UI_REFRESH_TASKS.remove(self.client.id)
+        except KeyError:
+            pass
+
+
+_schedulers: dict[str, RefreshScheduler] = {}
+
+
+def refresh_scheduler(client: Optional[Client] = None) -> RefreshScheduler:
+    """The scheduler of ``client`` (default: the current page's), created on first use."""
+    client = client or context.get_client()
+    scheduler = _schedulers.get(client.id)
+    if scheduler is None:
+        scheduler = _schedulers[client.id] = RefreshScheduler(client)
+        with client:
+            ui.add_body_html(_VISIBILITY_JS)
+            ui.on('page_visibility', lambda e: scheduler.set_visible(bool(e.args)))
+        client.on_connect(scheduler.on_connect)
+        # Disconnect handlers run only after reconnect_timeout, i.e. the final disconnect
+        client.on_disconnect(scheduler.close)
+    return scheduler
@@ -1,22 +1,11 @@
 from __future__ import annotations
 
 from nicegui import ui
-import httpx
-import asyncio
 
-API_BASE = "http://localhost:8000/api"
+from app.ui import live
+from app.ui.api import fetch_json, post_json
+from app.ui.refresh import refresh_scheduler
 
-async def fetch_json(path: str):
-    async with httpx.AsyncClient(base_url=API_BASE, timeout=5.0) as client:
-        r = await client.get(path)
-        r.raise_for_status()
-        return r.json()
-
-async def post_json(path: str, payload: dict):
-    async with httpx.AsyncClient(base_url=API_BASE, timeout=5.0) as client:
-        r = await client.post(path, json=payload)
-        r.raise_for_status()
-        return r.json()
 
 def _header_nav(active: str, user: str = "Trader") -> None:
     with ui.header().classes('items-center justify-between bg-blue-600 text-white p-4'):
@@ -111,7 +100,7 @@ async def risk_page() -> None:
             with ui.row().classes('w-full justify-center gap-4'):
                 ui.button('🚨 ACTIVATE KILL SWITCH', on_click=lambda: activate_emergency_stop(risk_ui)).classes('bg-red-600 text-white px-6 py-3 text-lg font-bold')
                 ui.button('🔓 DEACTIVATE KILL SWITCH', on_click=lambda: deactivate_emergency_stop(risk_ui)).classes('bg-green-600 text-white px-6 py-3 text-lg font-bold')
-                ui.button('📊 Refresh Risk Data', on_click=lambda: load_risk_data(risk_ui)).classes('bg-blue-500 text-white px-6 py-3')
+                ui.button('📊 Refresh Risk Data', on_click=lambda: refresh_scheduler().run('risk', lambda: load_risk_data(risk_ui))).classes('bg-blue-500 text-white px-6 py-3')
         
         # Navigation Links
         with ui.row().classes('w-full justify-center gap-4 mt-6'):
@@ -123,8 +112,8 @@ async def risk_page() -> None:
     # Load initial risk data
     await load_risk_data(risk_ui)
     
-    # Set up auto-refresh timer
-    ui.timer(3.0, lambda: asyncio.create_task(load_risk_data(risk_ui)))
+    # Refresh when the server-side producer publishes a change
+    live.subscribe('risk', lambda _: load_risk_data(risk_ui))
 
 async def load_risk_data(risk_ui):
     """Load risk management data"""
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from nicegui import ui
+
+from app.core.config import get_settings
+from app.core.logging import logger
+
+
+def _age(seconds: float) -> str:
+    if seconds < 60:
+        return f"{int(seconds)}s"
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m"
+    return f"{int(seconds // 3600)}h"
+
+
+class Section:
+    """One independently loaded part of a page.
+
+    ``refresh`` fetches with its own timeout and renders as soon as its data
+    arrives, without waiting for other sections. When a fetch fails or times
+    out the last good data stays on screen and the section's badge shows how
+    old it is.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Any]],
+        render: Callable[[Any], None],
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.name = name
+        self.fetch = fetch
+        self.render = render
+        self.timeout = timeout if timeout is not None else get_settings().ui_section_timeout
+        self.loaded_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.badge = ui.badge('loading…', color='grey').classes('ml-2')
+        with self.badge:
+            self._tooltip = ui.tooltip('')
+
+    @property
+    def stale(self) -> bool:
+        return self.error is not None
+
+    async def refresh(self) -> None:
+        try:
+            data = await asyncio.wait_for(self.fetch(), self.timeout)
+            self.render(data)
+        except Exception as e:
+            self.error = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e) or type(e).__name__
+            logger.warning("ui_section_failed", section=self.name, error=self.error)
+        else:
+            self.error = None
+            self.loaded_at = time.monotonic()
+        self.update_badge()
+
+    def update_badge(self) -> None:
+        if self.error is None:
+            self.badge.set_visibility(False)
+            return
+        if self.loaded_at is None:
+            self.badge.set_text('unavailable')
+        else:
+            self.badge.set_text(f'stale · {_age(time.monotonic() - self.loaded_at)}')
+        self.badge.props('color=orange' if self.loaded_at is not None else 'color=red')
+        self._tooltip.set_text(self.error)
+        self.badge.set_visibility(True)
+
+
+def shared_fetch(fetch: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+    """Wrap ``fetch`` so sections refreshed together share one in-flight call.
+
+    Each caller keeps its own timeout: a caller giving up does not cancel the
+    call the other sections are still waiting on.
+    """
+    inflight: Optional[asyncio.Future] = None
+
+    def _done(task: asyncio.Future) -> None:
+        nonlocal inflight
+        if inflight is task:
+            inflight = None
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller timed out
+
+    async def run() -> Any:
+        nonlocal inflight
+        task = inflight
+        if task is None:
+            task = inflight = asyncio.ensure_future(fetch())
+            task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    return run
+
+
+async def refresh_all(sections: Iterable[Section]) -> None:
+    """Refresh sections concurrently; each renders on arrival and failures stay contained."""
+    await asyncio.gather(*(section.refresh() for section in sections))
+
+
+def tick_badges(sections: Iterable[Section]) -> None:
+    """Keep stale ages current between refreshes (display only, no backend calls)."""
+    for section in sections:
+        if section.stale:
+            section.update_badge()
@@ -1,21 +1,9 @@
 from __future__ import annotations
 
 from nicegui import ui
-import httpx
 
-API_BASE = "http://localhost:8000/api"
+from app.ui.api import fetch_json, post_json
 
-async def fetch_json(path: str):
-    async with httpx.AsyncClient(base_url=API_BASE, timeout=5.0) as client:
-        r = await client.get(path)
-        r.raise_for_status()
-        return r.json()
-
-async def post_json(path: str, payload: dict):
-    async with httpx.AsyncClient(base_url=API_BASE, timeout=5.0) as client:
-        r = await client.post(path, json=payload)
-        r.raise_for_status()
-        return r.json()
 
 def _header_nav(active: str, user: str = "Trader") -> None:
     with ui.header().classes('items-center justify-between bg-blue-600 text-white p-4'):
@@ -120,94 +108,59 @@ async def save_risk_settings(settings_ui):
             'max_daily_total_profit_target': float(settings_ui.total_profit_target.value or 0)
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f'{API_BASE}/risk/settings',
-                json=settings_data,
-                headers={'Authorization': 'Bearer dhan_test_token_123'}
-            )
-            
-            if response.status_code == 200:
-                ui.notify('✅ Settings saved successfully!', type='positive')
-                await load_current_settings(settings_ui)  # Refresh display
-            else:
-                ui.notify(f'❌ Failed to save settings: {response.text}', type='negative')
-                
+        await post_json('/risk/settings', settings_data)
+        ui.notify('✅ Settings saved successfully!', type='positive')
+        await load_current_settings(settings_ui)  # Refresh display
+
     except Exception as e:
         ui.notify(f'❌ Error saving settings: {str(e)}', type='negative')
 
 async def lock_risk_settings(settings_ui):
     """Lock risk settings"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f'{API_BASE}/risk/lock',
-                headers={'Authorization': 'Bearer dhan_test_token_123'}
-            )
-            
-            if response.status_code == 200:
-                ui.notify('🔒 Settings locked successfully!', type='positive')
-                await load_current_settings(settings_ui)
-            else:
-                ui.notify(f'❌ Failed to lock settings: {response.text}', type='negative')
-                
+        await post_json('/risk/lock', {})
+        ui.notify('🔒 Settings locked successfully!', type='positive')
+        await load_current_settings(settings_ui)
+
     except Exception as e:
         ui.notify(f'❌ Error locking settings: {str(e)}', type='negative')
 
 async def unlock_risk_settings(settings_ui):
     """Unlock risk settings"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f'{API_BASE}/risk/unlock',
-                headers={'Authorization': 'Bearer dhan_test_token_123'}
-            )
-            
-            if response.status_code == 200:
-                ui.notify('🔓 Settings unlocked successfully!', type='positive')
-                await load_current_settings(settings_ui)
-            else:
-                ui.notify(f'❌ Failed to unlock settings: {response.text}', type='negative')
-                
+        await post_json('/risk/unlock', {})
+        ui.notify('🔓 Settings unlocked successfully!', type='positive')
+        await load_current_settings(settings_ui)
+
     except Exception as e:
         ui.notify(f'❌ Error unlocking settings: {str(e)}', type='negative')
 
 async def load_current_settings(settings_ui):
     """Load current settings from backend"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f'{API_BASE}/risk/settings',
-                headers={'Authorization': 'Bearer dhan_test_token_123'}
-            )
-            
-            if response.status_code == 200:
-                settings = response.json()
-                
-                # Update input fields
-                settings_ui.max_daily_loss.value = settings.get('max_daily_total_loss', 500.0)
-                settings_ui.max_position_loss.value = settings.get('max_daily_loss_per_position', 100.0)
-                settings_ui.position_profit_target.value = settings.get('per_position_daily_profit_target', 200.0)
-                settings_ui.total_profit_target.value = settings.get('max_daily_total_profit_target', 1000.0)
-                
-                # Update display
-                settings_ui.daily_loss_display.text = f'Max Daily Total: ₹{settings.get("max_daily_total_loss", 500.0):.2f}'
-                settings_ui.position_loss_display.text = f'Max Position: ₹{settings.get("max_daily_loss_per_position", 100.0):.2f}'
-                settings_ui.profit_target_display.text = f'Position Target: ₹{settings.get("per_position_daily_profit_target", 200.0):.2f}'
-                settings_ui.total_profit_display.text = f'Total Target: ₹{settings.get("max_daily_total_profit_target", 1000.0):.2f}'
-                
-                # Update status
-                is_locked = settings.get('risk_locked', False)
-                if is_locked:
-                    settings_ui.status_display.text = 'Status: 🔒 LOCKED'
-                    settings_ui.status_display.classes('text-lg font-bold text-red-600')
-                else:
-                    settings_ui.status_display.text = 'Status: 🔓 UNLOCKED'
-                    settings_ui.status_display.classes('text-lg font-bold text-green-600')
-                    
-            else:
-                ui.notify(f'❌ Failed to load settings: {response.text}', type='negative')
-                
+        settings = await fetch_json('/risk/settings')
+        
+        # Update input fields
+        settings_ui.max_daily_loss.value = settings.get('max_daily_total_loss', 500.0)
+        settings_ui.max_position_loss.value = settings.get('max_daily_loss_per_position', 100.0)
+        settings_ui.position_profit_target.value = settings.get('per_position_daily_profit_target', 200.0)
+        settings_ui.total_profit_target.value = settings.get('max_daily_total_profit_target', 1000.0)
+        
+        # Update display
+        settings_ui.daily_loss_display.text = f'Max Daily Total: ₹{settings.get("max_daily_total_loss", 500.0):.2f}'
+        settings_ui.position_loss_display.text = f'Max Position: ₹{settings.get("max_daily_loss_per_position", 100.0):.2f}'
+        settings_ui.profit_target_display.text = f'Position Target: ₹{settings.get("per_position_daily_profit_target", 200.0):.2f}'
+        settings_ui.total_profit_display.text = f'Total Target: ₹{settings.get("max_daily_total_profit_target", 1000.0):.2f}'
+        
+        # Update status
+        is_locked = settings.get('risk_locked', False)
+        if is_locked:
+            settings_ui.status_display.text = 'Status: 🔒 LOCKED'
+            settings_ui.status_display.classes('text-lg font-bold text-red-600')
+        else:
+            settings_ui.status_display.text = 'Status: 🔓 UNLOCKED'
+            settings_ui.status_display.classes('text-lg font-bold text-green-600')
+
     except Exception as e:
         ui.notify(f'❌ Error loading settings: {str(e)}', type='negative')
 
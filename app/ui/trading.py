@@ -1,22 +1,12 @@
 from __future__ import annotations
 
 from nicegui import ui
-import httpx
 import asyncio
 
-API_BASE = "http://localhost:8000/api"
+from app.ui import live
+from app.ui.api import fetch_json
+from app.ui.refresh import refresh_scheduler
 
-async def fetch_json(path: str):
-    async with httpx.AsyncClient(base_url=API_BASE, timeout=5.0) as client:
-        r = await client.get(path)
-        r.raise_for_status()
-        return r.json()
-
-async def post_json(path: str, payload: dict):
-    async with httpx.AsyncClient(base_url=API_BASE, timeout=5.0) as client:
-        r = await client.post(path, json=payload)
-        r.raise_for_status()
-        return r.json()
 
 def _header_nav(active: str, user: str = "Trader") -> None:
     with ui.header().classes('items-center justify-between bg-blue-600 text-white p-4'):
@@ -112,7 +102,7 @@ async def trading_page() -> None:
             ], rows=[]).classes('w-full')
             
             with ui.row().classes('w-full justify-center mt-4'):
-                ui.button('🔄 Refresh Orders', on_click=lambda: load_recent_orders(trading_ui)).classes('bg-blue-500 text-white px-4 py-2')
+                ui.button('🔄 Refresh Orders', on_click=lambda: refresh_scheduler().run('orders', lambda: load_recent_orders(trading_ui))).classes('bg-blue-500 text-white px-4 py-2')
         
         # Navigation Links
         with ui.row().classes('w-full justify-center gap-4 mt-6'):
@@ -125,8 +115,8 @@ async def trading_page() -> None:
     # Load initial data
     await load_recent_orders(trading_ui)
     
-    # Set up auto-refresh timer
-    ui.timer(10.0, lambda: asyncio.create_task(load_recent_orders(trading_ui)))
+    # Refresh when the server-side producer publishes a change
+    live.subscribe('orders', lambda _: load_recent_orders(trading_ui))
 
 async def search_symbol(trading_ui):
     """Search for a trading symbol"""
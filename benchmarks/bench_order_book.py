@@ -0,0 +1,90 @@
+"""Page-fetch latency for the order book page view on a large book.
+
+Compares ``OrderBookIndex.query`` (dictionary-encoded filter columns, cached
+sort permutations) with a plain Python filter + sort + slice over the rows,
+and the bytes a page costs versus shipping the whole book.
+
+    python -m benchmarks.bench_order_book [orders]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+import orjson
+
+from app.services.order_book import OrderBookIndex
+from app.services.snapshot_cache import build_snapshot
+
+
+STATUSES = ["PENDING", "TRANSIT", "PART_TRADED", "TRADED", "REJECTED", "CANCELLED"]
+
+QUERIES = {
+    "first page, newest first": {},
+    "status=PENDING": {"status": "PENDING"},
+    "symbol + side, by price": {"symbol": "SYM42", "side": "BUY", "sort": "price"},
+    "time window, page 20": {"time_from": "2024-09-16 11:00:00", "time_to": "2024-09-16 13:00:00", "offset": 1000},
+}
+
+
+def order_book(n: int) -> list[dict]:
+    rng = random.Random(7)
+    rows = []
+    for i in range(n):
+        seconds = 9 * 3600 + 15 * 60 + rng.randrange(6 * 3600)
+        rows.append({
+            "orderId": str(112111182000 + i),
+            "orderStatus": rng.choice(STATUSES),
+            "transactionType": rng.choice(["BUY", "SELL"]),
+            "tradingSymbol": f"SYM{rng.randrange(500)}",
+            "exchangeSegment": "NSE_EQ",
+            "productType": "INTRADAY",
+            "quantity": rng.randint(1, 500),
+            "price": round(rng.uniform(50, 5000), 2),
+            "createTime": f"2024-09-16 {seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}",
+        })
+    return rows
+
+
+def naive(rows, status=None, symbol=None, side=None, time_from=None, time_to=None, sort="createTime", offset=0, limit=50):
+    matches = [
+        r for r in rows
+        if (status is None or r["orderStatus"] == status)
+        and (symbol is None or r["tradingSymbol"] == symbol)
+        and (side is None or r["transactionType"] == side)
+        and (time_from is None or r["createTime"] >= time_from)
+        and (time_to is None or r["createTime"] <= time_to)
+    ]
+    matches.sort(key=lambda r: r[sort], reverse=True)
+    return matches[offset:offset + limit]
+
+
+def best_of(fn, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(n: int) -> None:
+    rows = order_book(n)
+    snapshot = build_snapshot("orders", rows)
+    started = time.perf_counter()
+    index = OrderBookIndex(snapshot)
+    print(f"{n} orders; index build {((time.perf_counter() - started) * 1000):.1f} ms (once per book version)\n")
+    print(f"{'query':<28} {'indexed':>10} {'plain scan':>12} {'matches':>9}")
+    for label, params in QUERIES.items():
+        index.query(**params)  # sort permutation computed on first use
+        indexed = best_of(lambda: index.query(**params))
+        scan = best_of(lambda: naive(rows, **params), repeat=5)
+        total = index.query(**params)["total"]
+        print(f"{label:<28} {indexed * 1000:8.2f} ms {scan * 1000:10.2f} ms {total:9}")
+    page = orjson.dumps(index.query())
+    print(f"\npage of 50: {len(page) / 1024:.1f} KiB vs whole book: {len(snapshot.body) / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,92 @@
+"""Parse -> validate -> serialize throughput for broker books.
+
+Compares today's dict passthrough (json.loads + json.dumps / orjson) with the
+typed slotted models in ``app.models.payloads``, and the resident size of a
+book held as dicts versus typed rows.
+
+    python -m benchmarks.bench_payloads [rows]
+"""
+from __future__ import annotations
+
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import orjson
+
+from app.models.payloads import ADAPTERS, parse, parse_rows
+
+
+def order_book(n: int) -> bytes:
+    rng = random.Random(7)
+    rows = []
+    for i in range(n):
+        qty = rng.randint(1, 500)
+        rows.append({
+            "dhanClientId": "1000000001",
+            "orderId": str(112111182000 + i),
+            "correlationId": f"strat-{i}",
+            "orderStatus": rng.choice(["PENDING", "TRADED", "REJECTED", "CANCELLED"]),
+            "transactionType": rng.choice(["BUY", "SELL"]),
+            "exchangeSegment": "NSE_EQ",
+            "productType": "INTRADAY",
+            "orderType": "LIMIT",
+            "validity": "DAY",
+            "tradingSymbol": f"SYM{i % 300}",
+            "securityId": str(1000 + i % 300),
+            "quantity": qty,
+            "disclosedQuantity": 0,
+            "remainingQuantity": 0,
+            "filledQty": qty,
+            "price": round(rng.uniform(50, 5000), 2),
+            "triggerPrice": 0.0,
+            "averageTradedPrice": round(rng.uniform(50, 5000), 2),
+            "afterMarketOrder": False,
+            "legName": "NA",
+            "createTime": "2024-09-16 09:15:00",
+            "updateTime": "2024-09-16 09:15:01",
+            "exchangeTime": "2024-09-16 09:15:01",
+            "omsErrorCode": "0",
+            "omsErrorDescription": "",
+        })
+    return orjson.dumps(rows)
+
+
+def bench(label: str, fn, raw: bytes, rows: int, repeat: int = 5) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(raw)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<48} {best * 1000:8.1f} ms  {rows / best / 1000:8.0f}k rows/s")
+
+
+def resident(label: str, build, raw: bytes) -> None:
+    gc.collect()
+    tracemalloc.start()
+    book = build(raw)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<48} {size / len(book):8.0f} B/row")
+
+
+def main(rows: int) -> None:
+    raw = order_book(rows)
+    adapter = ADAPTERS["orders"]
+    print(f"{rows} orders, {len(raw) / 1e6:.1f} MB JSON\n")
+    bench("dict passthrough (json)", lambda b: json.dumps(json.loads(b)).encode(), raw, rows)
+    bench("dict passthrough (orjson)", lambda b: orjson.dumps(orjson.loads(b)), raw, rows)
+    bench("typed: validate_json + dump_json", lambda b: adapter.dump_json(parse("orders", b), exclude_none=True), raw, rows)
+    bench("typed: validate_json + orjson", lambda b: orjson.dumps(parse("orders", b)), raw, rows)
+    bench("typed: orjson + parse_rows (snapshot path)", lambda b: parse_rows("orders", orjson.loads(b)), raw, rows)
+    bench("typed: validate_json + dump_python (API dicts)", lambda b: adapter.dump_python(parse("orders", b), mode="json", exclude_none=True), raw, rows)
+    print()
+    resident("dict rows (json.loads)", json.loads, raw)
+    resident("typed rows (slots)", lambda b: parse("orders", b), raw)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
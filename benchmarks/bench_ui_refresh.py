@@ -0,0 +1,146 @@
+"""Cost of one NiceGUI page refresh: HTTP loopback versus in-process calls.
+
+A refresh is the set of reads the dashboard pages make. Before, each read
+built a new ``httpx.AsyncClient`` and went over TCP to this same process's
+API; now the pages call ``app.ui.api`` directly. Both sides read the same
+seeded snapshot caches and SQLite database, so the difference is the HTTP
+round trip itself (client setup, TCP, HTTP parsing, JSON encode/decode).
+The shared-client row separates client construction (an SSL context per
+``httpx.AsyncClient``) from the cost of the loopback request itself.
+
+    python -m benchmarks.bench_ui_refresh [refreshes] [rows]
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+
+# Scratch database, configured before the app reads its settings
+_tmp = tempfile.mkdtemp(prefix="bench_ui_")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_tmp}/bench.db")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.api.routes.kill_switch import router as kill_router  # noqa: E402
+from app.api.routes.orders import router as orders_router  # noqa: E402
+from app.api.routes.portfolio import router as portfolio_router  # noqa: E402
+from app.api.routes.positions import router as positions_router  # noqa: E402
+from app.api.routes.risk import router as risk_router  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.services import snapshot_cache as snapshots  # noqa: E402
+from app.ui import api  # noqa: E402
+
+
+REFRESH = ("/positions", "/orders", "/portfolio/summary", "/risk/settings", "/kill/status")
+
+
+def seed(rows: int) -> None:
+    rng = random.Random(7)
+    positions = [
+        {"securityId": str(1000 + i), "productType": "INTRADAY", "tradingSymbol": f"SYM{i}",
+         "netQty": rng.randint(-50, 50), "realizedProfit": rng.uniform(-500, 500),
+         "unrealizedProfit": rng.uniform(-500, 500)}
+        for i in range(rows)
+    ]
+    orders = [
+        {"orderId": str(112111182000 + i), "orderStatus": rng.choice(["PENDING", "TRADED"]),
+         "tradingSymbol": f"SYM{i % rows}", "quantity": rng.randint(1, 500), "price": rng.uniform(50, 5000)}
+        for i in range(rows * 4)
+    ]
+
+    def fixed(data):
+        async def fetch():
+            return data
+        return fetch
+
+    snapshots.BROKER_FETCHERS.update(
+        positions=fixed(positions),
+        orders=fixed(orders),
+        holdings=fixed([]),
+        funds=fixed([{"availabelBalance": 100_000.0, "utilizedAmount": 25_000.0}]),
+    )
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    for router in (positions_router, orders_router, portfolio_router, risk_router, kill_router):
+        app.include_router(router, prefix="/api")
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def loopback_refresh(base: str) -> None:
+    for path in REFRESH:
+        async with httpx.AsyncClient(base_url=base, timeout=5.0) as client:
+            r = await client.get(path)
+            r.raise_for_status()
+            r.json()
+
+
+async def shared_client_refresh(client: httpx.AsyncClient) -> None:
+    for path in REFRESH:
+        r = await client.get(path)
+        r.raise_for_status()
+        r.json()
+
+
+async def in_process_refresh() -> None:
+    for path in REFRESH:
+        await api.fetch_json(path)
+
+
+async def bench(label: str, refresh, refreshes: int, clients: int) -> None:
+    async def client_loop() -> None:
+        for _ in range(refreshes // clients):
+            await refresh()
+
+    await refresh()  # warm caches
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    done = refreshes // clients * clients
+    print(f"{label:<36} {clients:>3} clients  {elapsed / done * 1000:7.2f} ms/refresh  {done / elapsed:8.0f} refreshes/s")
+
+
+async def main(refreshes: int, rows: int) -> None:
+    seed(rows)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(build_app(), host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    base = f"http://127.0.0.1:{port}/api"
+    print(f"{len(REFRESH)} reads per refresh, {rows} positions / {rows * 4} orders\n")
+    shared = httpx.AsyncClient(base_url=base, timeout=5.0, limits=httpx.Limits(max_connections=20))
+    try:
+        for clients in (1, 20):
+            await bench("HTTP loopback (client per call)", lambda: loopback_refresh(base), refreshes, clients)
+            await bench("HTTP loopback (shared client)", lambda: shared_client_refresh(shared), refreshes, clients)
+            await bench("in-process (app.ui.api)", in_process_refresh, refreshes, clients)
+    finally:
+        await shared.aclose()
+        server.should_exit = True
+        await serving
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    ))
@@ -0,0 +1,76 @@
+"""Initial schema (tables previously created by SQLModel.metadata.create_all)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "risk_settings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("max_daily_total_loss", sa.Float(), nullable=False),
+        sa.Column("max_daily_loss_per_position", sa.Float(), nullable=False),
+        sa.Column("per_position_daily_profit_target", sa.Float(), nullable=False),
+        sa.Column("max_daily_total_profit_target", sa.Float(), nullable=False),
+        sa.Column("risk_locked", sa.Boolean(), nullable=False),
+        sa.Column("risk_lock_until", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_risk_settings_user_id", "risk_settings", ["user_id"])
+
+    op.create_table(
+        "kill_switch_status",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=True),
+    )
+    op.create_index("ix_kill_switch_status_user_id", "kill_switch_status", ["user_id"])
+
+    op.create_table(
+        "kill_switch_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=False),
+    )
+    op.create_index("ix_kill_switch_events_user_id", "kill_switch_events", ["user_id"])
+
+    op.create_table(
+        "audit_logs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("event", sa.String(), nullable=False),
+        sa.Column("detail", sa.String(), nullable=True),
+        sa.Column("path", sa.String(), nullable=True),
+        sa.Column("success", sa.Boolean(), nullable=False),
+    )
+    op.create_index("ix_audit_logs_user_id", "audit_logs", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("audit_logs")
+    op.drop_table("kill_switch_events")
+    op.drop_table("kill_switch_status")
+    op.drop_table("risk_settings")
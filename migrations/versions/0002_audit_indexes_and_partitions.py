@@ -0,0 +1,116 @@
+"""Composite (user_id, created_at) indexes; daily range partitions on Postgres
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:01
+
+On Postgres, audit_logs and kill_switch_events become tables partitioned by
+day on created_at so retention can drop partitions instead of deleting rows.
+Day partitions for today onward are created first, then existing rows are
+copied in (older ones land in the DEFAULT partition); the primary key becomes
+(id, created_at) because Postgres requires the partition key in it. The DDL is
+inlined so the revision does not depend on app code; the nightly partition job
+takes over from here.
+
+"""
+from datetime import date, datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONED_TABLES = ("audit_logs", "kill_switch_events")
+# Day partitions created up front; the nightly job extends them to PARTITION_DAYS_AHEAD
+DAYS_AHEAD = 7
+
+COLUMNS = {
+    "audit_logs": """
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        user_id VARCHAR,
+        event VARCHAR NOT NULL,
+        detail VARCHAR,
+        path VARCHAR,
+        success BOOLEAN NOT NULL
+    """,
+    "kill_switch_events": """
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        user_id VARCHAR,
+        action VARCHAR NOT NULL,
+        reason VARCHAR NOT NULL
+    """,
+}
+
+
+def _partition_postgres(table: str) -> None:
+    legacy = f"{table}_legacy"
+    op.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey")
+    op.execute(f"DROP INDEX IF EXISTS ix_{table}_user_id")
+    op.execute(
+        f"""
+        CREATE TABLE {table} (
+            id INTEGER NOT NULL DEFAULT nextval('{table}_id_seq'),
+            {COLUMNS[table]},
+            CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _create_day_partitions(table: str, today: date) -> None:
+    for offset in range(DAYS_AHEAD + 1):
+        day = today + timedelta(days=offset)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_p{day:%Y%m%d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+        )
+
+
+def _move_legacy_rows(table: str) -> None:
+    legacy = f"{table}_legacy"
+    op.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+    op.execute(f"DROP TABLE {legacy}")
+    op.create_index(f"ix_{table}_user_id", table, ["user_id"])
+    op.create_index(f"ix_{table}_user_id_created_at", table, ["user_id", "created_at"])
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        today = datetime.utcnow().date()
+        for table in PARTITIONED_TABLES:
+            _partition_postgres(table)
+            # Day partitions must exist before rows for those days are copied in;
+            # Postgres will not add one later while DEFAULT holds rows in its range
+            _create_day_partitions(table, today)
+            _move_legacy_rows(table)
+    else:
+        for table in PARTITIONED_TABLES:
+            op.create_index(f"ix_{table}_user_id_created_at", table, ["user_id", "created_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for table in PARTITIONED_TABLES:
+            flat = f"{table}_flat"
+            op.execute(f"CREATE TABLE {flat} (LIKE {table} INCLUDING DEFAULTS)")
+            op.execute(f"INSERT INTO {flat} SELECT * FROM {table}")
+            op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {flat}.id")
+            op.execute(f"DROP TABLE {table} CASCADE")
+            op.execute(f"ALTER TABLE {flat} RENAME TO {table}")
+            op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+            op.create_index(f"ix_{table}_user_id", table, ["user_id"])
+    else:
+        for table in PARTITIONED_TABLES:
+            op.drop_index(f"ix_{table}_user_id_created_at", table_name=table)
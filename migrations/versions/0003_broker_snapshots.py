@@ -0,0 +1,66 @@
+"""Order and position snapshot tables for the local broker book
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "order_snapshots",
+        sa.Column("order_id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("trading_symbol", sa.String(), nullable=True),
+        sa.Column("security_id", sa.String(), nullable=True),
+        sa.Column("transaction_type", sa.String(), nullable=True),
+        sa.Column("order_status", sa.String(), nullable=True),
+        sa.Column("quantity", sa.Float(), nullable=True),
+        sa.Column("filled_qty", sa.Float(), nullable=True),
+        sa.Column("price", sa.Float(), nullable=True),
+        sa.Column("content_hash", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("first_seen_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_order_snapshots_user_id", "order_snapshots", ["user_id"])
+    op.create_index("ix_order_snapshots_trading_symbol", "order_snapshots", ["trading_symbol"])
+    op.create_index("ix_order_snapshots_order_status", "order_snapshots", ["order_status"])
+    op.create_index("ix_order_snapshots_updated_at", "order_snapshots", ["updated_at"])
+
+    op.create_table(
+        "position_snapshots",
+        sa.Column("position_key", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("trading_symbol", sa.String(), nullable=True),
+        sa.Column("security_id", sa.String(), nullable=True),
+        sa.Column("product_type", sa.String(), nullable=True),
+        sa.Column("net_qty", sa.Float(), nullable=True),
+        sa.Column("realized_profit", sa.Float(), nullable=True),
+        sa.Column("unrealized_profit", sa.Float(), nullable=True),
+        sa.Column("content_hash", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("first_seen_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("closed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_position_snapshots_user_id", "position_snapshots", ["user_id"])
+    op.create_index("ix_position_snapshots_trading_symbol", "position_snapshots", ["trading_symbol"])
+    op.create_index("ix_position_snapshots_updated_at", "position_snapshots", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("position_snapshots")
+    op.drop_table("order_snapshots")
@@ -0,0 +1,41 @@
+"""Unique per-user risk_settings / kill_switch_status rows
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:03
+
+Duplicates created by the old SELECT-then-INSERT race are collapsed to the
+oldest row before the unique expression indexes are added. NULL user_id
+(single-user mode) is keyed as '' so it is unique too.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = {
+    "risk_settings": "uq_risk_settings_user_key",
+    "kill_switch_status": "uq_kill_switch_status_user_key",
+}
+
+
+def upgrade() -> None:
+    for table, index in TABLES.items():
+        op.execute(
+            f"DELETE FROM {table} WHERE id NOT IN "
+            f"(SELECT MIN(id) FROM {table} GROUP BY coalesce(user_id, ''))"
+        )
+        op.execute(f"CREATE UNIQUE INDEX {index} ON {table} (coalesce(user_id, ''))")
+
+
+def downgrade() -> None:
+    for table, index in TABLES.items():
+        op.execute(f"DROP INDEX {index}")
@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import positions as positions_routes
+from app.core.loop_monitor import LoopLagMonitor
+from app.main import app as real_app
+from app.middleware.admission import AdmissionMiddleware, priority
+from app.services import snapshot_cache as snapshots
+
+
+def _real_routes():
+    return {(method, route.path) for route in real_app.routes for method in getattr(route, "methods", None) or ()}
+
+
+def test_priorities():
+    assert priority("POST", "/api/kill/activate") == "critical"
+    assert priority("POST", "/api/orders") == "critical"
+    assert priority("GET", "/api/orders") == "low"
+    assert priority("GET", "/api/market/proxy") == "low"
+    assert priority("PUT", "/api/risk/settings") == "critical"
+    assert priority("POST", "/api/market/proxy") == "low"
+    assert priority("POST", "/api/admin/profiles/session") == "normal"
+    assert priority("GET", "/dashboard") is None
+    routes = _real_routes()
+    for method, path in [
+        ("POST", "/api/kill/activate"), ("POST", "/api/orders"), ("GET", "/api/orders"),
+        ("GET", "/api/market/proxy"), ("POST", "/api/risk/settings"), ("POST", "/api/market/proxy"),
+        ("POST", "/api/admin/profiles/session"),
+    ]:
+        assert (method, path) in routes
+
+
+def test_monitor_measures_blocked_loop():
+    async def run():
+        monitor = LoopLagMonitor(interval=0.01)
+        await monitor.start()
+        await asyncio.sleep(0.03)
+        time.sleep(0.15)  # block the loop
+        await asyncio.sleep(0.02)
+        lag = monitor.lag
+        await monitor.stop()
+        return lag
+
+    assert asyncio.run(run()) >= 0.1
+
+
+def test_lag_sheds_low_priority_and_serves_stale(monkeypatch):
+    monitor = LoopLagMonitor()
+    cache = snapshots.SnapshotCache()
+    monkeypatch.setattr(snapshots, "snapshot_cache", cache)
+    monkeypatch.setattr(positions_routes, "snapshot_cache", cache)
+    fetches = []
+
+    async def fetch_positions():
+        fetches.append(1)
+        return [{"securityId": "1", "productType": "INTRADAY", "netQty": len(fetches)}]
+
+    monkeypatch.setitem(snapshots.BROKER_FETCHERS, "positions", fetch_positions)
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, monitor=monitor)
+    # The real positions route (low priority, served stale under lag)
+    app.include_router(positions_routes.router, prefix="/api")
+
+    # Stand-ins at real paths for routes that would reach the broker or the DB
+    @app.get("/api/market/ltp")
+    async def ltp():
+        return {"ltp": 1}
+
+    @app.post("/api/kill/activate")
+    async def kill():
+        return {"ok": True}
+
+    @app.post("/api/orders")
+    async def place_order():
+        return {"orderId": "1"}
+
+    @app.post("/api/admin/profiles/session")
+    async def profile_session():
+        return {"ok": True}
+
+    for method, path in [("GET", "/api/market/ltp"), ("POST", "/api/kill/activate"), ("POST", "/api/orders"), ("POST", "/api/admin/profiles/session")]:
+        assert (method, path) in _real_routes()
+
+    client = TestClient(app)
+    assert client.get("/api/positions").json()[0]["netQty"] == 1
+
+    monitor.lag = 0.5
+    shed = client.get("/api/market/ltp")
+    assert shed.status_code == 503 and shed.headers["retry-after"] == "1"
+    # Served from the cached snapshot even though it is past snapshot_max_age
+    cache.current("positions").fetched_at -= 60
+    assert client.get("/api/positions").json()[0]["netQty"] == 1
+    assert len(fetches) == 1
+    assert client.post("/api/admin/profiles/session").status_code == 200
+    assert client.post("/api/kill/activate").status_code == 200
+
+    monitor.lag = 2.0
+    assert client.post("/api/admin/profiles/session").status_code == 503
+    assert client.post("/api/kill/activate").status_code == 200
+    assert client.post("/api/orders").status_code == 200
+    assert client.get("/api/positions").status_code == 200
+
+    monitor.lag = 0.0
+    assert client.get("/api/positions").json()[0]["netQty"] == 2
+    assert client.get("/api/market/ltp").status_code == 200
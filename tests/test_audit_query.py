@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import orjson
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.api.routes.audit import router as audit_router
+from app.core.config import get_settings
+from app.db.session import get_session
+from app.models.audit import AuditLog
+from app.services.audit_query_service import AuditQueryService, stream_export
+
+
+def test_keyset_pagination_and_export(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        base = datetime(2026, 10, 19, 9, 15)
+        async with maker() as session:
+            for i in range(25):
+                # Pairs of rows share a timestamp so the id tie-breaker is exercised
+                session.add(AuditLog(created_at=base + timedelta(seconds=i // 2), user_id="u1" if i % 5 else "u2", event="order_place"))
+            await session.commit()
+
+            service = AuditQueryService(session)
+            seen, cursor = [], None
+            while True:
+                page = await service.page(AuditLog, limit=7, cursor=cursor, user_id="u1")
+                seen.extend(row.id for row in page["items"])
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+
+        chunks = [c async for c in stream_export(engine, AuditLog, "ndjson", batch_size=4, user_id="u2")]
+        await engine.dispose()
+        return seen, b"".join(chunks)
+
+    seen, ndjson = asyncio.run(run())
+    assert len(seen) == 20
+    assert len(set(seen)) == 20
+    assert seen == sorted(seen, reverse=True)
+    exported = [orjson.loads(line) for line in ndjson.splitlines()]
+    assert [row["user_id"] for row in exported] == ["u2"] * 5
+
+
+def test_audit_routes_require_admin_token(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    asyncio.run(create())
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def session_override():
+        async with maker() as session:
+            yield session
+
+    monkeypatch.setattr(get_settings(), "admin_token", "secret")
+    app = FastAPI()
+    app.include_router(audit_router, prefix="/api")
+    app.dependency_overrides[get_session] = session_override
+    client = TestClient(app)
+
+    for path in ("/api/audit/logs", "/api/audit/logs/export", "/api/audit/kill-events", "/api/audit/kill-events/export"):
+        assert client.get(path).status_code == 403
+        assert client.get(path, headers={"X-Admin-Token": "wrong"}).status_code == 403
+    resp = client.get("/api/audit/logs", headers={"X-Admin-Token": "secret"})
+    assert resp.status_code == 200
+    assert resp.json()["items"] == []
@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.models.audit import AuditLog
+from app.services.audit_service import AuditWriter
+
+
+def test_audit_writer_batches_and_flushes_on_stop(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        writer = AuditWriter(maker, max_queue=50, batch_size=20, flush_interval=10.0)
+        await writer.start()
+        for i in range(45):
+            await writer.submit(dict(created_at=datetime.utcnow(), event=f"e{i}", success=True))
+        await writer.stop()
+
+        async with maker() as session:
+            count = (await session.execute(select(func.count()).select_from(AuditLog))).scalar_one()
+        await engine.dispose()
+        return count
+
+    assert asyncio.run(run()) == 45
+
+
+def test_audit_writer_stop_keeps_batch_held_by_running_task(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        writer = AuditWriter(maker, max_queue=50, batch_size=20, flush_interval=10.0)
+        await writer.start()
+        for i in range(5):
+            await writer.submit(dict(created_at=datetime.utcnow(), event=f"e{i}", success=True))
+        # Let the writer take the rows off the queue; it now waits to fill its batch
+        await asyncio.sleep(0.05)
+        assert writer._queue.empty()
+        await writer.stop()
+
+        async with maker() as session:
+            count = (await session.execute(select(func.count()).select_from(AuditLog))).scalar_one()
+        await engine.dispose()
+        return count
+
+    assert asyncio.run(run()) == 5
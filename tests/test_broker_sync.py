@@ -0,0 +1,36 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.models.broker import OrderSnapshot, PositionSnapshot
+from app.services.broker_sync_service import BrokerSyncService
+
+
+def test_only_changed_rows_are_written(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'book.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        BrokerSyncService.reset_cache()
+
+        orders = [{"orderId": str(i), "orderStatus": "PENDING", "tradingSymbol": "TCS", "quantity": 1} for i in range(10)]
+        positions = [{"securityId": "11536", "productType": "INTRADAY", "netQty": 5}]
+        async with maker() as session:
+            service = BrokerSyncService(session)
+            first = (await service.sync_orders(orders), await service.sync_positions(positions))
+            orders[3] = dict(orders[3], orderStatus="TRADED")
+            second = (await service.sync_orders(orders), await service.sync_positions([]))
+            status = (await session.execute(select(OrderSnapshot.order_status).where(OrderSnapshot.order_id == "3"))).scalar_one()
+            closed = (await session.execute(select(PositionSnapshot.closed_at))).scalar_one()
+        await engine.dispose()
+        return first, second, status, closed
+
+    first, second, status, closed = asyncio.run(run())
+    assert first == (10, 1)
+    assert second == (1, 1)
+    assert status == "TRADED"
+    assert closed is not None
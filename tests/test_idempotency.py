@@ -0,0 +1,180 @@
+import asyncio
+import time
+
+import orjson
+import pytest
+
+from app.services.idempotency import PENDING, IdempotencyKeyReused, IdempotencyStore
+
+
+@pytest.fixture(autouse=True)
+def no_redis(monkeypatch):
+    # The in-process LRU and in-flight futures do the work
+    monkeypatch.setattr("app.services.idempotency.get_redis", lambda: None)
+
+
+def _store():
+    return IdempotencyStore(ttl=60, max_entries=100, wait_timeout=1)
+
+
+def test_concurrent_duplicates_share_one_execution():
+    store = _store()
+    calls = 0
+
+    async def handler():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return 200, orjson.dumps({"orderId": "42"})
+
+    async def run():
+        first = await asyncio.gather(*(store.run("k", "fp", handler) for _ in range(5)))
+        later = await store.run("k", "fp", handler)
+        return first, later
+
+    first, later = asyncio.run(run())
+    assert calls == 1
+    assert [replayed for _, replayed in first].count(False) == 1
+    assert later[1] is True and orjson.loads(later[0].body) == {"orderId": "42"}
+
+
+def test_key_reuse_with_other_payload_is_rejected():
+    store = _store()
+
+    async def handler():
+        return 502, orjson.dumps({"detail": "Broker error: timeout"})
+
+    async def run():
+        stored, _ = await store.run("k", "fp-1", handler)
+        assert stored.status_code == 502
+        await store.run("k", "fp-2", handler)
+
+    with pytest.raises(IdempotencyKeyReused):
+        asyncio.run(run())
+
+
+def test_failed_handler_is_not_recorded():
+    store = _store()
+    attempts = 0
+
+    async def handler():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("crashed before reaching the broker")
+        return 200, b"{}"
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await store.run("k", "fp", handler)
+        return await store.run("k", "fp", handler)
+
+    stored, replayed = asyncio.run(run())
+    assert attempts == 2 and replayed is False
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for the placeholder: values with millisecond expiry."""
+
+    def __init__(self):
+        self.values = {}
+
+    def _live(self, key):
+        entry = self.values.get(key)
+        if entry is not None and entry[1] <= time.monotonic():
+            del self.values[key]
+            return None
+        return entry
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self._live(key) is not None:
+            return False
+        self.values[key] = (value, time.monotonic() + px / 1000)
+        return True
+
+    async def get(self, key):
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    async def pexpire(self, key, px):
+        entry = self._live(key)
+        if entry is not None:
+            self.values[key] = (entry[0], time.monotonic() + px / 1000)
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    def ttl(self, key):
+        return self.values[key][1] - time.monotonic()
+
+
+def test_pending_placeholder_is_short_lived_and_kept_alive():
+    redis = FakeRedis()
+    store = IdempotencyStore(ttl=3600, max_entries=100, wait_timeout=0.05, redis=redis)
+    seen = []
+
+    async def handler():
+        seen.append(redis.ttl("idem:k"))
+        # Outlives pending_ttl (0.15s) several times over; the keepalive extends it
+        await asyncio.sleep(0.5)
+        seen.append(await redis.get("idem:k"))
+        return 200, b"{}"
+
+    async def crashed_worker():
+        # Another worker claimed the key and died without storing a response
+        await redis.set("idem:lost", PENDING, nx=True, px=int(store.pending_ttl * 1000))
+        await asyncio.sleep(store.pending_ttl + 0.05)
+        return await store.run("lost", "fp", handler)
+
+    async def run():
+        stored, replayed = await store.run("k", "fp", handler)
+        recovered = await crashed_worker()
+        return replayed, recovered
+
+    replayed, recovered = asyncio.run(run())
+    assert replayed is False and seen[0] <= store.pending_ttl and seen[1] == PENDING
+    assert redis.ttl("idem:k") > 3000
+    assert recovered[1] is False
+
+
+def test_outcomes_that_never_reached_the_broker_are_not_replayed(monkeypatch):
+    import httpx
+    from fastapi import FastAPI, HTTPException, Request
+    from fastapi.testclient import TestClient
+
+    import app.api.idempotency as api_idempotency
+    from app.api.idempotency import NotSubmitted, idempotent_response
+    from app.services.dhan_client import BrokerUnavailable, reached_broker
+
+    store = _store()
+    monkeypatch.setattr(api_idempotency, "get_idempotency_store", lambda: store)
+    outcomes = [
+        NotSubmitted(status_code=403, detail="Kill switch active"),
+        {"placed": 0},
+        {"placed": 1},
+        {"placed": 2},
+    ]
+
+    app = FastAPI()
+
+    @app.post("/orders")
+    async def place(request: Request):
+        async def submit():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, HTTPException):
+                raise outcome
+            return outcome
+        return await idempotent_response(request, "k", {}, submit, submitted=lambda r: r["placed"] > 0)
+
+    client = TestClient(app)
+    first = client.post("/orders")
+    assert first.status_code == 403 and "Idempotency-Replayed" not in first.headers
+    assert client.post("/orders").json() == {"placed": 0}
+    placed = client.post("/orders")
+    assert placed.json() == {"placed": 1} and "Idempotency-Replayed" not in placed.headers
+    replay = client.post("/orders")
+    assert replay.json() == {"placed": 1} and replay.headers["Idempotency-Replayed"] == "true"
+
+    assert not reached_broker(BrokerUnavailable("Circuit open for Dhan API"))
+    assert not reached_broker(httpx.ConnectError("refused"))
+    assert reached_broker(httpx.ReadTimeout("timed out"))
@@ -0,0 +1,88 @@
+import random
+
+import orjson
+
+from app.services.broker_sync_service import order_key
+from app.ui.keyed_table import KEY, keyed_rows, row_diff
+
+
+def apply(current, diff):
+    # Mirror of keyed_table.js apply()
+    by_key = {row[KEY]: row for row in current}
+    for key in diff["removed"]:
+        by_key.pop(key)
+    added = []
+    for row in diff["upserts"]:
+        if row[KEY] not in by_key:
+            added.append(row[KEY])
+        by_key[row[KEY]] = row
+    order = diff.get("order") or [row[KEY] for row in current if row[KEY] in by_key] + added
+    return [by_key[key] for key in order]
+
+
+def orders(n):
+    return [{"orderId": str(i), "orderStatus": "PENDING", "quantity": i + 1, "tradingSymbol": f"SYM{i}"} for i in range(n)]
+
+
+def test_single_status_change_sends_one_row():
+    old = keyed_rows(orders(500), order_key)
+    rows = orders(500)
+    rows[42]["orderStatus"] = "TRADED"
+    new = keyed_rows(rows, order_key)
+    diff = row_diff(old, new)
+    assert [r["orderId"] for r in diff["upserts"]] == ["42"]
+    assert diff["removed"] == [] and "order" not in diff
+    assert len(orjson.dumps(diff)) * 50 < len(orjson.dumps(new))
+    assert apply(old, diff) == new
+    assert row_diff(new, keyed_rows(rows, order_key)) is None
+
+
+def test_random_edits_round_trip():
+    rng = random.Random(3)
+    current = keyed_rows(orders(50), order_key)
+    for step in range(200):
+        rows = [dict(r) for r in current]
+        for r in rows:
+            r.pop(KEY)
+        op = rng.random()
+        if op < 0.3 and rows:
+            rows.pop(rng.randrange(len(rows)))
+        elif op < 0.6:
+            rows.insert(rng.randrange(len(rows) + 1), {"orderId": f"n{step}", "orderStatus": "PENDING"})
+        elif op < 0.8 and rows:
+            rows[rng.randrange(len(rows))]["orderStatus"] = "TRADED"
+        else:
+            rng.shuffle(rows)
+        new = keyed_rows(rows, order_key)
+        diff = row_diff(current, new)
+        current = new if diff is None else apply(current, diff)
+        assert current == new
+
+
+def test_duplicate_keys_stay_separate_rows():
+    rows = [{"orderId": "1", "quantity": 5}, {"orderId": "1", "quantity": 7}, {"orderId": "2"}]
+    keyed = keyed_rows(rows, order_key)
+    assert [r[KEY] for r in keyed] == ["1", "1#2", "2"]
+    assert apply(keyed_rows(rows[1:], order_key), row_diff(keyed_rows(rows[1:], order_key), keyed)) == keyed
+
+
+def test_full_rows_resent_after_reconnect():
+    from nicegui import Client
+    from nicegui.page import page
+
+    from app.ui.keyed_table import KeyedTable
+
+    client = Client(page(""))
+    try:
+        with client:
+            table = KeyedTable(columns=[], key=order_key, rows=orders(3))
+        sent = []
+        client.outbox.enqueue_update = lambda element: sent.append([r[KEY] for r in element.rows])
+        client.environ = {}  # connected: later changes go out as diffs
+        table.run_method = lambda name, diff: sent.append(name)
+        table.set_rows(orders(4))
+        # Socket drops and comes back within reconnect_timeout: the handshake re-sends every row
+        client.handle_handshake()
+        assert sent == ["apply", ["0", "1", "2", "3"]]
+    finally:
+        Client.instances.pop(client.id, None)
@@ -0,0 +1,44 @@
+import asyncio
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.timing import component_timer
+from app.middleware.metrics import MetricsMiddleware
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_route_template_labels_and_component_split():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/api/red/{order_id}")
+    async def order(order_id: str):
+        async def leg():
+            with component_timer("broker"):
+                await asyncio.sleep(0.05)
+
+        await leg()
+        if order_id == "bad":
+            raise HTTPException(status_code=502, detail="Broker error")
+        return {"order_id": order_id}
+
+    client = TestClient(app)
+    before_ok = _sample("http_requests_total", method="GET", route="/api/red/{order_id}", status="200")
+    client.get("/api/red/1")
+    client.get("/api/red/2")
+    client.get("/api/red/bad")
+    client.get("/api/nothing-here")
+
+    route = "/api/red/{order_id}"
+    assert _sample("http_requests_total", method="GET", route=route, status="200") - before_ok == 2
+    assert _sample("http_requests_total", method="GET", route=route, status="502") >= 1
+    assert _sample("http_requests_total", method="GET", route="unmatched", status="404") >= 1
+    assert _sample("http_requests_in_flight", method="GET", route=route) == 0
+    broker = _sample("http_request_component_seconds_sum", route=route, component="broker")
+    assert broker >= 0.15
+    assert _sample("http_request_component_seconds_count", route=route, component="app") >= 3
@@ -0,0 +1,169 @@
+import asyncio
+import time
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.services.dhan_client import DhanClient, TokenBucket
+from app.services.order_batch_service import OrderBatchService, batch_submitted
+from app.services.portfolio_service import build_view
+from app.services.risk_service import RiskService
+
+
+class FakeBroker:
+    def __init__(self, fail_security=None, delay=0.05, reject_security=None, timeout_security=None, lookup_fails=False):
+        self.fail_security = fail_security
+        self.reject_security = reject_security
+        self.timeout_security = timeout_security
+        self.lookup_fails = lookup_fails
+        self.delay = delay
+        self.cancelled = []
+        self.by_correlation = {}
+
+    async def place_order(self, order):
+        await asyncio.sleep(self.delay)
+        if order["securityId"] == self.fail_security:
+            raise RuntimeError("RMS rejected")
+        if order["securityId"] == self.reject_security:
+            # HTTP 200, rejected by the broker's RMS
+            return {"orderId": f"o-{order['securityId']}", "orderStatus": "REJECTED", "omsErrorDescription": "Insufficient margin"}
+        response = {"orderId": f"o-{order['securityId']}", "orderStatus": "PENDING"}
+        self.by_correlation[order["correlationId"]] = response
+        if order["securityId"] == self.timeout_security:
+            # Placed at the broker, but the response never arrived
+            raise httpx.ReadTimeout("timed out")
+        return response
+
+    async def get_order_by_correlation_id(self, correlation_id):
+        if self.lookup_fails:
+            raise httpx.ConnectError("broker unreachable")
+        return self.by_correlation.get(correlation_id)
+
+    async def cancel_order(self, order_id):
+        self.cancelled.append(order_id)
+        return {"orderId": order_id, "orderStatus": "CANCELLED"}
+
+
+def _orders(n):
+    return [{"securityId": str(i), "transactionType": "BUY", "quantity": 1} for i in range(n)]
+
+
+def test_legs_are_dispatched_concurrently():
+    broker = FakeBroker()
+    started = time.perf_counter()
+    result = asyncio.run(OrderBatchService(broker).place_batch(_orders(10), [None] * 10))
+    assert time.perf_counter() - started < 0.3
+    assert result["ok"] and result["placed"] == 10
+    assert [leg["order_id"] for leg in result["legs"]] == [f"o-{i}" for i in range(10)]
+    assert batch_submitted(result)
+
+
+def test_all_or_nothing_cancels_placed_legs_on_failure():
+    broker = FakeBroker(fail_security="2")
+    result = asyncio.run(OrderBatchService(broker).place_batch(_orders(4), [None] * 4, all_or_nothing=True))
+    statuses = [leg["status"] for leg in result["legs"]]
+    assert statuses == ["rolled_back", "rolled_back", "failed", "rolled_back"]
+    assert sorted(broker.cancelled) == ["o-0", "o-1", "o-3"]
+    assert result["ok"] is False
+
+
+def test_broker_rejected_leg_is_a_failure():
+    broker = FakeBroker(reject_security="1")
+    result = asyncio.run(OrderBatchService(broker).place_batch(_orders(3), [None] * 3, all_or_nothing=True))
+    assert [leg["status"] for leg in result["legs"]] == ["rolled_back", "failed", "rolled_back"]
+    assert result["legs"][1]["error"] == "Insufficient margin"
+    assert result["placed"] == 0 and result["ok"] is False
+
+
+def test_rejected_leg_stops_all_or_nothing_before_dispatch():
+    broker = FakeBroker()
+    result = asyncio.run(
+        OrderBatchService(broker).place_batch(_orders(2), [None, "Kill switch active"], all_or_nothing=True)
+    )
+    assert [leg["status"] for leg in result["legs"]] == ["skipped", "rejected"]
+    # Nothing reached the broker, so an idempotent retry may run the basket again
+    assert not batch_submitted(result)
+
+
+def test_token_bucket_paces_beyond_burst():
+    async def run():
+        bucket = TokenBucket(rate=50, burst=2)
+        started = time.perf_counter()
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) >= 0.07
+
+
+def test_pre_trade_check_applies_lock_and_thresholds(tmp_path):
+    positions = [
+        {"securityId": "1", "tradingSymbol": "LOSER", "netQty": 10, "realizedProfit": 0, "unrealizedProfit": -250},
+        {"securityId": "2", "tradingSymbol": "OK", "netQty": 5, "realizedProfit": 0, "unrealizedProfit": 20},
+    ]
+    orders = [
+        {"securityId": "1", "transactionType": "BUY", "quantity": 1},   # adds to a position past its loss limit
+        {"securityId": "1", "transactionType": "SELL", "quantity": 10},  # exit stays allowed
+        {"securityId": "2", "transactionType": "BUY", "quantity": 1},
+    ]
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'risk.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with maker() as session:
+            service = RiskService(session)
+            per_position = await service.pre_trade_check(orders, build_view(positions, [], None))
+            # Account-wide loss limit: only exits pass
+            losing_day = [dict(p, unrealizedProfit=-700) for p in positions]
+            account = await service.pre_trade_check(orders, build_view(losing_day, [], None))
+            await service.lock_risk_until_next_day_5pm()
+            locked = await service.pre_trade_check(orders, build_view(positions, [], None))
+        await engine.dispose()
+        return per_position, account, locked
+
+    per_position, account, locked = asyncio.run(run())
+    assert per_position == ["Position loss limit reached for LOSER", None, None]
+    assert account == ["Daily loss limit reached", None, "Daily loss limit reached"]
+    assert all(reason.startswith("Risk locked until") for reason in locked)
+
+
+def test_timed_out_leg_is_looked_up_before_rollback():
+    # The timed-out leg exists at the broker: found by correlation id and cancelled with the rest
+    broker = FakeBroker(fail_security="0", timeout_security="2")
+    result = asyncio.run(OrderBatchService(broker).place_batch(_orders(3), [None] * 3, all_or_nothing=True))
+    assert [leg["status"] for leg in result["legs"]] == ["failed", "rolled_back", "rolled_back"]
+    assert sorted(broker.cancelled) == ["o-1", "o-2"]
+    assert result["legs"][2]["resolved_by_lookup"] is True
+
+    # Without all_or_nothing the found leg simply counts as placed
+    broker = FakeBroker(timeout_security="1")
+    result = asyncio.run(OrderBatchService(broker).place_batch(_orders(2), [None] * 2))
+    assert result["ok"] and result["legs"][1]["order_id"] == "o-1"
+
+    # If the lookup fails too, the leg is reported as unknown, never as failed
+    broker = FakeBroker(timeout_security="1", lookup_fails=True)
+    result = asyncio.run(OrderBatchService(broker).place_batch(_orders(2), [None] * 2, all_or_nothing=True))
+    assert [leg["status"] for leg in result["legs"]] == ["rolled_back", "unknown"]
+    assert result["legs"][1]["lookup_error"] == "broker unreachable"
+    assert result["legs"][1]["correlation_id"]
+
+
+def test_correlation_lookup_maps_404_to_none():
+    def respond(request):
+        if request.url.path.endswith("/orders/external/known"):
+            return httpx.Response(200, json={"orderId": "7", "correlationId": "known", "orderStatus": "PENDING"})
+        return httpx.Response(404, json={"errorMessage": "No order"})
+
+    async def run():
+        client = DhanClient(base_url="https://broker.test/v2/")
+        await client.close()
+        client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(respond))
+        async with client:
+            return await client.get_order_by_correlation_id("known"), await client.get_order_by_correlation_id("other")
+
+    found, missing = asyncio.run(run())
+    assert found["orderId"] == "7" and missing is None
+    assert DhanClient._cb.failures == 0
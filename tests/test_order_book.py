@@ -0,0 +1,58 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes.orders import router
+from app.services.order_book import OrderBookCache, OrderBookIndex
+from app.services.snapshot_cache import SnapshotCache
+
+
+def book(n):
+    statuses = ["PENDING", "TRADED", "REJECTED", "CANCELLED"]
+    return [
+        {
+            "orderId": str(i),
+            "orderStatus": statuses[i % 4],
+            "transactionType": "BUY" if i % 2 else "SELL",
+            "tradingSymbol": f"SYM{i % 10}",
+            "quantity": i,
+            "price": float(1000 - i),
+            "createTime": f"2024-09-16 09:{15 + i // 60:02d}:{i % 60:02d}",
+        }
+        for i in range(n)
+    ]
+
+
+def test_filters_sort_and_paging_match_a_plain_scan():
+    rows = book(600)
+    index = OrderBookIndex(SnapshotCache().publish("orders", rows))
+    page = index.query(status="pending,traded", symbol="sym3", side="BUY", sort="price", descending=False, offset=2, limit=5)
+    expected = sorted(
+        (r for r in rows if r["orderStatus"] in ("PENDING", "TRADED") and r["tradingSymbol"] == "SYM3" and r["transactionType"] == "BUY"),
+        key=lambda r: r["price"],
+    )
+    assert page["total"] == len(expected)
+    assert page["rows"] == expected[2:7]
+    assert page["status_counts"] == {"PENDING": 150, "TRADED": 150, "REJECTED": 150, "CANCELLED": 150}
+
+    newest = index.query(time_from="2024-09-16 09:20:00", time_to="2024-09-16 09:20:59", limit=3)
+    assert newest["total"] == 60
+    assert [r["orderId"] for r in newest["rows"]] == ["359", "358", "357"]
+    assert index.query(status="UNKNOWN")["total"] == 0
+
+
+def test_index_is_rebuilt_only_for_new_versions_and_served_by_route(monkeypatch):
+    snapshots = SnapshotCache()
+    cache = OrderBookCache()
+    first = cache.index(snapshots.publish("orders", book(20)))
+    assert cache.index(snapshots.publish("orders", book(20))) is first
+
+    async def latest():
+        return cache.index(snapshots.publish("orders", book(20)))
+
+    monkeypatch.setattr("app.api.routes.orders.order_book_index", latest)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    client = TestClient(app)
+    body = client.get("/api/orders/page", params={"side": "SELL", "limit": 4, "time_from": "2024-09-16T09:15:10"}).json()
+    assert body["total"] == 5 and [r["orderId"] for r in body["rows"]] == ["18", "16", "14", "12"]
+    assert client.get("/api/orders/page", params={"sort": "nope"}).status_code == 400
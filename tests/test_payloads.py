@@ -0,0 +1,59 @@
+import pytest
+from pydantic import ValidationError
+
+from app.models.payloads import OrderRequest, dump_order_requests, normalize, parse, parse_rows
+
+
+def test_broker_rows_are_coerced_and_compacted():
+    raw = b'[{"orderId": 112111182045, "quantity": "25", "price": "101.5", "orderStatus": "PENDING", "unmodelled": 1}]'
+    assert normalize("orders", raw) == [
+        {"orderId": "112111182045", "orderStatus": "PENDING", "quantity": 25, "price": 101.5}
+    ]
+    row = parse("positions", [{"securityId": 11536, "netQty": "-5"}])[0]
+    assert row.netQty == -5
+    assert not hasattr(row, "__dict__")
+
+    # A malformed row does not sink the book; typed rows stay aligned with the raw ones
+    typed = parse_rows("positions", [{"securityId": 1, "netQty": "x"}, {"securityId": 2, "netQty": "3"}])
+    assert typed[0] is None
+    assert typed[1].securityId == "2" and typed[1].netQty == 3
+
+
+def test_order_request_validation():
+    order = OrderRequest(
+        transactionType="BUY", exchangeSegment="NSE_EQ", productType="CNC",
+        orderType="LIMIT", securityId="11536", quantity=10, price=3345.8,
+    )
+    assert dump_order_requests([order])[0]["price"] == 3345.8
+    with pytest.raises(ValidationError):
+        OrderRequest(
+            transactionType="HOLD", exchangeSegment="NSE_EQ", productType="CNC",
+            orderType="MARKET", securityId="11536", quantity=0,
+        )
+    # A misspelt field is rejected rather than dropped
+    with pytest.raises(ValidationError):
+        OrderRequest(
+            transactionType="BUY", exchangeSegment="NSE_EQ", productType="CNC",
+            orderType="LIMIT", securityId="11536", quantity=10, price=3345.8, triggerPirce=3300,
+        )
+
+
+def test_broker_books_pass_through_every_field():
+    import asyncio
+
+    import httpx
+
+    from app.services.dhan_client import DhanClient
+
+    body = b'[{"orderId": "1", "orderStatus": "PENDING", "legName": null, "unmodelled": {"x": 1}}]'
+
+    async def run():
+        client = DhanClient(base_url="https://broker.test/v2/")
+        await client.close()
+        client._client = httpx.AsyncClient(
+            base_url=client.base_url, transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+        )
+        async with client:
+            return await client.get_orders()
+
+    assert asyncio.run(run()) == [{"orderId": "1", "orderStatus": "PENDING", "legName": None, "unmodelled": {"x": 1}}]
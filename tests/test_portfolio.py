@@ -0,0 +1,42 @@
+from app.services.portfolio_service import PortfolioCache, build_view
+from app.services.snapshot_cache import SnapshotCache
+
+
+POSITIONS = [
+    {"securityId": "1", "tradingSymbol": "TCS", "netQty": 10, "realizedProfit": 150.0, "unrealizedProfit": -400.0},
+    {"securityId": "2", "tradingSymbol": "INFY", "netQty": 0, "realizedProfit": 90.0, "unrealizedProfit": 0.0},
+]
+HOLDINGS = [{"securityId": "3", "tradingSymbol": "ITC", "totalQty": 100, "avgCostPrice": 400.0, "lastTradedPrice": 410.0}]
+FUNDS = {"availabelBalance": 60_000.0, "utilizedAmount": 40_000.0, "sodLimit": 100_000.0}
+
+
+def test_summary_and_risk_metrics():
+    view = build_view(POSITIONS, HOLDINGS, FUNDS)
+    assert view.summary["booked_pnl"] == 240.0
+    assert view.summary["unbooked_pnl"] == -400.0
+    assert view.summary["running_pnl"] == -160.0
+    assert view.summary["open_positions"] == 1
+    assert view.summary["margin"]["usage_pct"] == 40.0
+    assert view.risk_metrics["current_daily_loss"] == 160.0
+    assert view.risk_metrics["current_position_loss"] == 250.0
+    assert view.risk_metrics["current_profit"] == 90.0
+    assert view.holdings[0]["unrealizedPnl"] == 1000.0
+
+
+def test_view_is_memoized_per_snapshot_version():
+    snapshots = SnapshotCache()
+    cache = PortfolioCache()
+    positions = snapshots.publish("positions", POSITIONS)
+    holdings = snapshots.publish("holdings", HOLDINGS)
+    first = cache.view(positions, holdings, None)
+    assert cache.view(snapshots.publish("positions", list(POSITIONS)), holdings, None) is first
+    changed = snapshots.publish("positions", POSITIONS[:1])
+    assert cache.view(changed, holdings, None) is not first
+
+
+def test_numeric_strings_are_read_through_the_typed_rows():
+    positions = [{"securityId": 7, "netQty": "5", "realizedProfit": "10.5", "unrealizedProfit": "-2.5"}]
+    view = build_view(positions, [], {"availabelBalance": "50", "utilizedAmount": "50"})
+    assert view.summary["running_pnl"] == 8.0
+    assert view.risk_metrics["positions"][0]["security_id"] == "7"
+    assert view.summary["margin"]["usage_pct"] == 50.0
@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes.admin import router as admin_router
+from app.core.config import get_settings
+from app.core.profiling import ProfileStore
+from app.middleware.profiling import ProfilingMiddleware
+
+
+def busy_work(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(get_settings(), "admin_token", "secret")
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(admin_router, prefix="/api")
+
+    @app.get("/api/slow")
+    async def slow():
+        busy_work(0.1)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_profiled_request_returns_collapsed_stacks(client):
+    assert client.get("/api/slow", headers={"X-Profile": "collapsed"}).status_code == 403
+    r = client.get("/api/slow", headers={"X-Profile": "collapsed", "X-Admin-Token": "secret"})
+    assert "busy_work (tests/test_profiling.py" in r.text
+
+    stored = client.get("/api/slow?__profile=store", headers={"X-Admin-Token": "secret"})
+    assert stored.json() == {"ok": True}
+    speedscope = client.get(f"/api/admin/profiles/{stored.headers['x-profile-id']}", headers={"X-Admin-Token": "secret"})
+    assert speedscope.json()["profiles"][0]["type"] == "sampled"
+
+
+def test_process_session_samples_all_threads():
+    async def run():
+        store = ProfileStore(keep=5)
+        profile = store.start_session(0.1, 0.005)
+        with pytest.raises(RuntimeError):
+            store.start_session(0.1, 0.005)
+        await asyncio.to_thread(busy_work, 0.15)
+        return profile
+
+    profile = asyncio.run(run())
+    assert profile.done
+    assert any("busy_work" in ";".join(stack) for stack in profile.samples)
@@ -0,0 +1,73 @@
+import asyncio
+
+import orjson
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes.stream import router
+from app.services.push_hub import PushHub, push_hub
+
+
+def test_slow_subscriber_gets_only_latest_update():
+    async def run():
+        hub = PushHub()
+        subscription = hub.subscribe(["positions"])
+        for qty in range(5):
+            hub.publish("positions", [{"securityId": "1", "netQty": qty}])
+        assert hub.publish("positions", [{"securityId": "1", "netQty": 4}]) is False
+        hub.publish("orders", [{"orderId": "x"}])
+        messages = await subscription.get(timeout=0.1)
+        idle = await subscription.get(timeout=0.01)
+        return messages, idle
+
+    messages, idle = asyncio.run(run())
+    assert len(messages) == 1
+    topic, message = messages[0]
+    assert topic == "positions"
+    assert orjson.loads(message)["data"] == [{"securityId": "1", "netQty": 4}]
+    assert idle == []
+
+
+def test_websocket_receives_latest_state_and_topic_changes():
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    push_hub.publish("risk", {"total_pnl": 12.5})
+    push_hub.publish("orders", [{"orderId": "1"}])
+
+    with TestClient(app).websocket_connect("/api/stream/ws?topics=risk") as ws:
+        first = ws.receive_json()
+        assert first["topic"] == "risk" and first["data"] == {"total_pnl": 12.5}
+        ws.send_text(orjson.dumps({"subscribe": ["orders"]}).decode())
+        second = ws.receive_json()
+        assert second["topic"] == "orders"
+
+
+def test_listeners_share_one_producer():
+    async def run():
+        hub = PushHub(poll_interval=0.01)
+        calls = []
+
+        async def producer():
+            calls.append(1)
+            return "v1", [{"securityId": "1"}]
+
+        hub.add_producer("positions", producer)
+        seen = [[] for _ in range(40)]
+        unlistens = [hub.listen("positions", rows.append) for rows in seen]
+        await hub.start()
+        await asyncio.sleep(0.1)
+        for unlisten in unlistens:
+            unlisten()
+        polls_while_listening = len(calls)
+        await asyncio.sleep(0.05)
+        late = []
+        hub.listen("positions", late.append)()
+        await hub.stop()
+        return calls, polls_while_listening, seen, late
+
+    calls, polls_while_listening, seen, late = asyncio.run(run())
+    # Polling rate is set by the producer interval, not by the number of listeners
+    assert 0 < polls_while_listening <= 12
+    assert len(calls) == polls_while_listening
+    assert all(rows == [[{"securityId": "1"}]] for rows in seen)
+    assert late == [[{"securityId": "1"}]]
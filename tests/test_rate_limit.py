@@ -0,0 +1,41 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from redis.asyncio import Redis
+
+from app.core.production_config import production_settings
+from app.core.rate_limit import RateLimiter
+from app.middleware.rate_limit import RateLimitMiddleware, route_class
+
+
+def test_route_classes_and_exemptions():
+    assert route_class("GET", "/api/market/proxy") == "market"
+    assert route_class("POST", "/api/orders") == "orders"
+    assert route_class("GET", "/api/orders") == "read"
+    assert route_class("POST", "/api/kill/activate") is None
+    assert route_class("GET", "/dashboard") is None
+
+
+def test_limits_fall_back_to_local_window_when_redis_is_down(monkeypatch):
+    monkeypatch.setattr(production_settings, "rate_limit_market_requests", 3)
+    app = FastAPI()
+    # Nothing listens on port 1: every Redis call fails and the local window takes over
+    app.add_middleware(RateLimitMiddleware, limiter=RateLimiter(redis=Redis.from_url("redis://127.0.0.1:1/0")))
+
+    @app.get("/api/market/ltp")
+    async def ltp():
+        return {"ltp": 1}
+
+    @app.post("/api/kill/activate")
+    async def kill():
+        return {"ok": True}
+
+    client = TestClient(app)
+    statuses = [client.get("/api/market/ltp").status_code for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]
+    limited = client.get("/api/market/ltp")
+    assert int(limited.headers["retry-after"]) >= 1
+    # Unverified credentials do not buy a fresh bucket
+    for i in range(3):
+        assert client.get("/api/market/ltp", headers={"Authorization": f"Bearer random-{i}"}).status_code == 429
+        assert client.get("/api/market/ltp", headers={"X-API-Key": f"key-{i}"}).status_code == 429
+    assert all(client.post("/api/kill/activate").status_code == 200 for _ in range(5))
@@ -0,0 +1,37 @@
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.models.risk import KillSwitchStatus, RiskSettings
+from app.services.risk_service import RiskService
+
+
+def test_concurrent_first_requests_create_one_row(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'risk.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def first_request():
+            async with maker() as session:
+                service = RiskService(session)
+                settings = await service.get_or_create_risk_settings()
+                status = await service.get_kill_switch_status()
+                return settings.id, status.id
+
+        results = await asyncio.gather(*(first_request() for _ in range(8)))
+        async with maker() as session:
+            counts = [
+                (await session.execute(select(func.count()).select_from(model))).scalar_one()
+                for model in (RiskSettings, KillSwitchStatus)
+            ]
+        await engine.dispose()
+        return results, counts
+
+    results, counts = asyncio.run(run())
+    assert counts == [1, 1]
+    assert len(set(results)) == 1
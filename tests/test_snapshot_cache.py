@@ -0,0 +1,90 @@
+import asyncio
+
+from fastapi import FastAPI, Query, Request
+from fastapi.testclient import TestClient
+
+from app.api.snapshot_response import snapshot_response
+from app.services.snapshot_cache import SnapshotCache
+
+
+def _orders(status="PENDING"):
+    return [{"orderId": str(i), "orderStatus": status if i == 1 else "PENDING"} for i in range(3)]
+
+
+def test_unchanged_book_keeps_version_and_delta_lists_changes():
+    cache = SnapshotCache()
+    first = cache.publish("orders", _orders())
+    assert cache.publish("orders", _orders()) is first
+
+    rows = _orders("TRADED")[:2] + [{"orderId": "9", "orderStatus": "PENDING"}]
+    cache.publish("orders", rows)
+    delta = cache.delta("orders", first.version)
+    assert delta["added"] == [{"orderId": "9", "orderStatus": "PENDING"}]
+    assert delta["changed"] == [{"orderId": "1", "orderStatus": "TRADED"}]
+    assert delta["removed"] == ["2"]
+    assert cache.delta("orders", "unknown") is None
+
+
+def test_concurrent_gets_share_one_fetch():
+    cache = SnapshotCache()
+    calls = 0
+
+    async def fetcher():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return _orders()
+
+    async def run():
+        return await asyncio.gather(*(cache.get("orders", fetcher, max_age=5) for _ in range(10)))
+
+    snapshots = asyncio.run(run())
+    assert calls == 1
+    assert len({id(s) for s in snapshots}) == 1
+
+
+def test_etag_304_and_since_fallback():
+    cache = SnapshotCache()
+    app = FastAPI()
+
+    @app.get("/orders")
+    async def orders(request: Request, since: str = Query(None)):
+        return snapshot_response(request, cache, cache.current("orders"), since)
+
+    snapshot = cache.publish("orders", _orders())
+    client = TestClient(app)
+    full = client.get("/orders")
+    assert full.json() == _orders()
+    assert full.headers["etag"] == snapshot.etag
+
+    unchanged = client.get("/orders", headers={"If-None-Match": snapshot.etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    cache.publish("orders", _orders("TRADED"))
+    delta = client.get("/orders", params={"since": snapshot.version}).json()
+    assert delta["full"] is False and len(delta["changed"]) == 1
+    fallback = client.get("/orders", params={"since": "stale"}).json()
+    assert fallback["full"] is True and fallback["rows"] == _orders("TRADED")
+
+
+def test_full_body_is_compressed_once_per_version():
+    cache = SnapshotCache()
+    app = FastAPI()
+
+    @app.get("/orders")
+    async def orders(request: Request):
+        return snapshot_response(request, cache, cache.current("orders"))
+
+    rows = [{"orderId": str(i), "orderStatus": "PENDING", "tradingSymbol": "RELIANCE"} for i in range(200)]
+    snapshot = cache.publish("orders", rows)
+    client = TestClient(app)
+    for _ in range(3):
+        r = client.get("/orders", headers={"Accept-Encoding": "gzip"})
+        assert r.headers["content-encoding"] == "gzip"
+        assert r.json() == rows
+    assert list(snapshot.encodings) == ["gzip"]
+    assert len(snapshot.encodings["gzip"]) < len(snapshot.body) // 5
+
+    plain = client.get("/orders", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
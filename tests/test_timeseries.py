@@ -0,0 +1,92 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.db.timeseries import TimeSeriesStore, _day_of, _to_ns
+
+
+def test_append_slice_and_reopen(tmp_path):
+    store = TimeSeriesStore(tmp_path, capacity=4)
+    base = datetime(2026, 10, 19, 9, 15, tzinfo=timezone.utc)
+    for i in range(10):
+        store.append("account", "default", float(i), ts=base + timedelta(seconds=i))
+
+    ts, values = store.range("account", "default", base + timedelta(seconds=3), base + timedelta(seconds=7))
+    assert values.tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert not values.flags.writeable
+    assert not values.flags.owndata
+
+    with pytest.raises(ValueError):
+        store.append("account", "default", 0.0, ts=base)
+
+    store.flush()
+    reopened = TimeSeriesStore(tmp_path, capacity=4)
+    _, values = reopened.range("account", "default", base, base + timedelta(minutes=1))
+    assert values.tolist() == [float(i) for i in range(10)]
+
+
+def test_compaction_and_retention(tmp_path):
+    store = TimeSeriesStore(tmp_path, capacity=1024)
+    old = datetime(2026, 9, 1, 10, tzinfo=timezone.utc)
+    recent = datetime(2026, 10, 18, 10, tzinfo=timezone.utc)
+    store.append("instrument", "RELIANCE", -12.5, ts=old)
+    store.append("instrument", "RELIANCE", 40.0, ts=recent)
+
+    assert store.compact(before=date(2026, 10, 19)) == 2
+    assert (tmp_path / "2026-10-18" / "instrument" / "RELIANCE.ts").stat().st_size == 8
+
+    assert store.enforce_retention(30, today=date(2026, 10, 19)) == 1
+    assert not (tmp_path / "2026-09-01").exists()
+    _, values = store.range("instrument", "RELIANCE", recent, recent + timedelta(seconds=1))
+    assert values.tolist() == [40.0]
+
+
+def test_maintenance_thread_alongside_reads(tmp_path):
+    import threading
+
+    store = TimeSeriesStore(tmp_path, capacity=1024)
+    start = datetime(2026, 9, 1, 10, tzinfo=timezone.utc)
+    days = [start + timedelta(days=i) for i in range(20)]
+    for i, ts in enumerate(days):
+        store.append("instrument", f"SYM{i % 4}", float(i), ts=ts)
+
+    errors = []
+
+    def maintain():
+        try:
+            for _ in range(20):
+                store.compact(before=date(2026, 10, 19))
+        except Exception as e:  # pragma: no cover - only on failure
+            errors.append(e)
+
+    worker = threading.Thread(target=maintain)
+    worker.start()
+    while worker.is_alive():
+        for i, ts in enumerate(days):
+            store.range("instrument", f"SYM{i % 4}", ts, ts + timedelta(seconds=1))
+        store.flush()
+    worker.join()
+
+    assert not errors
+    for i, ts in enumerate(days):
+        _, values = store.range("instrument", f"SYM{i % 4}", ts, ts + timedelta(seconds=1))
+        assert values.tolist() == [float(i)]
+
+
+def test_past_day_reads_are_not_kept_open(tmp_path):
+    day = datetime(2026, 9, 1, 10, tzinfo=timezone.utc)
+    TimeSeriesStore(tmp_path).append("account", "default", 5.0, ts=day)
+
+    store = TimeSeriesStore(tmp_path)
+    _, values = store.range("account", "default", day, day + timedelta(seconds=1))
+    assert values.tolist() == [5.0]
+    assert store._open == {}
+
+
+def test_timestamps_convert_exactly():
+    base = datetime(2026, 10, 19, 9, 15, tzinfo=timezone.utc)
+    stamps = [_to_ns(base + timedelta(microseconds=i)) for i in range(2000)]
+    assert stamps == [stamps[0] + 1000 * i for i in range(2000)]
+    last = datetime(2026, 10, 19, 23, 59, 59, 999999, tzinfo=timezone.utc)
+    assert _day_of(_to_ns(last)) == date(2026, 10, 19)
+    assert _day_of(_to_ns(last) + 1000) == date(2026, 10, 20)
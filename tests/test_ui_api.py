@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.services import snapshot_cache as snapshots
+from app.ui import api
+
+
+def test_pages_read_and_write_in_process(tmp_path, monkeypatch):
+    fetches = []
+
+    async def fetch_positions():
+        fetches.append("positions")
+        return [{"securityId": "1", "netQty": 5, "realizedProfit": 10.0, "unrealizedProfit": -4.0}]
+
+    async def fetch_funds():
+        return [{"availabelBalance": 900.0, "utilizedAmount": 100.0}]
+
+    async def fetch_empty():
+        return []
+
+    monkeypatch.setattr(snapshots, "snapshot_cache", snapshots.SnapshotCache())
+    monkeypatch.setattr(snapshots, "BROKER_FETCHERS", {
+        "positions": fetch_positions, "funds": fetch_funds, "holdings": fetch_empty, "orders": fetch_empty,
+    })
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ui.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        monkeypatch.setattr(api, "async_session_maker", sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+        try:
+            positions = await api.fetch_json("/positions")
+            summary = await api.fetch_json("/portfolio/summary")
+            margin = await api.fetch_json("/positions/margin")
+            settings = await api.fetch_json("/risk/settings")
+            locked = await api.post_json("/risk/lock", {})
+            kill = await api.fetch_json("/kill/status")
+        finally:
+            await engine.dispose()
+        return positions, summary, margin, settings, locked, kill
+
+    positions, summary, margin, settings, locked, kill = asyncio.run(run())
+    assert positions[0]["netQty"] == 5
+    assert summary["running_pnl"] == 6.0
+    assert margin["availabelBalance"] == 900.0
+    # One broker fetch shared by the positions read and the portfolio summary
+    assert fetches == ["positions"]
+    assert settings["risk_locked"] is False and locked["risk_locked"] is True
+    assert isinstance(locked["risk_lock_until"], str)
+    assert kill["is_active"] is False
+
+    with pytest.raises(KeyError):
+        asyncio.run(api.fetch_json("/nope"))
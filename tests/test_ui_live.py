@@ -0,0 +1,37 @@
+import asyncio
+
+from nicegui import Client
+from nicegui.page import page
+
+from app.services.push_hub import push_hub
+from app.ui import live
+
+
+def test_subscribe_renders_on_page_client_and_ends_on_disconnect():
+    async def scenario():
+        client = Client(page(''))
+        seen = []
+
+        def handler(data):
+            seen.append((data, Client.instances.get(client.id) is client))
+
+        with client:
+            live.subscribe('kill_switch', handler)
+        client.handle_handshake()  # page built, socket connected
+        push_hub.publish('kill_switch', {'is_active': True})
+        await asyncio.sleep(0.01)
+        listening = push_hub.has_subscribers('kill_switch')
+
+        for handler in client.disconnect_handlers:
+            client.safe_invoke(handler)
+        push_hub.publish('kill_switch', {'is_active': False})
+        await asyncio.sleep(0.01)
+        Client.instances.pop(client.id, None)
+        return seen, listening, push_hub.has_subscribers('kill_switch')
+
+    try:
+        seen, listening, still_listening = asyncio.run(scenario())
+    finally:
+        push_hub._latest.pop('kill_switch', None)
+    assert seen == [({'is_active': True}, True)]
+    assert listening and not still_listening
@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+from nicegui import Client
+
+from app.ui import orders
+from app.ui.dashboard import create_ui
+
+
+def test_create_ui_serves_the_sectioned_dashboard_and_paged_orders():
+    from app.ui import dashboard_phase2
+
+    create_ui()
+    assert [f for f, path in Client.page_routes.items() if path == '/orders'] == [orders.orders_page]
+    assert [f for f, path in Client.page_routes.items() if path == '/'] == [dashboard_phase2.dashboard_page]
+
+
+def test_time_filter_and_statistics(monkeypatch):
+    calls = []
+
+    async def fetch_json(path, params):
+        calls.append((path, params))
+        return {'offset': 0, 'total': 1, 'rows': [{'orderId': '1', 'orderStatus': 'PENDING'}],
+                'status_counts': {'PENDING': 3, 'TRANSIT': 1, 'TRADED': 5, 'REJECTED': 2}}
+
+    monkeypatch.setattr(orders, 'fetch_json', fetch_json)
+    rows = []
+    orders_ui = SimpleNamespace(
+        filters={'sort': 'createTime', 'descending': True}, offset=50, limit=50,
+        orders_container=SimpleNamespace(set_rows=rows.append),
+        page_label=SimpleNamespace(text=''),
+        total_orders_label=SimpleNamespace(text=''),
+        pending_orders_label=SimpleNamespace(text=''),
+        completed_orders_label=SimpleNamespace(text=''),
+        rejected_orders_label=SimpleNamespace(text=''),
+    )
+
+    asyncio.run(orders.set_filter(orders_ui, 'time_from', orders.book_time('2024-09-16T09:15')))
+    asyncio.run(orders.set_filter(orders_ui, 'time_to', orders.book_time('2024-09-16T09:20', end=True)))
+
+    path, params = calls[-1]
+    assert path == '/orders/page'
+    assert params['time_from'] == '2024-09-16 09:15:00'
+    assert params['time_to'] == '2024-09-16 09:20:59'
+    assert params['offset'] == 0
+    assert orders.book_time('') is None
+    assert orders_ui.total_orders_label.text == 'Total Orders: 11'
+    assert orders_ui.pending_orders_label.text == 'Pending: 4'
+    assert orders_ui.completed_orders_label.text == 'Completed: 5'
+    assert orders_ui.rejected_orders_label.text == 'Rejected: 2'
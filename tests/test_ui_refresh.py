@@ -0,0 +1,159 @@
+import asyncio
+
+import app.ui.refresh as refresh_module
+from app.core.metrics import UI_REFRESH_TASKS
+from app.ui.refresh import RefreshScheduler
+
+
+class FakeClient:
+    instances = {}
+
+    def __init__(self, client_id):
+        self.id = client_id
+        self._disconnect_task = None  # set by NiceGUI while a dropped socket may still reconnect
+        FakeClient.instances[client_id] = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def gauge(client_id):
+    for metric in UI_REFRESH_TASKS.collect():
+        for sample in metric.samples:
+            if sample.labels.get("client") == client_id:
+                return sample.value
+    return None
+
+
+def test_refreshes_never_overlap_and_conflate(monkeypatch):
+    monkeypatch.setattr(refresh_module, "Client", FakeClient)
+
+    async def scenario():
+        scheduler = RefreshScheduler(FakeClient("c1"))
+        scheduler.on_connect()
+        running, peak, seen = 0, 0, []
+
+        def load(n):
+            async def refresh():
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.05)
+                seen.append(n)
+                running -= 1
+            return refresh
+
+        for n in range(5):
+            scheduler.run("orders", load(n))
+            await asyncio.sleep(0)
+        assert gauge("c1") == 1
+        await asyncio.sleep(0.2)
+        return peak, seen
+
+    peak, seen = asyncio.run(scenario())
+    assert peak == 1
+    # The first runs, requests made meanwhile collapse into the latest one
+    assert seen == [0, 4]
+    assert gauge("c1") == 0
+
+
+def test_hidden_tab_queues_and_disconnect_cancels(monkeypatch):
+    monkeypatch.setattr(refresh_module, "Client", FakeClient)
+
+    async def scenario():
+        scheduler = RefreshScheduler(FakeClient("c2"))
+        scheduler.on_connect()
+        seen, ticks = [], []
+        scheduler.every(0.01, "badges", lambda: ticks.append(1))
+
+        scheduler.set_visible(False)
+        scheduler.run("risk", lambda: seen.append("first"))
+        scheduler.run("risk", lambda: seen.append("latest"))
+        await asyncio.sleep(0.05)
+        hidden_ticks, hidden_seen = len(ticks), list(seen)
+
+        scheduler.set_visible(True)
+        await asyncio.sleep(0.05)
+        assert ticks and seen == ["latest"]
+
+        stuck = asyncio.Event()
+        scheduler.run("slow", stuck.wait)
+        await asyncio.sleep(0)
+        task = scheduler._tasks["slow"]
+        scheduler.close()
+        await asyncio.sleep(0)
+        ticks_at_close = len(ticks)
+        await asyncio.sleep(0.05)
+        scheduler.run("risk", lambda: seen.append("after close"))
+        await asyncio.sleep(0)
+        return hidden_ticks, hidden_seen, task.cancelled(), len(ticks) - ticks_at_close, seen
+
+    hidden_ticks, hidden_seen, cancelled, ticks_after_close, seen = asyncio.run(scenario())
+    assert hidden_ticks == 0 and hidden_seen == []
+    assert cancelled and ticks_after_close == 0
+    assert seen == ["latest"]
+    assert gauge("c2") is None
+
+
+def test_pruned_client_closes_scheduler(monkeypatch):
+    monkeypatch.setattr(refresh_module, "Client", FakeClient)
+    client = FakeClient("c3")
+    scheduler = RefreshScheduler(client)
+    del FakeClient.instances["c3"]
+    scheduler.run("orders", lambda: None)
+    assert scheduler.closed
+
+
+def test_socket_drop_queues_until_reconnect(monkeypatch):
+    monkeypatch.setattr(refresh_module, "Client", FakeClient)
+
+    async def scenario():
+        client = FakeClient("c4")
+        scheduler = RefreshScheduler(client)
+        seen, ticks = [], []
+        scheduler.every(0.01, "badges", lambda: ticks.append(1))
+
+        # Page built, socket not connected yet
+        scheduler.run("orders", lambda: seen.append("initial"))
+        await asyncio.sleep(0.03)
+        before_connect = (list(seen), len(ticks))
+        scheduler.on_connect()
+        await asyncio.sleep(0.03)
+        connected = list(seen)
+
+        # Socket drops; NiceGUI keeps the client through reconnect_timeout
+        client._disconnect_task = object()
+        scheduler.run("orders", lambda: seen.append("while down"))
+        await asyncio.sleep(0.03)
+        ticks_down = len(ticks)
+        await asyncio.sleep(0.03)
+        down = (list(seen), len(ticks) - ticks_down)
+
+        client._disconnect_task = None
+        scheduler.on_connect()
+        await asyncio.sleep(0.03)
+        scheduler.close()
+        return before_connect, connected, down, seen
+
+    before_connect, connected, down, seen = asyncio.run(scenario())
+    assert before_connect == ([], 0)
+    assert connected == ["initial"]
+    assert down == (["initial"], 0)
+    assert seen == ["initial", "while down"]
+
+
+def test_timer_stops_for_client_that_never_connects(monkeypatch):
+    monkeypatch.setattr(refresh_module, "Client", FakeClient)
+
+    async def scenario():
+        scheduler = RefreshScheduler(FakeClient("c5"))
+        scheduler.every(0.01, "badges", lambda: None)
+        timer = scheduler._timers[0]
+        del FakeClient.instances["c5"]
+        await asyncio.sleep(0.05)
+        return scheduler.closed, timer.done()
+
+    assert asyncio.run(scenario()) == (True, True)
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import app.ui.section as section_module
+from app.ui.section import Section, refresh_all, shared_fetch, tick_badges
+
+
+class FakeElement:
+    def __init__(self, text=""):
+        self.text = text
+        self.visible = True
+        self.color = None
+
+    def classes(self, *args, **kwargs):
+        return self
+
+    def props(self, value):
+        self.color = value.split("=", 1)[1]
+        return self
+
+    def set_text(self, text):
+        self.text = text
+
+    def set_visibility(self, visible):
+        self.visible = visible
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeUI:
+    @staticmethod
+    def badge(text, color=None):
+        return FakeElement(text)
+
+    @staticmethod
+    def tooltip(text):
+        return FakeElement(text)
+
+
+def test_sections_load_concurrently_and_fail_independently(monkeypatch):
+    monkeypatch.setattr(section_module, "ui", FakeUI)
+    rendered = {}
+    calls = {"flaky": 0}
+
+    def loader(name, delay):
+        async def fetch():
+            await asyncio.sleep(delay)
+            return name
+        return fetch
+
+    async def flaky():
+        calls["flaky"] += 1
+        if calls["flaky"] > 1:
+            raise RuntimeError("broker down")
+        return "flaky"
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    def render(name):
+        return lambda data: rendered.setdefault(name, time.perf_counter())
+
+    async def scenario():
+        sections = [
+            Section("fast", loader("fast", 0.01), render("fast")),
+            Section("slow", loader("slow", 0.2), render("slow")),
+            Section("flaky", flaky, render("flaky")),
+            Section("hung", hang, render("hung"), timeout=0.1),
+        ]
+        started = time.perf_counter()
+        await refresh_all(sections)
+        elapsed = time.perf_counter() - started
+        await sections[2].refresh()
+        return sections, started, elapsed
+
+    sections, started, elapsed = asyncio.run(scenario())
+    fast, slow, flaky_section, hung = sections
+
+    # Concurrent: total time is the slowest section, and the fast one rendered first
+    assert elapsed < 0.35
+    assert rendered["fast"] - started < 0.1
+    assert "hung" not in rendered
+
+    assert not fast.stale and fast.badge.visible is False
+    assert not slow.stale
+    assert hung.error == "timed out"
+    assert hung.badge.text == "unavailable" and hung.badge.color == "red"
+
+    # Failed refresh keeps the last good data and reports its age
+    assert flaky_section.error == "broker down"
+    assert flaky_section.badge.text == "stale · 0s" and flaky_section.badge.color == "orange"
+    assert flaky_section._tooltip.text == "broker down"
+    flaky_section.loaded_at -= 90
+    tick_badges(sections)
+    assert flaky_section.badge.text == "stale · 1m"
+
+
+def test_sections_sharing_a_fetch_make_one_call(monkeypatch):
+    monkeypatch.setattr(section_module, "ui", FakeUI)
+    calls = []
+    rendered = []
+
+    async def summary():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"running_pnl": 1.0, "margin": {"used": 2.0}}
+
+    async def scenario():
+        fetch = shared_fetch(summary)
+        pnl = Section("pnl", fetch, lambda data: rendered.append(("pnl", data["running_pnl"])))
+        margin = Section("margin", fetch, lambda data: rendered.append(("margin", data["margin"]["used"])))
+        # A caller timing out does not cancel the call the other one is waiting on
+        impatient = Section("impatient", fetch, lambda data: None, timeout=0.01)
+        await refresh_all([pnl, margin, impatient])
+        await refresh_all([pnl, margin])
+        return impatient
+
+    impatient = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert sorted(rendered) == [("margin", 2.0), ("margin", 2.0), ("pnl", 1.0), ("pnl", 1.0)]
+    assert impatient.error == "timed out"
@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes.admin import router as admin_router
+from app.core import watchdog as watchdog_module
+from app.core.config import get_settings
+from app.core.watchdog import LoopWatchdog
+
+
+def block_loop(seconds):
+    time.sleep(seconds)
+
+
+def test_watchdog_records_the_blocking_frame(monkeypatch):
+    watchdog = LoopWatchdog(threshold=0.05, sample_interval=0.005)
+
+    async def run():
+        await watchdog.start()
+        await asyncio.sleep(0.05)
+        block_loop(0.2)
+        await asyncio.sleep(0.1)
+        await watchdog.stop()
+
+    asyncio.run(run())
+    report = watchdog.report()
+    assert report["total_stalls"] == 1
+    stall = report["recent"][0]
+    assert stall["duration"] >= 0.15
+    assert stall["blocking_frame"].startswith("block_loop (tests/test_watchdog.py")
+    assert report["culprits"][0]["stalls"] == 1
+    assert "block_loop" in watchdog.collapsed()
+
+    monkeypatch.setattr(get_settings(), "admin_token", "secret")
+    monkeypatch.setattr(watchdog_module, "_watchdog", watchdog)
+    app = FastAPI()
+    app.include_router(admin_router, prefix="/api")
+    client = TestClient(app)
+    assert client.get("/api/admin/loop-stalls").status_code == 403
+    body = client.get("/api/admin/loop-stalls", headers={"X-Admin-Token": "secret"}).json()
+    assert body["recent"][0]["blocking_frame"] == stall["blocking_frame"]